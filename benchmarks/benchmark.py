@@ -0,0 +1,494 @@
+# coding=utf-8
+"""
+This file is for benchmarking read, write and DDL operations of MySQLTable on throwaway or local MySQL server
+
+Usage
+-----
+Start throwaway server with mysqld (or mariadbd) found in PATH, run every
+operation 5 times on 100000 rows and write results as JSON.
+
+``python benchmarks/benchmark.py --rows 100000 --repeat 5 --output results.json``
+
+Use local server and compare with results of earlier run. Exit code is 1 if
+any operation is slower than baseline by more than threshold.
+
+``python benchmarks/benchmark.py --host localhost --user root --password 1234 --compare results.json``
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import socket
+import argparse
+import contextlib
+import platform
+import tempfile
+import threading
+import subprocess
+import numpy
+import pandas
+import pymysql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from databaseops import MySQLTable, MySQLEnginePool  # noqa: E402
+
+# Data types of synthetic columns, cycled over width of frame
+DTYPES = ("int", "float", "str", "datetime", "bool")
+# Operations benchmarked, in order they run
+OPERATIONS = ("populate_insert", "populate_load_data", "update_table", "read_table", "read_table_arrow",
+              "read_table_parallel", "read_table_parallel_process", "read_table_stream", "table_filter",
+              "remove_duplicates")
+# Seconds to wait for throwaway server to accept connections
+SERVER_START_TIMEOUT = 60
+# Seconds between two samples of resident memory
+RSS_SAMPLE_INTERVAL = 0.005
+
+
+def synthetic_frame(rows: int, width: int, dtypes: tuple = DTYPES, seed: int = 0) -> pandas.DataFrame:
+    """
+    This function generates frame with id column and width columns, data type
+    of columns cycles over dtypes.
+
+    Parameters
+    ----------
+    rows : int
+        Number of rows.
+
+    width : int
+        Number of columns other than id.
+
+    dtypes : tuple
+        Data types from DTYPES.
+
+    seed : int
+        Seed of random generator, same seed gives same frame.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Synthetic frame.
+    """
+    generator = numpy.random.default_rng(seed)
+    data = {"id": numpy.arange(rows, dtype="int64")}
+    for number in range(width):
+        dtype = dtypes[number % len(dtypes)]
+        name = f"{dtype}_{number}"
+        if dtype == "int":
+            data[name] = generator.integers(0, 1_000_000, rows)
+        elif dtype == "float":
+            data[name] = generator.random(rows) * 1000
+        elif dtype == "str":
+            data[name] = numpy.char.add("value_", generator.integers(0, 10_000, rows).astype(str)).astype(object)
+        elif dtype == "datetime":
+            data[name] = pandas.Timestamp("2020-01-01") + pandas.to_timedelta(generator.integers(0, 10 ** 8, rows),
+                                                                              unit="s")
+        elif dtype == "bool":
+            data[name] = generator.random(rows) < 0.5
+        else:
+            raise ValueError(f"dtype should be one of {DTYPES}, got {dtype}")
+    return pandas.DataFrame(data)
+
+
+class RSSSampler:
+    """
+    Samples resident memory of this process in background thread while with
+    block runs. peak is highest resident memory in bytes, increase is peak
+    minus resident memory at start.
+    
+    Note
+    ----
+        Without /proc (not Linux), peak of whole process from
+        resource.getrusage is used, which never goes down between operations.
+    """
+    
+    def __init__(self) -> None:
+        self.peak = None
+        self.increase = None
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    
+    def __enter__(self) -> "RSSSampler":
+        gc.collect()
+        self.__start = self.peak = self.current()
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__sample, daemon=True)
+        self.__thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.__stop.set()
+        self.__thread.join()
+        self.peak = max(self.peak, self.current())
+        self.increase = self.peak - self.__start
+    
+    def __sample(self) -> None:
+        while not self.__stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak = max(self.peak, self.current())
+    
+    def current(self) -> int:
+        """
+        This method returns resident memory of this process in bytes.
+        """
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * self.__page_size
+        except OSError:
+            import resource
+            scale = 1 if sys.platform == "darwin" else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class ThrowawayServer:
+    """
+    MySQL or MariaDB server started on empty data directory in temporary
+    directory, and removed with it when stopped. Server listens on port 3306
+    of free loopback address like 127.0.0.2, as MySQLTable takes host name
+    without port.
+    
+    Parameters
+    ----------
+    mysqld : str
+        Path of mysqld or mariadbd, by default first found in PATH.
+    """
+    
+    def __init__(self, mysqld: str = None) -> None:
+        self.mysqld = mysqld or shutil.which("mysqld") or shutil.which("mariadbd")
+        if self.mysqld is None:
+            raise RuntimeError("mysqld or mariadbd not found in PATH, give --mysqld or --host of running server")
+        self.host = self.__free_loopback_address()
+        self.user = "root"
+        self.password = ""
+        self.__directory = None
+        self.__process = None
+    
+    def __enter__(self) -> "ThrowawayServer":
+        self.__directory = tempfile.mkdtemp(prefix="databaseops_benchmark_")
+        data_dir = os.path.join(self.__directory, "data")
+        version = subprocess.run([self.mysqld, "--version"], capture_output=True, text=True).stdout
+        # mysqld refuses to run as root unless asked to
+        run_as = ["--user=root"] if hasattr(os, "geteuid") and os.geteuid() == 0 else []
+        if "MariaDB" in version:
+            install_db = shutil.which("mariadb-install-db") or shutil.which("mysql_install_db")
+            subprocess.run([install_db, f"--datadir={data_dir}", "--auth-root-authentication-method=normal",
+                            "--skip-test-db"] + run_as, check=True, capture_output=True)
+        else:
+            subprocess.run([self.mysqld, "--no-defaults", "--initialize-insecure", f"--datadir={data_dir}"] + run_as,
+                           check=True, capture_output=True)
+        self.__process = subprocess.Popen(
+            [self.mysqld, "--no-defaults", f"--datadir={data_dir}", f"--bind-address={self.host}", "--port=3306",
+             f"--socket={os.path.join(self.__directory, 'mysqld.sock')}", "--local-infile=1",
+             "--loose-mysqlx=OFF", "--skip-name-resolve",
+             f"--log-error={os.path.join(self.__directory, 'error.log')}"] + run_as,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while True:
+            try:
+                pymysql.connect(host=self.host, user=self.user, password=self.password).close()
+                return self
+            except pymysql.err.OperationalError:
+                if self.__process.poll() is not None or time.monotonic() > deadline:
+                    self.__exit__()
+                    raise RuntimeError(f"throwaway server {self.mysqld} did not start")
+                time.sleep(0.2)
+    
+    def __exit__(self, *exc_info) -> None:
+        if self.__process is not None and self.__process.poll() is None:
+            self.__process.terminate()
+            try:
+                self.__process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.__process.kill()
+        shutil.rmtree(self.__directory, ignore_errors=True)
+    
+    @staticmethod
+    def __free_loopback_address() -> str:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        str
+            Loopback address on which port 3306 is free.
+        """
+        for last in range(2, 255):
+            address = f"127.0.0.{last}"
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.bind((address, 3306))
+                    return address
+                except OSError:
+                    continue
+        raise RuntimeError("port 3306 is not free on any loopback address")
+
+
+def percentiles(latencies: list) -> dict:
+    """
+    This function returns median, 90th and 99th percentile and max of
+    latencies in seconds.
+    """
+    values = numpy.asarray(latencies, dtype="float64")
+    return {"p50": float(numpy.percentile(values, 50)), "p90": float(numpy.percentile(values, 90)),
+            "p99": float(numpy.percentile(values, 99)), "max": float(values.max())}
+
+
+def measure(operation, repeat: int, rows: int, nbytes: int, setup=None) -> dict:
+    """
+    This function runs operation repeat times, each run is timed and sampled
+    for peak resident memory.
+
+    Parameters
+    ----------
+    operation : Method
+        Method without arguments which runs benchmarked operation.
+
+    repeat : int
+        Number of runs.
+
+    rows : int
+        Rows written or read by one run.
+
+    nbytes : int
+        Bytes of frame written or read by one run.
+
+    setup : Method
+        Method run before every run, not timed.
+
+    Returns
+    -------
+    dict
+        Latency percentiles, rows and megabytes per second of median run and
+        peak and increase of resident memory in bytes.
+    """
+    latencies, peaks, increases = [], [], []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with RSSSampler() as sampler:
+            start = time.perf_counter()
+            operation()
+            latencies.append(time.perf_counter() - start)
+        peaks.append(sampler.peak)
+        increases.append(sampler.increase)
+    result = {"repeat": repeat, "rows": rows, "latency": percentiles(latencies)}
+    median = result["latency"]["p50"]
+    result["rows_per_second"] = rows / median if median else 0.0
+    result["megabytes_per_second"] = nbytes / 2 ** 20 / median if median else 0.0
+    result["peak_rss"] = max(peaks)
+    result["rss_increase"] = max(increases)
+    return result
+
+
+def run_benchmarks(table: MySQLTable, frame: pandas.DataFrame, repeat: int, operations: tuple,
+                   stream_rows: int, chunksize: int, parallel: int = 4) -> dict:
+    """
+    This function runs operations on table and returns their results.
+
+    Parameters
+    ----------
+    table : MySQLTable
+        Table object of benchmark table, table is replaced.
+
+    frame : pandas.DataFrame
+        Synthetic frame written and read.
+
+    repeat : int
+        Number of runs of every operation.
+
+    operations : tuple
+        Names from OPERATIONS.
+
+    stream_rows : int
+        Rows of table scanned by read_table_stream, for which buffered
+        read_table is also measured, to show resident memory of streaming
+        does not grow with table.
+
+    chunksize : int
+        Chunk size of writes and streamed reads.
+
+    parallel : int
+        Partitions of read_table_parallel, read in thread pool, and of
+        read_table_parallel_process, read in process pool.
+
+    Returns
+    -------
+    dict
+        Results of operations.
+    """
+    rows, nbytes = len(frame), int(frame.memory_usage(deep=True).sum())
+    results = {}
+
+    def reset(data: pandas.DataFrame = frame, key: bool = True) -> None:
+        table.populate_table(data, if_exists="replace", bulk="insert", chunksize=chunksize)
+        if key:
+            table.set_primary_key("id", remove_duplicates=False)
+
+    if "populate_insert" in operations:
+        results["populate_insert"] = measure(
+            lambda: table.populate_table(frame, if_exists="replace", bulk="insert", chunksize=chunksize),
+            repeat, rows, nbytes)
+    if "populate_load_data" in operations:
+        results["populate_load_data"] = measure(
+            lambda: table.populate_table(frame, if_exists="replace", bulk="load_data", chunksize=chunksize),
+            repeat, rows, nbytes)
+    if "update_table" in operations:
+        reset()
+        changed = frame.copy()
+        changed[changed.columns[1]] = changed[changed.columns[1]].sample(frac=1, random_state=1).to_numpy()
+        results["update_table"] = measure(lambda: table.update_table(changed, chunksize=chunksize), repeat, rows,
+                                          nbytes)
+    if {"read_table", "read_table_arrow", "read_table_parallel", "read_table_parallel_process",
+            "table_filter"} & set(operations):
+        reset()
+    if "read_table" in operations:
+        results["read_table"] = measure(table.read_table, repeat, rows, nbytes)
+    if "read_table_arrow" in operations:
+        results["read_table_arrow"] = measure(lambda: table.read_table(format="arrow"), repeat, rows, nbytes)
+    for operation, parallel_mode in (("read_table_parallel", "thread"), ("read_table_parallel_process", "process")):
+        if operation in operations:
+            results[operation] = measure(lambda: table.read_table(parallel=parallel, parallel_mode=parallel_mode),
+                                         repeat, rows, nbytes)
+    if "table_filter" in operations:
+        where = f"`id` < {rows // 10}"
+        results["table_filter"] = measure(lambda: table.table_filter(where), repeat, rows // 10, nbytes // 10)
+    if "remove_duplicates" in operations:
+        duplicated = pandas.concat([frame, frame.iloc[:rows // 10]], ignore_index=True)
+        results["remove_duplicates"] = measure(lambda: table.remove_duplicates(list(frame.columns)), repeat, rows,
+                                               nbytes, setup=lambda: reset(duplicated, key=False))
+    if "read_table_stream" in operations:
+        results.update(stream_benchmark(table, frame, stream_rows, chunksize))
+    return results
+
+
+def stream_benchmark(table: MySQLTable, frame: pandas.DataFrame, stream_rows: int, chunksize: int) -> dict:
+    """
+    This function fills table with stream_rows rows, by writing frame again
+    with shifted id, and scans it once streamed with chunksize and once
+    buffered. Resident memory of streamed scan should stay near one chunk.
+
+    Returns
+    -------
+    dict
+        Results of read_table_stream and read_table_buffered.
+    """
+    table.populate_table(frame.iloc[:0], if_exists="replace")
+    written = 0
+    while written < stream_rows:
+        part = frame.iloc[:stream_rows - written].copy()
+        part["id"] += written
+        table.populate_table(part, bulk="insert", chunksize=chunksize)
+        written += len(part)
+    nbytes = int(frame.memory_usage(deep=True).sum() * stream_rows / len(frame))
+
+    def scan() -> None:
+        for _ in table.read_table(chunksize=chunksize):
+            pass
+
+    return {"read_table_stream": measure(scan, 1, stream_rows, nbytes),
+            "read_table_buffered": measure(table.read_table, 1, stream_rows, nbytes)}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    This function compares median latency of every operation with baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results of this run.
+
+    baseline : dict
+        Results of earlier run, loaded from JSON.
+
+    threshold : float
+        Allowed slowdown, 0.1 is 10% slower than baseline.
+
+    Returns
+    -------
+    list
+        Regressions as dict of operation, baseline and current median
+        latency and change.
+    """
+    regressions = []
+    for operation, result in results["operations"].items():
+        old = baseline.get("operations", {}).get(operation)
+        if old is None or not old["latency"]["p50"]:
+            continue
+        change = result["latency"]["p50"] / old["latency"]["p50"] - 1
+        result["change"] = change
+        if change > threshold:
+            regressions.append({"operation": operation, "baseline": old["latency"]["p50"],
+                                "current": result["latency"]["p50"], "change": change})
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--host", help="host of running server, throwaway server is started if not given")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--db-name", default="databaseops_benchmark")
+    parser.add_argument("--mysqld", help="path of mysqld or mariadbd for throwaway server")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--width", type=int, default=10, help="number of columns other than id")
+    parser.add_argument("--dtypes", default=",".join(DTYPES), help="comma separated data types of columns")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunksize", type=int, default=10000)
+    parser.add_argument("--parallel", type=int, default=4, help="partitions of parallel reads")
+    parser.add_argument("--stream-rows", type=int, default=1000000,
+                        help="rows of table scanned by read_table_stream and read_table_buffered")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="comma separated operations")
+    parser.add_argument("--output", help="JSON file of results")
+    parser.add_argument("--compare", help="JSON file of baseline results")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown against baseline")
+    args = parser.parse_args(argv)
+
+    operations = tuple(args.operations.split(","))
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations {sorted(unknown)}, choose from {OPERATIONS}")
+    frame = synthetic_frame(args.rows, args.width, tuple(args.dtypes.split(",")))
+    with contextlib.ExitStack() as stack:
+        server = stack.enter_context(ThrowawayServer(args.mysqld)) if args.host is None else None
+        host = args.host or server.host
+        user, password = (args.user, args.password) if server is None else (server.user, server.password)
+        table = MySQLTable(host, user, password, args.db_name, "benchmark")
+        with table.pooled_cursor() as cursor:
+            cursor.execute("SELECT VERSION()")
+            server_version = cursor.fetchone()[0]
+        results = {
+            "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                            "pandas": pandas.__version__, "server": server_version, "throwaway": server is not None},
+            "parameters": {"rows": args.rows, "width": args.width, "dtypes": args.dtypes, "repeat": args.repeat,
+                           "chunksize": args.chunksize, "stream_rows": args.stream_rows, "parallel": args.parallel},
+            "operations": run_benchmarks(table, frame, args.repeat, operations, args.stream_rows, args.chunksize,
+                                         args.parallel),
+        }
+        with table.pooled_cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{args.db_name}`")
+        MySQLEnginePool.dispose()
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        results["regressions"] = regressions
+    for operation, result in results["operations"].items():
+        print(f"{operation:<22} p50 {result['latency']['p50']:9.4f} s  {result['rows_per_second']:12.0f} rows/s  "
+              f"peak RSS {result['peak_rss'] / 2 ** 20:8.1f} MiB (+{result['rss_increase'] / 2 ** 20:.1f})"
+              + (f"  {result['change']:+.1%}" if "change" in result else ""))
+    for regression in regressions:
+        print(f"REGRESSION {regression['operation']}: {regression['baseline']:.4f} s -> "
+              f"{regression['current']:.4f} s ({regression['change']:+.1%})")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
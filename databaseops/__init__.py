@@ -7,6 +7,19 @@ See https://github.com/AnkushBhise/databaseops/ for more information
 # Version of databaseops
 __version__ = "1.0.0"
 
-# Create imports from project to make every thing available at top level
-from .mysql import MySQLOps
-from .mysql import MySQLTable
+# Make every thing available at top level. Sub-package is imported on first
+# use, so importing databaseops does not import pandas, sqlalchemy and PyMySQL.
+__all__ = ["MySQLOps", "MySQLTable", "MySQLEnginePool", "MySQLMetadataCache", "MySQLResultCache", "Column",
+           "Condition", "AsyncMySQLTable", "MySQLInstrumentation", "InstrumentationHook", "Span",
+           "MySQLSnapshotStore"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        from . import mysql
+        return getattr(mysql, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -6,3 +6,6 @@ This is helper package for different packages in library
 __version__ = "1.0.0"
 
 from ..helper._data_type_conversions import ListConversion
+from ..helper._data_type_conversions import DataTypeConversion
+from ..helper._arrow_conversions import ArrowConversion
+from ..helper._dataframe_conversions import DataFrameConversion
@@ -0,0 +1,107 @@
+# coding=utf-8
+import re
+
+
+class ArrowConversion:
+    """
+    This class is developed for creating helper methods for different classes in
+    projects. All this methods will focus on conversion of rows read from
+    database to pyarrow columnar data. pyarrow is optional dependency, it is
+    imported only when these methods are used.
+    
+    """
+    
+    @staticmethod
+    def import_pyarrow():
+        """
+        This method imports pyarrow.
+        
+        Returns
+        -------
+        module
+            pyarrow module.
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("pyarrow is required for arrow format, install it with "
+                              "'pip install databaseops[arrow]'") from None
+        return pyarrow
+    
+    @staticmethod
+    def arrow_type(data_type: str):
+        """
+        This method will convert MySQL data type, as returned by get_data_type,
+        to pyarrow data type.
+        
+        Parameters
+        ----------
+        data_type : str
+            MySQL data type like 'int(11)', 'varchar(255)' or 'decimal(10,2)'.
+        
+        Returns
+        -------
+        pyarrow.DataType or None
+            pyarrow data type, None if pyarrow should infer type from values.
+        """
+        pyarrow = ArrowConversion.import_pyarrow()
+        data_type = data_type.lower()
+        name = re.match(r"\w+", data_type).group(0)
+        unsigned = "unsigned" in data_type
+        integers = {"tinyint": 8, "smallint": 16, "mediumint": 32, "int": 32, "integer": 32, "bigint": 64}
+        if name in integers:
+            return getattr(pyarrow, f"{'u' if unsigned else ''}int{integers[name]}")()
+        if name == "year":
+            return pyarrow.int16()
+        if name == "float":
+            return pyarrow.float32()
+        if name in ("double", "real"):
+            return pyarrow.float64()
+        if name in ("decimal", "numeric"):
+            precision = re.findall(r"\d+", data_type) or ["10", "0"]
+            if int(precision[0]) <= 38:
+                return pyarrow.decimal128(int(precision[0]), int(precision[1]) if len(precision) > 1 else 0)
+            return None
+        if name == "date":
+            return pyarrow.date32()
+        if name in ("datetime", "timestamp"):
+            return pyarrow.timestamp("us")
+        if name == "time":
+            return pyarrow.duration("us")
+        if name in ("char", "varchar", "tinytext", "text", "mediumtext", "longtext", "enum", "set", "json"):
+            return pyarrow.string()
+        if name in ("binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob", "bit"):
+            return pyarrow.binary()
+        return None
+    
+    @staticmethod
+    def rows_to_record_batch(rows: list, columns: list, data_types: dict):
+        """
+        This method will build pyarrow.RecordBatch column by column from rows
+        read from database, without building pandas.DataFrame. Values of one
+        column at a time are taken from rows, so rows are not copied into
+        columns all at once.
+        
+        Parameters
+        ----------
+        rows : list
+            list of tuples, one tuple for each row.
+        
+        columns : list
+            Column names in order of values in rows.
+        
+        data_types : dict
+            Dictionary with column name as key and MySQL data type as value.
+            Columns which are not in it get type inferred from values.
+        
+        Returns
+        -------
+        pyarrow.RecordBatch
+            Record batch with one array for each column.
+        """
+        pyarrow = ArrowConversion.import_pyarrow()
+        arrays = []
+        for position, col in enumerate(columns):
+            data_type = ArrowConversion.arrow_type(data_types[col]) if col in data_types else None
+            arrays.append(pyarrow.array([row[position] for row in rows], type=data_type))
+        return pyarrow.RecordBatch.from_arrays(arrays, names=columns)
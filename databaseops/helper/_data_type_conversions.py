@@ -1,5 +1,10 @@
 # coding=utf-8
+import re
+import decimal
+import datetime
 import itertools
+import pandas
+from sqlalchemy.dialects import mysql
 
 
 class ListConversion:
@@ -24,3 +29,275 @@ class ListConversion:
         list contain values from the all tuples
         """
         return list(itertools.chain(*list_of_tuple))
+
+
+class DataTypeConversion:
+    """
+    This class is developed for creating helper methods for different classes in
+    projects. All this methods will focus on conversion between pandas data
+    types and MySQL data types.
+    
+    """
+    
+    # Integer types with there signed and unsigned ranges, narrowest first
+    integer_types = [
+        (mysql.TINYINT, -2 ** 7, 2 ** 7 - 1, 2 ** 8 - 1),
+        (mysql.SMALLINT, -2 ** 15, 2 ** 15 - 1, 2 ** 16 - 1),
+        (mysql.MEDIUMINT, -2 ** 23, 2 ** 23 - 1, 2 ** 24 - 1),
+        (mysql.INTEGER, -2 ** 31, 2 ** 31 - 1, 2 ** 32 - 1),
+        (mysql.BIGINT, -2 ** 63, 2 ** 63 - 1, 2 ** 64 - 1),
+    ]
+    # Names of MySQL integer data types
+    integer_type_names = ("tinyint", "smallint", "mediumint", "int", "integer", "bigint")
+    # VARCHAR lengths used for string columns. Longest can be fully indexed with utf8mb4.
+    varchar_lengths = [16, 32, 64, 128, 255, 512, 768]
+    # Row size limit of MySQL is 65535 bytes, part of it is kept for other columns
+    max_varchar_bytes = 60000
+    # MySQL text types with their maximum length in characters of utf8mb4, narrowest first
+    text_types = [("text", 16383, mysql.TEXT), ("mediumtext", 4194303, mysql.MEDIUMTEXT),
+                  ("longtext", 1073741823, mysql.LONGTEXT)]
+    
+    @staticmethod
+    def type_name(data_type: str) -> str:
+        """
+        This method will give name of MySQL data type without size and
+        attributes, like 'int' for 'int(10) unsigned'.
+        
+        Parameters
+        ----------
+        data_type : str
+            MySQL data type as returned by get_data_type.
+        
+        Returns
+        -------
+        str
+            Name of data type in lower case.
+        """
+        return re.match(r"\w+", data_type.lower()).group(0)
+    
+    @staticmethod
+    def infer_mysql_types(dataframe: pandas.DataFrame, widen: bool = False) -> dict:
+        """
+        This method will pick narrowest MySQL data type which can hold values of
+        every column of dataframe. Returned dictionary can be passed as dtype to
+        pandas.DataFrame.to_sql.
+        
+        Note
+        ----
+            Integers get TINYINT, SMALLINT, MEDIUMINT, INT or BIGINT, unsigned
+            if no value is negative. Strings get VARCHAR rounded up to
+            16, 32, 64, 128, 255, 512 or 768 characters, longer strings get TEXT.
+            Categorical columns get ENUM, datetime columns DATETIME and
+            decimal.Decimal values DECIMAL.
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            Data for which data types will be inferred.
+        
+        widen : bool
+            Pass True when dataframe is only sample of data. Integers get one
+            size bigger type and strings double length.
+        
+        Returns
+        -------
+        dict
+            Dictionary with column name as key and sqlalchemy type as value.
+            Columns for which no better type is found are not included.
+        """
+        data_types = {}
+        varchar_bytes = {}
+        for col in dataframe.columns:
+            series = dataframe[col]
+            if isinstance(series.dtype, pandas.CategoricalDtype):
+                categories = list(series.cat.categories)
+                if categories and all(isinstance(value, str) for value in categories):
+                    data_types[col] = mysql.ENUM(*categories)
+            elif pandas.api.types.is_bool_dtype(series.dtype):
+                data_types[col] = mysql.TINYINT(1)
+            elif pandas.api.types.is_integer_dtype(series.dtype):
+                data_types[col] = DataTypeConversion.__integer_type(series, widen)
+            elif pandas.api.types.is_float_dtype(series.dtype):
+                data_types[col] = mysql.FLOAT() if series.dtype == "float32" else mysql.DOUBLE()
+            elif pandas.api.types.is_datetime64_any_dtype(series.dtype):
+                has_fraction = (series.dropna().dt.microsecond != 0).any()
+                data_types[col] = mysql.DATETIME(fsp=6) if has_fraction else mysql.DATETIME()
+            elif pandas.api.types.is_timedelta64_dtype(series.dtype):
+                data_types[col] = mysql.TIME()
+            elif series.dtype == object or pandas.api.types.is_string_dtype(series.dtype):
+                data_type = DataTypeConversion.__object_type(series.dropna(), widen)
+                if data_type is not None:
+                    data_types[col] = data_type
+                    if isinstance(data_type, mysql.VARCHAR):
+                        varchar_bytes[col] = data_type.length * 4
+        # Longest VARCHAR columns become TEXT until row fits in row size limit
+        for col in sorted(varchar_bytes, key=varchar_bytes.get, reverse=True):
+            if sum(varchar_bytes.values()) <= DataTypeConversion.max_varchar_bytes:
+                break
+            data_types[col] = mysql.TEXT()
+            varchar_bytes.pop(col)
+        return data_types
+    
+    @staticmethod
+    def __integer_type(series: pandas.Series, widen: bool):
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        sqlalchemy type
+            Narrowest integer type which can hold values of series.
+        """
+        values = series.dropna()
+        low, high = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+        unsigned = low >= 0
+        fitting = [position for position, (data_type, signed_low, signed_high, unsigned_high)
+                   in enumerate(DataTypeConversion.integer_types)
+                   if (unsigned and high <= unsigned_high) or (signed_low <= low and high <= signed_high)]
+        position = min(fitting[0] + int(widen), len(DataTypeConversion.integer_types) - 1)
+        data_type, signed_low, signed_high, unsigned_high = DataTypeConversion.integer_types[position]
+        return data_type(unsigned=unsigned and (high > signed_high or not widen))
+    
+    @staticmethod
+    def __object_type(values: pandas.Series, widen: bool):
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        sqlalchemy type or None
+            VARCHAR or TEXT for strings, DECIMAL for decimal.Decimal and DATE
+            for datetime.date values. None for mixed values.
+        """
+        if not len(values):
+            return None
+        kinds = set(map(type, values))
+        if kinds <= {str}:
+            length = int(values.str.len().max()) * (2 if widen else 1)
+            fitting = [size for size in DataTypeConversion.varchar_lengths if length <= size]
+            if fitting:
+                return mysql.VARCHAR(fitting[0])
+            return next((text_type() for _, size, text_type in DataTypeConversion.text_types if length <= size),
+                        mysql.LONGTEXT())
+        if kinds <= {decimal.Decimal}:
+            digits = [value.as_tuple() for value in values if value.is_finite()]
+            if not digits:
+                return None
+            scale = max(max(-value.exponent, 0) for value in digits)
+            integer_digits = max(max(len(value.digits) + value.exponent, 1) for value in digits)
+            scale = min(scale, 30)
+            return mysql.DECIMAL(precision=min(integer_digits + scale + (2 if widen else 0), 65), scale=scale)
+        if kinds <= {datetime.date}:
+            return mysql.DATE()
+        return None
+    
+    @staticmethod
+    def widen_mysql_types(data_types: dict, dataframe: pandas.DataFrame) -> dict:
+        """
+        This method will find columns of table whose MySQL data type, picked
+        by infer_mysql_types from earlier data, can not hold values of
+        dataframe, and pick data type which can hold both.
+        
+        Note
+        ----
+            ENUM gets new values appended after old ones, VARCHAR gets double
+            length needed, or TEXT when it is longer than 768 characters or row
+            would not fit in row size limit. Integers get one size bigger type
+            than needed and DECIMAL gets digits needed. Other data types are
+            not changed.
+        
+        Parameters
+        ----------
+        data_types : dict
+            Dictionary with column name as key and MySQL data type, as returned
+            by get_data_type, as value.
+        
+        dataframe : pandas.DataFrame
+            Data which will be written to table.
+        
+        Returns
+        -------
+        dict
+            Dictionary with column name as key and sqlalchemy type as value,
+            only for columns which need wider data type.
+        """
+        needed = DataTypeConversion.infer_mysql_types(dataframe)
+        varchar_bytes = {col: int(re.search(r"\d+", data_type).group(0)) * 4 for col, data_type in data_types.items()
+                         if DataTypeConversion.type_name(data_type) == "varchar"}
+        wider = {}
+        for col, data_type in data_types.items():
+            if col not in dataframe.columns or col not in needed:
+                continue
+            name = DataTypeConversion.type_name(data_type)
+            series = dataframe[col].dropna()
+            if name == "enum":
+                values = [value.replace("''", "'") for value in re.findall(r"'((?:[^']|'')*)'", data_type)]
+                new_values = series.cat.categories if isinstance(series.dtype, pandas.CategoricalDtype) \
+                    else series.unique()
+                added = [value for value in new_values if value not in set(values)]
+                if added:
+                    wider[col] = mysql.ENUM(*values, *map(str, added))
+            elif name == "varchar" or any(name == text_name for text_name, _, _ in DataTypeConversion.text_types):
+                if not len(series):
+                    continue
+                length = int(series.astype(str).str.len().max())
+                size = varchar_bytes[col] // 4 if name == "varchar" else \
+                    next(size for text_name, size, _ in DataTypeConversion.text_types if text_name == name)
+                if length <= size:
+                    continue
+                data_type = DataTypeConversion.__object_type(series.astype(str), True)
+                if isinstance(data_type, mysql.VARCHAR):
+                    varchar_bytes[col] = data_type.length * 4
+                    if sum(varchar_bytes.values()) > DataTypeConversion.max_varchar_bytes:
+                        varchar_bytes.pop(col)
+                        data_type = mysql.TEXT()
+                wider[col] = data_type
+            elif name in DataTypeConversion.integer_type_names and data_type.lower() != "tinyint(1)":
+                position = next(position for position, (integer_type, _, _, _)
+                                in enumerate(DataTypeConversion.integer_types)
+                                if integer_type.__visit_name__.lower() == ("integer" if name == "int" else name))
+                _, signed_low, signed_high, unsigned_high = DataTypeConversion.integer_types[position]
+                low, high = (0, unsigned_high) if "unsigned" in data_type.lower() else (signed_low, signed_high)
+                values = pandas.to_numeric(series)
+                if len(values) and (int(values.min()) < low or int(values.max()) > high):
+                    bounds = pandas.Series([min(low, int(values.min())), max(high, int(values.max()))], dtype=object)
+                    wider[col] = DataTypeConversion.__integer_type(bounds, True)
+            elif name == "decimal" and isinstance(needed[col], mysql.DECIMAL):
+                precision, scale = (int(part) for part in re.findall(r"\d+", data_type)[:2])
+                new_scale = max(scale, needed[col].scale)
+                integer_digits = max(precision - scale, needed[col].precision - needed[col].scale)
+                if new_scale > scale or integer_digits > precision - scale:
+                    wider[col] = mysql.DECIMAL(precision=min(integer_digits + new_scale, 65), scale=new_scale)
+        return wider
+    
+    @staticmethod
+    def mysql_to_pandas_types(data_types: dict) -> dict:
+        """
+        This method will convert MySQL data types, as returned by get_data_type,
+        to narrowest pandas data types. Returned dictionary can be passed to
+        pandas.DataFrame.astype.
+        
+        Parameters
+        ----------
+        data_types : dict
+            Dictionary with column name as key and MySQL data type as value.
+        
+        Returns
+        -------
+        dict
+            Dictionary with column name as key and pandas data type as value.
+            Columns which are read well by default are not included.
+        """
+        integers = {"tinyint": 8, "smallint": 16, "mediumint": 32, "int": 32, "integer": 32, "bigint": 64}
+        pandas_types = {}
+        for col, data_type in data_types.items():
+            data_type = data_type.lower()
+            name = DataTypeConversion.type_name(data_type)
+            if name in integers:
+                pandas_types[col] = f"{'UInt' if 'unsigned' in data_type else 'Int'}{integers[name]}"
+            elif name == "float":
+                pandas_types[col] = "float32"
+            elif name == "enum":
+                values = re.findall(r"'((?:[^']|'')*)'", data_types[col])
+                pandas_types[col] = pandas.CategoricalDtype([value.replace("''", "'") for value in values])
+        return pandas_types
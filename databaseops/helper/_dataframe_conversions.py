@@ -0,0 +1,234 @@
+# coding=utf-8
+import re
+import csv
+import decimal
+import hashlib
+import numpy
+import pandas
+
+# Scale of DECIMAL to which FLOAT and DOUBLE values are cast for hashing, enough for every digit of shortest round
+# trip text of double above 1e-30
+FLOAT_HASH_SCALE = 30
+# Largest DECIMAL(65, FLOAT_HASH_SCALE), to which MySQL clamps larger values
+FLOAT_HASH_LIMIT = decimal.Decimal("9" * (65 - FLOAT_HASH_SCALE) + "." + "9" * FLOAT_HASH_SCALE)
+
+
+class DataFrameConversion:
+    """
+    This class is developed for creating helper methods for different classes in
+    projects. All this methods will focus on conversion of pandas.DataFrame to
+    the formats used while sending data to database.
+    
+    """
+    
+    @staticmethod
+    def iter_chunks(dataframe: pandas.DataFrame, chunksize: int):
+        """
+        This method will split dataframe into multiple dataframes of chunksize rows.
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            Data which need to be split.
+        
+        chunksize : int
+            Number of rows in one chunk.
+        
+        Returns
+        -------
+        Iterable object
+            Iterable object which will give pandas.DataFrame of chunksize rows.
+        """
+        for start in range(0, len(dataframe), chunksize):
+            yield dataframe.iloc[start:start + chunksize]
+    
+    @staticmethod
+    def frame_to_records(dataframe: pandas.DataFrame) -> list:
+        """
+        This method will convert dataframe to list of tuples, which can be passed
+        as parameters to cursor.executemany. Missing values are converted to None.
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            Data which need to be converted.
+        
+        Returns
+        -------
+        list
+            list of tuples, one tuple for each row of dataframe.
+        """
+        frame = dataframe.astype(object)
+        frame = frame.where(pandas.notnull(frame), None)
+        return list(frame.itertuples(index=False, name=None))
+    
+    @staticmethod
+    def frame_to_csv(dataframe: pandas.DataFrame, file) -> None:
+        """
+        This method will write dataframe to file in the format expected by
+        LOAD DATA statement: comma separated, optionally enclosed by '"', no
+        escape character and NULL for missing values.
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            Data which need to be written.
+        
+        file : file object
+            Opened file in which data will be written.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        bool_columns = dataframe.select_dtypes(include="bool").columns
+        if len(bool_columns):
+            dataframe = dataframe.astype({col: "int8" for col in bool_columns})
+        dataframe.to_csv(file, header=False, index=False, na_rep="NULL", quoting=csv.QUOTE_MINIMAL,
+                         lineterminator="\n")
+    
+    @staticmethod
+    def row_hash_sql(columns: list, data_types: dict) -> str:
+        """
+        This method will build MySQL expression giving MD5 of row over columns,
+        same as frame_to_hashes gives for same values in dataframe.
+        
+        Note
+        ----
+            FLOAT and DOUBLE values are cast to DECIMAL(65, 30), which MySQL
+            builds from shortest text giving back same double, so every
+            change of value gives different hash, except changes below 1e-30
+            and of values above 1e35. Values whose text differs between MySQL
+            and pandas, like JSON or BLOB, always give different hash.
+        
+        Parameters
+        ----------
+        columns : list
+            Column names of table.
+        
+        data_types : dict
+            Dictionary with column name as key and MySQL data type as value.
+        
+        Returns
+        -------
+        str
+            MD5 expression returning 32 character hexadecimal string.
+        """
+        parts = []
+        for col in columns:
+            kind, scale = DataFrameConversion.__hash_kind(data_types[col])
+            expression = f"CAST(`{col}` AS DECIMAL(65, {FLOAT_HASH_SCALE}))" if kind in ("float", "double") \
+                else f"`{col}`"
+            parts.append(f"COALESCE(CAST({expression} AS CHAR), CHAR(0 USING utf8mb4))")
+        return f"MD5(CONCAT_WS(CHAR(31 USING utf8mb4), {', '.join(parts)}))"
+    
+    @staticmethod
+    def frame_to_hashes(dataframe: pandas.DataFrame, data_types: dict) -> numpy.ndarray:
+        """
+        This method will give MD5 of every row of dataframe, built column by
+        column from text MySQL would give for values, so it can be compared
+        with row_hash_sql computed on server.
+        
+        Note
+        ----
+            Text of rows is built with vectorized string operations, but MD5
+            is computed by hashlib row by row, as numpy and pandas have no
+            vectorized MD5 and hash must be same as MD5 of MySQL. Rows are
+            hashed from list of str, as iterating over string column is
+            much slower.
+            
+            FLOAT and DOUBLE values are written from shortest text giving
+            back same double, rounded half up to 30 decimal places, same as
+            DECIMAL(65, 30) of MySQL. FLOAT values are first rounded to single
+            precision, as stored by MySQL.
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            Data whose rows need to be hashed.
+        
+        data_types : dict
+            Dictionary with column name as key and MySQL data type as value.
+        
+        Returns
+        -------
+        numpy.ndarray
+            32 character hexadecimal MD5 of every row.
+        """
+        parts = []
+        for col in dataframe.columns:
+            series = dataframe[col]
+            missing = series.isna()
+            kind, scale = DataFrameConversion.__hash_kind(data_types[col])
+            if kind == "integer":
+                text = series.where(~missing, 0).astype("int64").astype(str)
+            elif kind in ("float", "double"):
+                values = series.astype("float64").fillna(0).to_numpy()
+                if kind == "float":
+                    values = values.astype("float32").astype("float64")
+                text = pandas.Series([DataFrameConversion.__float_hash_text(value) for value in values.tolist()],
+                                     index=series.index, dtype=object)
+            elif kind == "decimal":
+                text = series.where(~missing, 0).map(f"{{:.{scale}f}}".format)
+            elif kind == "datetime":
+                text = pandas.to_datetime(series).dt.strftime("%Y-%m-%d %H:%M:%S.%f").str[:20 + scale if scale else 19]
+            elif kind == "date":
+                text = pandas.to_datetime(series).dt.strftime("%Y-%m-%d")
+            else:
+                text = series.astype(str)
+            # NULL is set after conversion to str, as where of object column turns "\x00" into ""
+            parts.append(text.astype(str).where(~missing, "\x00"))
+        joined = parts[0].str.cat(parts[1:], sep="\x1f") if len(parts) > 1 else parts[0]
+        md5 = hashlib.md5
+        return numpy.array([md5(row.encode("utf-8")).hexdigest() for row in joined.tolist()], dtype=object)
+    
+    @staticmethod
+    def __float_hash_text(value: float) -> str:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        str
+            Text MySQL gives for CAST of double value AS DECIMAL(65, 30).
+        """
+        text = repr(value)
+        if "e" not in text:
+            # Text without exponent has at most 17 digits, padding it with zeros is same as rounding
+            whole, fraction = text.split(".")
+            return ("0" if whole == "-0" and not fraction.strip("0") else whole) + "." + \
+                fraction.ljust(FLOAT_HASH_SCALE, "0")
+        with decimal.localcontext() as context:
+            context.prec = 100
+            number = decimal.Decimal(text).quantize(decimal.Decimal(1).scaleb(-FLOAT_HASH_SCALE),
+                                                            rounding=decimal.ROUND_HALF_UP)
+            number = max(min(number, FLOAT_HASH_LIMIT), -FLOAT_HASH_LIMIT)
+            return format(number if number else decimal.Decimal(0).quantize(number), "f")
+    
+    @staticmethod
+    def __hash_kind(data_type: str) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        tuple
+            How values of MySQL data type are written as text for hashing, and
+            scale of DECIMAL or fractional seconds of DATETIME.
+        """
+        name = re.match(r"\w+", data_type.lower()).group(0)
+        sizes = [int(size) for size in re.findall(r"\d+", data_type)]
+        if name in ("tinyint", "smallint", "mediumint", "int", "integer", "bigint", "year"):
+            return "integer", 0
+        if name == "float":
+            return "float", 0
+        if name in ("double", "real"):
+            return "double", 0
+        if name in ("decimal", "numeric"):
+            return "decimal", sizes[1] if len(sizes) > 1 else 0
+        if name in ("datetime", "timestamp"):
+            return "datetime", sizes[0] if sizes else 0
+        if name == "date":
+            return "date", 0
+        return "text", 0
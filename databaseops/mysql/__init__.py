@@ -3,9 +3,38 @@
 This package created for operations on mysql database as it is dataframe
 """
 
+import importlib
+
 # Version of databaseops sub-package mysql
 __version__ = "1.0.0"
 
-from .mysqlops import MySQLOps
-from .mysqldatabase import MySQLDataBase
-from .mysqltable import MySQLTable
+# Classes of this package and modules they live in. Modules are imported on
+# first use of class.
+__lazy_imports = {
+    "MySQLOps": ".mysqlops",
+    "MySQLDataBase": ".mysqldatabase",
+    "MySQLTable": ".mysqltable",
+    "MySQLEnginePool": ".mysqlpool",
+    "MySQLMetadataCache": ".mysqlmetadata",
+    "MySQLResultCache": ".mysqlresultcache",
+    "MySQLSnapshotStore": ".mysqlsnapshot",
+    "AsyncMySQLTable": ".mysqlasync",
+    "MySQLInstrumentation": ".mysqlinstrumentation",
+    "InstrumentationHook": ".mysqlinstrumentation",
+    "Span": ".mysqlinstrumentation",
+    "Column": ".mysqlfilter",
+    "Condition": ".mysqlfilter",
+}
+__all__ = list(__lazy_imports)
+
+
+def __getattr__(name: str):
+    if name in __lazy_imports:
+        value = getattr(importlib.import_module(__lazy_imports[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,177 @@
+# coding=utf-8
+"""
+This file is for using table operations from asyncio code without blocking event loop
+"""
+
+import asyncio
+import functools
+import contextvars
+import threading
+import concurrent.futures
+from .mysqlpool import DEFAULT_POOL_OPTIONS
+from .mysqltable import MySQLTable
+
+# Returned by next when iterator is finished
+ITERATION_FINISHED = object()
+
+
+class AsyncMySQLTable:
+    """
+    Asyncio version of MySQLTable. Every method runs same method of
+    MySQLTable in thread pool shared by every async table, so event loop is
+    not blocked and many table operations can run at same time on one loop.
+    Thread pool has at most max_workers threads, as many as connections
+    default pool can give. Async iterators of chunked reads keep their
+    connection until they are finished or closed, and parallel reads and
+    writes use threads of their own, so calls can still wait for connection
+    while such operations are running.
+    
+    Example
+    -------
+    ``table = AsyncMySQLTable(host, user, password, db_name, table_name)``
+    
+    ``data = await table.read_table()``
+    
+    ``async for chunk in await table.read_table(chunksize = 10000):``
+    
+    Parameters
+    ----------
+    Parameters are same as of MySQLTable.
+    """
+    
+    # Number of threads of shared thread pool, used when pool is created, not bound on connections in use
+    max_workers = DEFAULT_POOL_OPTIONS["pool_size"] + DEFAULT_POOL_OPTIONS["max_overflow"]
+    __executor = None
+    __executor_lock = threading.Lock()
+    
+    def __init__(self, host: str, user: str, password: str, db_name: str, table_name: str,
+                 pool_options: dict = None, result_cache=None, snapshot_store=None) -> None:
+        self.table = MySQLTable(host, user, password, db_name, table_name, pool_options, result_cache, snapshot_store)
+    
+    @classmethod
+    def executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        This method returns thread pool shared by every async table, creating
+        it with max_workers threads on first use.
+        
+        Returns
+        -------
+        concurrent.futures.ThreadPoolExecutor
+            Shared thread pool.
+        """
+        with cls.__executor_lock:
+            if cls.__executor is None:
+                cls.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=cls.max_workers,
+                                                                       thread_name_prefix="databaseops")
+            return cls.__executor
+    
+    async def populate_table(self, *args, **kwargs) -> dict or None:
+        """
+        This method is same as MySQLTable.populate_table.
+        """
+        return await self.__run(self.table.populate_table, *args, **kwargs)
+    
+    async def update_table(self, *args, **kwargs) -> dict:
+        """
+        This method is same as MySQLTable.update_table.
+        """
+        return await self.__run(self.table.update_table, *args, **kwargs)
+    
+    async def sync_table(self, *args, **kwargs) -> dict:
+        """
+        This method is same as MySQLTable.sync_table.
+        """
+        return await self.__run(self.table.sync_table, *args, **kwargs)
+    
+    async def get_data_type(self) -> dict:
+        """
+        This method is same as MySQLTable.get_data_type.
+        """
+        return await self.__run(self.table.get_data_type)
+    
+    async def read_table(self, *args, **kwargs):
+        """
+        This method is same as MySQLTable.read_table. With chunksize, it
+        returns async iterator, every chunk is read in thread pool.
+        """
+        return await self.__run(self.table.read_table, *args, **kwargs)
+    
+    async def table_filter(self, *args, **kwargs):
+        """
+        This method is same as MySQLTable.table_filter. With chunksize, it
+        returns async iterator, every chunk is read in thread pool.
+        """
+        return await self.__run(self.table.table_filter, *args, **kwargs)
+    
+    async def aggregate(self, *args, **kwargs):
+        """
+        This method is same as MySQLTable.aggregate.
+        """
+        return await self.__run(self.table.aggregate, *args, **kwargs)
+    
+    async def iter_pages(self, *args, **kwargs):
+        """
+        This method is same as MySQLTable.iter_pages, it returns async
+        iterator of page and checkpoint.
+        """
+        return await self.__run(self.table.iter_pages, *args, **kwargs)
+    
+    async def export(self, *args, **kwargs) -> dict:
+        """
+        This method is same as MySQLTable.export.
+        """
+        return await self.__run(self.table.export, *args, **kwargs)
+    
+    async def import_file(self, *args, **kwargs) -> dict:
+        """
+        This method is same as MySQLTable.import_file.
+        """
+        return await self.__run(self.table.import_file, *args, **kwargs)
+    
+    async def refresh_snapshot(self, *args, **kwargs) -> dict:
+        """
+        This method is same as MySQLTable.refresh_snapshot.
+        """
+        return await self.__run(self.table.refresh_snapshot, *args, **kwargs)
+    
+    async def __run(self, method, *args, **kwargs):
+        """
+        This is privet method. Created for internal used only.
+        This method runs method in shared thread pool, with context of caller,
+        so span of instrumentation started by caller is parent of its spans.
+        
+        Returns
+        -------
+        Object
+            Result of method, or async iterator if method returned iterator.
+        """
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor(), functools.partial(contextvars.copy_context().run, method,
+                                                                               *args, **kwargs))
+        if hasattr(result, "__next__"):
+            return self.__iterate(result)
+        return result
+    
+    async def __iterate(self, iterator):
+        """
+        This is privet method. Created for internal used only.
+        This method gives items of iterator, every item is taken in shared
+        thread pool. If iteration is stopped early, iterator is closed, so its
+        connection goes back to pool.
+        
+        Returns
+        -------
+        Async iterator
+            Async iterator which will give items of iterator.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor()
+        try:
+            while True:
+                item = await loop.run_in_executor(executor, next, iterator, ITERATION_FINISHED)
+                if item is ITERATION_FINISHED:
+                    return
+                yield item
+        finally:
+            if hasattr(iterator, "close"):
+                await loop.run_in_executor(executor, iterator.close)
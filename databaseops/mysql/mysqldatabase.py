@@ -3,19 +3,30 @@
 This file is for mysql database connection for user to use database operations as dataframe operations
 """
 
+import contextlib
+import sqlalchemy
 import pymysql.connections
+from .mysqlpool import MySQLEnginePool
+from .mysqlinstrumentation import MySQLInstrumentation
 from ..helper import ListConversion
 
 
 class MySQLDataBase(ListConversion):
     
-    def __init__(self, host: str, user: str, password: str, db_name: str) -> None:
+    # Shared engine, taken from pool on first use
+    __sqlalchemy_engine = None
+    # Pooled connection and cursor checked out by my_db and my_cursor
+    __my_db = None
+    __my_cursor = None
+    
+    def __init__(self, host: str, user: str, password: str, db_name: str, pool_options: dict = None) -> None:
         """
         This class creates connection between python and MySQL database.
         If database exists name as db_name, it will create connection to that database.
         Otherwise it will create database name as db_name, will connect to that
-        database. Object instance of this class will contain connection link and
-        cursor link to given database.
+        database. Connections are taken from pool shared by every object
+        connected to same database with same user. Nothing is connected or
+        created until object is used for first time.
         
         Parameters
         ----------
@@ -27,44 +38,89 @@ class MySQLDataBase(ListConversion):
         
         db_name : Any MySQL database name from MySQL database, which you want
         connect.
+        
+        pool_options : Options like pool_size, max_overflow, pool_recycle and
+        pool_pre_ping for connection pool. Used only when pool for database is
+        created first time.
         """
         self.db_name = db_name
         self.host = host
         self.user = user
         self.password = password
-        self.__initialize_database()
+        self.pool_options = pool_options
     
-    def __initial_conn_db(self, **kwargs: object) -> [pymysql.connections.Connection, pymysql.cursors.Cursor]:
+    def __initialize_database(self) -> None:
         """
         This is privet method. Created for internal used only.
+        This method takes shared sqlalchemy engine for given db_name from pool
+        and keep it inside object instance
         
-        Parameters
-        ----------
-        kwargs : Args like database will be passed.
-
         Returns
         -------
-        pymysql.connections.Connection, pymysql.cursors.Cursor
-            connection link and cursor link to given database, If database
-            argument is not given connection link and cursor link entire MySQL database.
+        None
+            This methods returns nothing
         """
-        my_db = pymysql.connect(host=self.host, user=self.user, passwd=self.password, **kwargs)
-        my_cursor = my_db.cursor()
-        return my_db, my_cursor
-
-    def __initialize_database(self) -> None:
+        self.__sqlalchemy_engine = MySQLEnginePool.get_engine(self.host, self.user, self.password, self.db_name,
+                                                            self.pool_options)
+    
+    @property
+    def sqlalchemy_engine(self) -> sqlalchemy.engine.Engine:
         """
-        This is privet method. Created for internal used only.
-        This method create connection link and cursor link for given db_name inside
-        object instance
+        Shared sqlalchemy engine of database. Database and engine are created
+        on first use.
+        """
+        if self.__sqlalchemy_engine is None:
+            self.__initialize_database()
+        return self.__sqlalchemy_engine
+    
+    @contextlib.contextmanager
+    def pooled_cursor(self, cursor_class: type = None) -> pymysql.cursors.Cursor:
+        """
+        This method checks out connection from pool and gives cursor on it. Once
+        with block is finished, connection goes back to pool.
+        
+        Example
+        -------
+        ``with self.pooled_cursor() as cursor:``
+            ``cursor.execute("Show tables")``
+        
+        Parameters
+        ----------
+        cursor_class : type
+            PyMySQL cursor class like pymysql.cursors.SSCursor. If None, default
+            buffered cursor is used.
         
         Returns
         -------
-        None
-            This methods returns nothing
+        pymysql.cursors.Cursor
+            Cursor on pooled connection.
+        """
+        connection = self.sqlalchemy_engine.raw_connection()
+        try:
+            cursor = connection.cursor(MySQLInstrumentation.cursor_class(cursor_class))
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            connection.commit()
+        finally:
+            connection.close()
+    
+    @property
+    def my_db(self) -> pymysql.connections.Connection:
+        """
+        Pooled connection kept by this object for its whole life. Prefer
+        pooled_cursor, which gives connection back to pool after use.
+        """
+        if self.__my_db is None:
+            self.__my_db = self.sqlalchemy_engine.raw_connection()
+        return self.__my_db
+    
+    @property
+    def my_cursor(self) -> pymysql.cursors.Cursor:
+        """
+        Cursor on my_db connection.
         """
-        db, cursor = self.__initial_conn_db()
-        cursor.execute("Show Databases")
-        if self.db_name.lower() not in self.list_of_tuple_to_list([i for i in cursor]):
-            cursor.execute(f"Create Database {self.db_name}")
-        self.my_db, self.my_cursor = self.__initial_conn_db(database=self.db_name)
\ No newline at end of file
+        if self.__my_cursor is None:
+            self.__my_cursor = self.my_db.cursor(MySQLInstrumentation.cursor_class())
+        return self.__my_cursor
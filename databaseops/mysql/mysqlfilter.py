@@ -0,0 +1,207 @@
+# coding=utf-8
+"""
+This file is for building filter conditions of table_filter with bound parameters instead of raw strings
+"""
+
+
+class Condition:
+    """
+    Condition of WHERE clause with %s placeholders and parameters bound to
+    them. Conditions are combined with & for AND, | for OR and negated with ~.
+    
+    Example
+    -------
+    ``(Column("age") >= 18) & Column("city").isin(["Pune", "Mumbai"])``
+    
+    Parameters
+    ----------
+    sql : str
+        Condition with %s placeholder for every parameter.
+    
+    params : tuple
+        Parameters bound to placeholders.
+    
+    columns : tuple
+        Column names used by condition.
+    """
+    
+    def __init__(self, sql: str, params: tuple = (), columns: tuple = ()) -> None:
+        self.sql = sql
+        self.params = tuple(params)
+        self.columns = tuple(columns)
+    
+    def __and__(self, other: "Condition") -> "Condition":
+        return self.__combine("AND", other)
+    
+    def __or__(self, other: "Condition") -> "Condition":
+        return self.__combine("OR", other)
+    
+    def __invert__(self) -> "Condition":
+        return Condition(f"NOT ({self.sql})", self.params, self.columns)
+    
+    def __repr__(self) -> str:
+        return f"Condition({self.sql!r}, {self.params!r})"
+    
+    def __combine(self, operator: str, other: "Condition") -> "Condition":
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        Condition
+            Condition which is true when self operator other is true.
+        """
+        if not isinstance(other, Condition):
+            raise TypeError(f"Condition can be combined only with Condition, got {type(other).__name__}")
+        return Condition(f"({self.sql}) {operator} ({other.sql})", self.params + other.params,
+                         self.columns + tuple(col for col in other.columns if col not in self.columns))
+    
+    @staticmethod
+    def compile(where) -> tuple:
+        """
+        This method compiles where argument of table_filter to WHERE clause and
+        parameters. Strings are used as they are, with % escaped for
+        placeholders only if there are parameters, all conditions are joined
+        with AND.
+        
+        Parameters
+        ----------
+        where : Condition, str or list
+            Condition, raw condition string or list of them.
+        
+        Returns
+        -------
+        tuple
+            WHERE clause with %s placeholders, tuple of parameters or None if
+            there are no parameters, and tuple of column names used by
+            Condition objects. Query is formatted by driver only when
+            parameters are not None, so literal % is kept without them.
+        """
+        if isinstance(where, (Condition, str)):
+            where = [where]
+        clauses, params, columns = [], [], []
+        for condition in where:
+            if isinstance(condition, Condition):
+                clauses.append(condition)
+                params.extend(condition.params)
+                columns.extend(col for col in condition.columns if col not in columns)
+            elif isinstance(condition, str):
+                clauses.append(condition)
+            else:
+                raise TypeError(f"where should contain Condition or str, got {type(condition).__name__}")
+        clauses = [f"({clause.sql})" if isinstance(clause, Condition) else
+                   f"({clause.replace('%', '%%')})" if params else f"({clause})" for clause in clauses]
+        return " AND ".join(clauses), tuple(params) or None, tuple(columns)
+
+
+class Column:
+    """
+    Column of table used for building Condition. Comparison operators, isin,
+    between, like and is_null return Condition with value bound as
+    parameter, so it is escaped by driver and never formatted into query.
+    
+    Example
+    -------
+    ``my_sql_table.table_filter(where = Column("age").between(18, 30) | (Column("name") == "Ankush"))``
+    
+    Parameters
+    ----------
+    name : str
+        Column name from table.
+    
+    table : str
+        Table name of column, needed when column name is in more than one
+        table of join_table.
+    """
+    
+    def __init__(self, name: str, table: str = None) -> None:
+        self.name = name
+        self.table = table
+        self.__quoted = f"`{table}`.`{name}`" if table else f"`{name}`"
+    
+    def __compare(self, operator: str, value) -> Condition:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        Condition
+            Condition comparing column with value, None is compared with IS.
+        """
+        if value is None and operator in ("=", "!="):
+            return Condition(f"{self.__quoted} IS {'NOT ' if operator == '!=' else ''}NULL", columns=(self.name,))
+        return Condition(f"{self.__quoted} {operator} %s", (value,), (self.name,))
+    
+    def __eq__(self, value) -> Condition:
+        return self.__compare("=", value)
+    
+    def __ne__(self, value) -> Condition:
+        return self.__compare("!=", value)
+    
+    def __lt__(self, value) -> Condition:
+        return self.__compare("<", value)
+    
+    def __le__(self, value) -> Condition:
+        return self.__compare("<=", value)
+    
+    def __gt__(self, value) -> Condition:
+        return self.__compare(">", value)
+    
+    def __ge__(self, value) -> Condition:
+        return self.__compare(">=", value)
+    
+    __hash__ = None
+    
+    def isin(self, values: list) -> Condition:
+        """
+        This method returns condition true when column is equal to any of values.
+        
+        Parameters
+        ----------
+        values : list
+            Values of column.
+        
+        Returns
+        -------
+        Condition
+            IN condition, which is false for empty values.
+        """
+        values = tuple(values)
+        if not values:
+            return Condition("FALSE", columns=(self.name,))
+        return Condition(f"{self.__quoted} IN ({', '.join(['%s'] * len(values))})", values, (self.name,))
+    
+    def between(self, low, high) -> Condition:
+        """
+        This method returns condition true when column is between low and high,
+        both included.
+        
+        Returns
+        -------
+        Condition
+            BETWEEN condition.
+        """
+        return Condition(f"{self.__quoted} BETWEEN %s AND %s", (low, high), (self.name,))
+    
+    def like(self, pattern: str) -> Condition:
+        """
+        This method returns condition true when column matches pattern with %
+        and _ wildcards.
+        
+        Returns
+        -------
+        Condition
+            LIKE condition.
+        """
+        return self.__compare("LIKE", pattern)
+    
+    def is_null(self) -> Condition:
+        """
+        This method returns condition true when column is NULL.
+        
+        Returns
+        -------
+        Condition
+            IS NULL condition.
+        """
+        return self.__compare("=", None)
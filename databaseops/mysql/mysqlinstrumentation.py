@@ -0,0 +1,531 @@
+# coding=utf-8
+"""
+This file is for timing operations and queries of table objects, and passing them to hooks and slow query log
+"""
+
+import time
+import logging
+import functools
+import threading
+import contextlib
+import contextvars
+import pymysql.cursors
+
+
+class Span:
+    """
+    Timing of one operation of table object, like populate_table, or of one
+    query sent to server. Spans of queries have span of operation which ran
+    them as parent.
+    
+    Attributes
+    ----------
+    operation : str
+        Name of method, or "query" for query sent to server.
+    
+    table : str
+        Table name, None if operation is not on one table.
+    
+    sql : str
+        Query text with parameters bound, for spans of queries.
+    
+    rows : int
+        Rows read, written or affected, None if not known.
+    
+    bytes : int
+        Bytes of query text and of LOAD DATA files sent to server, summed from
+        queries for operations.
+    
+    timings : dict
+        Seconds spent in parts of operation. "execute" is time until server
+        answered query, "fetch" is time of reading and decoding rows by
+        driver, "build" is time of building pandas.DataFrame or pyarrow data.
+    
+    seconds : float
+        Total seconds, None until span is finished.
+    
+    error : BaseException
+        Exception raised by operation, None if it was successful.
+    """
+    
+    def __init__(self, operation: str, table: str = None, sql: str = None, parent: "Span" = None) -> None:
+        self.operation = operation
+        self.table = table
+        self.sql = sql
+        self.parent = parent
+        self.rows = None
+        self.bytes = 0
+        self.timings = {}
+        self.attributes = {}
+        self.error = None
+        self.seconds = None
+        self.start = time.perf_counter()
+    
+    @contextlib.contextmanager
+    def timing(self, name: str):
+        """
+        This method adds seconds spent in with block to timings under name.
+        
+        Example
+        -------
+        ``with span.timing("build"):``
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+    
+    def add_bytes(self, size: int) -> None:
+        """
+        This method adds size to bytes of span and of its parents.
+        """
+        span = self
+        while span is not None:
+            span.bytes += size
+            span = span.parent
+    
+    def __repr__(self) -> str:
+        return f"Span({self.operation!r}, table={self.table!r}, rows={self.rows!r}, seconds={self.seconds!r})"
+
+
+class NullSpan:
+    """
+    Span given when instrumentation is disabled. Every method does nothing.
+    """
+    
+    operation = table = sql = parent = rows = seconds = error = None
+    bytes = 0
+    
+    def timing(self, name: str):
+        return contextlib.nullcontext()
+    
+    def add_bytes(self, size: int) -> None:
+        pass
+    
+    def __setattr__(self, name: str, value) -> None:
+        pass
+
+
+class InstrumentationHook:
+    """
+    Base class of hooks added with MySQLInstrumentation.add_hook. Adapter for
+    OpenTelemetry or Prometheus overrides one or both methods.
+    """
+    
+    def span_started(self, span: Span) -> None:
+        """
+        This method is called when operation or query is started.
+        """
+    
+    def span_finished(self, span: Span) -> None:
+        """
+        This method is called when operation or query is finished, with
+        seconds, rows, bytes, timings and error filled.
+        """
+
+
+class MySQLInstrumentation:
+    """
+    Process wide registry of instrumentation hooks and slow query log. While
+    no hook is added and slow query log is disabled, table objects skip all
+    timing, so instrumentation costs one attribute lookup per operation.
+    
+    Example
+    -------
+    This will log every query taking more than 1 second to logger
+    databaseops.slow_query.
+    
+    ``MySQLInstrumentation.slow_query_log(seconds = 1.0)``
+    
+    This will call hook with every finished span.
+    
+    ``MySQLInstrumentation.add_hook(hook)``
+    """
+    
+    # True if any hook is added or slow query log is enabled
+    active = False
+    __hooks = ()
+    __slow_query_seconds = None
+    __slow_query_logger = logging.getLogger("databaseops.slow_query")
+    __lock = threading.Lock()
+    __current = contextvars.ContextVar("databaseops_span", default=None)
+    __null_span = NullSpan()
+    __cursor_classes = {}
+    
+    @classmethod
+    def add_hook(cls, hook: InstrumentationHook) -> None:
+        """
+        This method adds hook which will be called on start and finish of
+        every operation and query.
+        
+        Parameters
+        ----------
+        hook : InstrumentationHook
+            Object with span_started and span_finished methods.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with cls.__lock:
+            cls.__hooks = cls.__hooks + (hook,)
+            cls.__update_active()
+    
+    @classmethod
+    def remove_hook(cls, hook: InstrumentationHook) -> None:
+        """
+        This method removes hook added with add_hook.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with cls.__lock:
+            cls.__hooks = tuple(added for added in cls.__hooks if added is not hook)
+            cls.__update_active()
+    
+    @classmethod
+    def slow_query_log(cls, seconds: float = None, logger: logging.Logger = None) -> None:
+        """
+        This method enables logging of queries slower than seconds, with query
+        text, rows and timings, as warning. None disables it.
+        
+        Parameters
+        ----------
+        seconds : float
+            Threshold of slow query.
+        
+        logger : logging.Logger
+            Logger used, by default databaseops.slow_query.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with cls.__lock:
+            cls.__slow_query_seconds = seconds
+            if logger is not None:
+                cls.__slow_query_logger = logger
+            cls.__update_active()
+    
+    @classmethod
+    def current(cls) -> Span or NullSpan:
+        """
+        This method returns span of operation running in current thread or
+        task, NullSpan if there is none.
+        """
+        return cls.__current.get() or cls.__null_span
+    
+    @classmethod
+    def start(cls, operation: str, table: str = None, sql: str = None, parent: Span = None) -> Span or NullSpan:
+        """
+        This method starts span which is not made current span, for
+        operations which do not run inside one with block, like streamed
+        reads. It should be finished with finish.
+        
+        Parameters
+        ----------
+        operation : str
+            Name of operation, or "query".
+        
+        table : str
+            Table name.
+        
+        sql : str
+            Query text.
+        
+        parent : Span
+            Parent span, by default current span.
+        
+        Returns
+        -------
+        Span or NullSpan
+            Started span, NullSpan if instrumentation is disabled.
+        """
+        if not cls.active:
+            return cls.__null_span
+        span = Span(operation, table, sql, parent or cls.__current.get())
+        for hook in cls.__hooks:
+            hook.span_started(span)
+        return span
+    
+    @classmethod
+    def finish(cls, span: Span or NullSpan, error: BaseException = None, seconds: float = None) -> None:
+        """
+        This method finishes span started with start, passing it to hooks and
+        slow query log. Timings of query are added to timings of its parent.
+        
+        Parameters
+        ----------
+        span : Span or NullSpan
+            Span which need to be finished.
+        
+        error : BaseException
+            Exception raised by operation.
+        
+        seconds : float
+            Seconds of span, by default seconds since it was started.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        if isinstance(span, NullSpan):
+            return
+        span.error = error
+        span.seconds = time.perf_counter() - span.start if seconds is None else seconds
+        if span.operation == "query" and span.parent is not None:
+            for name, value in span.timings.items():
+                span.parent.timings[name] = span.parent.timings.get(name, 0.0) + value
+        for hook in cls.__hooks:
+            hook.span_finished(span)
+        threshold = cls.__slow_query_seconds
+        if threshold is not None and span.operation == "query" and span.seconds >= threshold:
+            cls.__slow_query_logger.warning("Slow query %.3f s, rows %s, timings %s: %s", span.seconds, span.rows,
+                                            span.timings, span.sql)
+    
+    @classmethod
+    @contextlib.contextmanager
+    def activate(cls, span: Span or NullSpan):
+        """
+        This method makes span started with start current span inside with
+        block, so queries run in block get it as parent.
+        
+        Example
+        -------
+        ``with MySQLInstrumentation.activate(span):``
+        """
+        if isinstance(span, NullSpan):
+            yield span
+            return
+        token = cls.__current.set(span)
+        try:
+            yield span
+        finally:
+            cls.__current.reset(token)
+    
+    @classmethod
+    @contextlib.contextmanager
+    def span(cls, operation: str, table: str = None, sql: str = None):
+        """
+        This method starts span, which is current span inside with block and is
+        finished when block ends. If instrumentation is disabled, NullSpan is
+        given.
+        
+        Example
+        -------
+        ``with MySQLInstrumentation.span("read_table", table_name) as span:``
+        
+        Parameters
+        ----------
+        operation : str
+            Name of operation, or "query".
+        
+        table : str
+            Table name.
+        
+        sql : str
+            Query text.
+        
+        Returns
+        -------
+        Span or NullSpan
+            Started span.
+        """
+        if not cls.active:
+            yield cls.__null_span
+            return
+        span = cls.start(operation, table, sql)
+        token = cls.__current.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as raised:
+            error = raised
+            raise
+        finally:
+            cls.__current.reset(token)
+            cls.finish(span, error)
+    
+    @classmethod
+    def cursor_class(cls, base: type = None) -> type:
+        """
+        This method returns PyMySQL cursor class which runs every query in span
+        of its own, or base as it is if instrumentation is disabled.
+        
+        Parameters
+        ----------
+        base : type
+            PyMySQL cursor class, by default pymysql.cursors.Cursor.
+        
+        Returns
+        -------
+        type
+            Cursor class.
+        """
+        base = base or pymysql.cursors.Cursor
+        if not cls.active:
+            return base
+        if base not in cls.__cursor_classes:
+            cls.__cursor_classes[base] = type(f"Instrumented{base.__name__}", (InstrumentedCursorMixin, base), {})
+        return cls.__cursor_classes[base]
+    
+    @classmethod
+    def before_cursor_execute(cls, conn, cursor, statement, parameters, context, executemany) -> None:
+        """
+        Listener of sqlalchemy before_cursor_execute event, which starts span
+        of query run by sqlalchemy, like pandas.DataFrame.to_sql.
+        """
+        if cls.active:
+            table = getattr(cls.current(), "table", None)
+            conn.info.setdefault("databaseops_spans", []).append(cls.start("query", table, statement))
+    
+    @classmethod
+    def after_cursor_execute(cls, conn, cursor, statement, parameters, context, executemany) -> None:
+        """
+        Listener of sqlalchemy after_cursor_execute event, which finishes span
+        of query run by sqlalchemy.
+        """
+        spans = conn.info.get("databaseops_spans")
+        if spans:
+            span = spans.pop()
+            span.rows = cursor.rowcount
+            span.add_bytes(len(statement))
+            span.timings["execute"] = time.perf_counter() - span.start
+            cls.finish(span)
+    
+    @classmethod
+    def handle_error(cls, exception_context) -> None:
+        """
+        Listener of sqlalchemy handle_error event, which finishes span of
+        failed query run by sqlalchemy.
+        """
+        connection = exception_context.connection
+        spans = connection.info.get("databaseops_spans") if connection is not None else None
+        if spans:
+            cls.finish(spans.pop(), exception_context.original_exception)
+    
+    @classmethod
+    def __update_active(cls) -> None:
+        """
+        This is privet method. Created for internal used only.
+        """
+        cls.active = bool(cls.__hooks) or cls.__slow_query_seconds is not None
+
+
+class InstrumentedCursorMixin:
+    """
+    Mixin of PyMySQL buffered cursor, which runs every execute in span of
+    query. Buffered cursor reads and decodes all rows inside execute.
+    """
+    
+    def execute(self, query, args=None):
+        table = getattr(MySQLInstrumentation.current(), "table", None)
+        span = MySQLInstrumentation.start("query", table, query)
+        try:
+            with span.timing("execute"):
+                rows = super().execute(query, args)
+        except BaseException as error:
+            MySQLInstrumentation.finish(span, error)
+            raise
+        span.sql = self._executed if isinstance(self._executed, str) else query
+        span.add_bytes(len(span.sql))
+        span.rows = rows
+        MySQLInstrumentation.finish(span)
+        return rows
+
+
+def result_rows(result) -> int or None:
+    """
+    This function returns number of rows of result of table method, None if
+    it is not known.
+    """
+    if isinstance(result, dict):
+        return result["rows"] if isinstance(result.get("rows"), int) else None
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    if hasattr(result, "num_rows"):
+        return result.num_rows
+    if isinstance(result, tuple) and result and hasattr(result[0], "__len__"):
+        return len(result[0])
+    if hasattr(result, "__len__") and not isinstance(result, str):
+        return len(result)
+    return None
+
+
+def instrumented(operation: str):
+    """
+    Decorator of table methods, which runs method in span of operation and
+    fills rows from its result. If method returns iterator, like chunked
+    read, span stays open until iterator is finished or closed, and rows
+    are counted from items it gives.
+
+    Parameters
+    ----------
+    operation : str
+        Name of operation.
+
+    Returns
+    -------
+    Method
+        Decorated method.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not MySQLInstrumentation.active:
+                return method(self, *args, **kwargs)
+            span = MySQLInstrumentation.start(operation, getattr(self, "table_name", None))
+            try:
+                with MySQLInstrumentation.activate(span):
+                    result = method(self, *args, **kwargs)
+            except BaseException as error:
+                MySQLInstrumentation.finish(span, error)
+                raise
+            if hasattr(result, "__next__"):
+                return iterate_in_span(span, result)
+            span.rows = result_rows(result)
+            MySQLInstrumentation.finish(span)
+            return result
+        return wrapper
+    return decorator
+
+
+def iterate_in_span(span: Span, iterator):
+    """
+    This function gives items of iterator, taking every item with span as
+    current span, and finishes span when iterator is finished, fails or is
+    closed.
+    
+    Returns
+    -------
+    Iterable object
+        Iterable object which will give items of iterator.
+    """
+    rows = 0
+    error = None
+    try:
+        while True:
+            with MySQLInstrumentation.activate(span):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            rows += result_rows(item) or 0
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as raised:
+        error = raised
+        raise
+    finally:
+        if hasattr(iterator, "close"):
+            with MySQLInstrumentation.activate(span):
+                iterator.close()
+        span.rows = rows
+        MySQLInstrumentation.finish(span, error)
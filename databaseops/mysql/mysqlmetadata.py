@@ -0,0 +1,144 @@
+# coding=utf-8
+"""
+This file is for caching columns, data types and keys of all tables of database, shared by all table objects
+"""
+
+import time
+import weakref
+import threading
+import sqlalchemy
+
+
+class MySQLMetadataCache:
+    """
+    Cache of columns, data types, keys, indexes and foreign keys of every
+    table of one database. Metadata of all tables is loaded from
+    information_schema by two queries on one connection, and is loaded again
+    after ttl seconds or after it is invalidated. Every table object using same engine shares one cache.
+    
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine
+        Engine of database whose metadata will be cached.
+    """
+    
+    # Seconds after which metadata is loaded again
+    ttl = 300
+    __caches = weakref.WeakKeyDictionary()
+    __caches_lock = threading.Lock()
+    
+    def __init__(self, engine: sqlalchemy.engine.Engine) -> None:
+        self.engine = engine
+        self.__tables = None
+        self.__loaded_at = 0.0
+        self.__lock = threading.Lock()
+    
+    @classmethod
+    def for_engine(cls, engine: sqlalchemy.engine.Engine) -> "MySQLMetadataCache":
+        """
+        This method returns cache shared by every object using engine.
+        
+        Parameters
+        ----------
+        engine : sqlalchemy.engine.Engine
+            Engine of database.
+        
+        Returns
+        -------
+        MySQLMetadataCache
+            Cache of database of engine.
+        """
+        with cls.__caches_lock:
+            cache = cls.__caches.get(engine)
+            if cache is None:
+                cache = cls.__caches[engine] = cls(engine)
+            return cache
+    
+    def table(self, table_name: str) -> dict or None:
+        """
+        This method returns metadata of table. Metadata is loaded if it is
+        older than ttl, or if table is not in it as it may have been created
+        after it was loaded.
+        
+        Parameters
+        ----------
+        table_name : str
+            Table name from database.
+        
+        Returns
+        -------
+        dict or None
+            Dictionary with "columns" as dictionary of column name and data
+            type, "nullable" as set of nullable columns, "indexes" as
+            dictionary of index name and dictionary with "unique" and
+            "columns", and "foreign_keys" as dictionary of constraint name and
+            dictionary with "columns", "referenced_table" and
+            "referenced_columns". None if table does not exist.
+        """
+        with self.__lock:
+            expired = time.monotonic() - self.__loaded_at > self.ttl
+            if self.__tables is None or expired or table_name not in self.__tables:
+                self.__load()
+            return self.__tables.get(table_name)
+    
+    def invalidate(self) -> None:
+        """
+        This method discards cached metadata, so it is loaded again on next use.
+        Table objects call it after changing structure of table.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with self.__lock:
+            self.__tables = None
+    
+    def __load(self) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method loads columns, indexes and foreign keys of all tables of
+        database.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT c.TABLE_NAME, c.COLUMN_NAME, c.COLUMN_TYPE, c.IS_NULLABLE, "
+                           "s.INDEX_NAME, s.NON_UNIQUE, s.SEQ_IN_INDEX "
+                           "FROM information_schema.COLUMNS AS c LEFT JOIN information_schema.STATISTICS AS s "
+                           "ON s.TABLE_SCHEMA = c.TABLE_SCHEMA AND s.TABLE_NAME = c.TABLE_NAME "
+                           "AND s.COLUMN_NAME = c.COLUMN_NAME "
+                           "WHERE c.TABLE_SCHEMA = DATABASE() ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION")
+            rows = cursor.fetchall()
+            cursor.execute("SELECT TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, "
+                           "REFERENCED_COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+                           "WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL "
+                           "ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION")
+            foreign_key_rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+        tables, positions = {}, {}
+        for table_name, column, data_type, nullable, index, non_unique, position in rows:
+            table = tables.setdefault(table_name, {"columns": {}, "nullable": set(), "indexes": {}, "foreign_keys": {}})
+            table["columns"][column] = data_type
+            if nullable == "YES":
+                table["nullable"].add(column)
+            if index is not None:
+                table["indexes"].setdefault(index, {"unique": not int(non_unique), "columns": []})
+                positions.setdefault((table_name, index), []).append((position, column))
+        for (table_name, index), columns in positions.items():
+            tables[table_name]["indexes"][index]["columns"] = [column for position, column in sorted(columns)]
+        for table_name, constraint, column, referenced_table, referenced_column in foreign_key_rows:
+            if table_name in tables:
+                foreign_key = tables[table_name]["foreign_keys"].setdefault(
+                    constraint, {"columns": [], "referenced_table": referenced_table, "referenced_columns": []})
+                foreign_key["columns"].append(column)
+                foreign_key["referenced_columns"].append(referenced_column)
+        self.__tables = tables
+        self.__loaded_at = time.monotonic()
@@ -3,18 +3,20 @@
 This file is for mysql database connection for user to use database operations as dataframe operations
 """
 
+import pymysql
 from .mysqltable import MySQLTable
 from .mysqldatabase import MySQLDataBase
+from .mysqlfilter import Condition
+from .mysqlresultcache import MySQLResultCache
+from .mysqlinstrumentation import instrumented
 
 
 class MySQLOps(MySQLTable):
     
-    def __init__(self, host: str, user: str, password: str, db_name: str) -> None:
+    def __init__(self, host: str, user: str, password: str, db_name: str, pool_options: dict = None) -> None:
         """
-        This class is in development mode, not working yet. This class inherits
-        MySQLTable and ListConversion. Purpose of this is to perform multiple
-        table operations like join. But currently it is in development process,
-        Not completed yet.
+        This class inherits MySQLTable and ListConversion. Purpose of this is to
+        perform multiple table operations like join, which are run on server.
         
         Parameters
         ----------
@@ -26,16 +28,170 @@ class MySQLOps(MySQLTable):
         
         db_name : Any MySQL database name from MySQL database, which you want
         connect.
+        
+        pool_options : Options like pool_size, max_overflow, pool_recycle and
+        pool_pre_ping for connection pool.
+        """
+        MySQLDataBase.__init__(self, host=host, user=user, password=password, db_name=db_name,
+                               pool_options=pool_options)
+    
+    @instrumented("join_table")
+    def join_table(self, left_table: str, right_table: str, on: str or list or dict = None, how: str = "inner",
+                   select: list = None, where: Condition or list = None, chunksize: int = None,
+                   format: str = "pandas", into: str = None, if_exists: str = "fail"):
+        """
+        This method will join two tables on server. Result is read same as
+        read_table, streamed in chunks if chunksize is given, or is written
+        to new table with CREATE TABLE ... AS SELECT if into is given, so rows
+        never come to python.
+        
+        Note
+        ----
+            If on is None, foreign key between tables is used. There should be
+            exactly one foreign key from one table to other.
+            
+            Column of right_table with same name as column of left_table is
+            named right_table_column, join columns with same name in both
+            tables are returned once.
+            
+            Before MySQL 8.0.21 CREATE TABLE ... AS SELECT is not allowed with
+            enforce_gtid_consistency.
+        
+        Example
+        -------
+        This will join orders with customers on foreign key, 10000 rows at time.
+        
+        ``for chunk in self.join_table("orders", "customers", chunksize = 10000):``
+        
+        This will create table city_orders on server.
+        
+        ``self.join_table("orders", "customers", on = {"customer_id": "id"}, into = "customer_orders")``
+        
+        Parameters
+        ----------
+        left_table : str
+            Table name from database.
+        
+        right_table : str
+            Table name from database which is joined to left_table.
+        
+        on : str or list or dict
+            Column name or list of column names which are in both tables, or
+            dictionary with column name of left_table as key and column name
+            of right_table as value. If None, foreign key is used.
+        
+        how : str
+            "inner", "left" or "right".
+        
+        select : list
+            Columns in result like "orders.amount". If None, all columns of
+            both tables.
+        
+        where : Condition or list
+            Filter of joined rows, same as where of table_filter. Use
+            Column(name, table=table_name) for column which is in both tables.
+        
+        chunksize : int
+            Number of rows in one iteration.
+        
+        format : str
+            "pandas" for pandas.DataFrame, "arrow" for pyarrow.Table.
+        
+        into : str
+            Table name which will be created from result on server.
+        
+        if_exists : str
+            What to do if table into already exists. Options are 'fail',
+            'replace' and 'append'.
+        
+        Returns
+        -------
+        pandas.DataFrame or Object or int
+            pandas.DataFrame or pyarrow.Table if chunksize is None else iterable
+            object of pandas.DataFrame or pyarrow.RecordBatch. Number of rows
+            written if into is given.
+        """
+        if how not in ("inner", "left", "right"):
+            raise ValueError(f"how should be 'inner', 'left' or 'right', got {how}")
+        if if_exists not in ("fail", "replace", "append"):
+            raise ValueError(f"if_exists should be 'fail', 'replace' or 'append', got {if_exists}")
+        left, right = self.__table_metadata(left_table), self.__table_metadata(right_table)
+        if on is None:
+            on = self.__foreign_key_columns(left_table, left, right_table, right)
+        elif isinstance(on, str):
+            on = {on: on}
+        elif not isinstance(on, dict):
+            on = {col: col for col in on}
+        condition = " AND ".join(f"`{left_table}`.`{left_col}` = `{right_table}`.`{right_col}`"
+                                 for left_col, right_col in on.items())
+        data_types = dict(right["columns"], **left["columns"])
+        if select is None:
+            shared = {left_col for left_col, right_col in on.items() if left_col == right_col}
+            select, data_types = [], {}
+            for col, data_type in left["columns"].items():
+                table = right_table if how == "right" and col in shared else left_table
+                select.append(f"`{table}`.`{col}`")
+                data_types[col] = data_type
+            for col, data_type in right["columns"].items():
+                if col in shared:
+                    continue
+                name = f"{right_table}_{col}" if col in data_types else col
+                select.append(f"`{right_table}`.`{col}`" + (f" AS `{name}`" if name != col else ""))
+                data_types[name] = data_type
+        query = f"SELECT {', '.join(select)} FROM `{left_table}` {how.upper()} JOIN `{right_table}` ON {condition}"
+        params = None
+        if where is not None:
+            where, params, _ = Condition.compile(where)
+            query = query + " WHERE " + where
+        if into is None:
+            return self.read_query(query, params, chunksize=chunksize, format=format, data_types=data_types)
+        exists = self.metadata_cache.table(into) is not None
+        with self.pooled_cursor() as cursor:
+            if exists and if_exists == "replace":
+                cursor.execute(f"DROP TABLE `{into}`")
+            if exists and if_exists == "append":
+                cursor.execute(f"INSERT INTO `{into}` {query}", params)
+            else:
+                cursor.execute(f"CREATE TABLE `{into}` AS {query}", params)
+            rows = cursor.rowcount
+        self.metadata_cache.invalidate()
+        MySQLResultCache.table_written(self.host, self.db_name, into)
+        return rows
+    
+    def __table_metadata(self, table_name: str) -> dict:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        dict
+            Metadata of table from metadata_cache.
         """
-        MySQLDataBase.__init__(self, host=host, user=user, password=password, db_name=db_name)
+        metadata = self.metadata_cache.table(table_name)
+        if metadata is None:
+            raise pymysql.err.ProgrammingError(1146, f"Table '{self.db_name}.{table_name}' doesn't exist")
+        return metadata
     
-    def join_table(self):
+    @staticmethod
+    def __foreign_key_columns(left_table: str, left: dict, right_table: str, right: dict) -> dict:
         """
-        This method is not working yet.
-        TODO: create join table with foreign key, use yield to achieve iteration
-        over object and commit changes into same table or create new table
+        This is privet method. Created for internal used only.
+        This method finds foreign key between two tables, declared on either
+        of them.
         
         Returns
         -------
-        pandas.DataFrame
+        dict
+            Dictionary with column name of left_table as key and column name of
+            right_table as value.
         """
+        candidates = [dict(zip(foreign_key["columns"], foreign_key["referenced_columns"]))
+                      for foreign_key in left["foreign_keys"].values()
+                      if foreign_key["referenced_table"] == right_table]
+        candidates += [dict(zip(foreign_key["referenced_columns"], foreign_key["columns"]))
+                       for foreign_key in right["foreign_keys"].values()
+                       if foreign_key["referenced_table"] == left_table]
+        if len(candidates) != 1:
+            raise ValueError(f"Found {len(candidates)} foreign keys between {left_table} and {right_table}, "
+                             f"pass on to join_table")
+        return candidates[0]
@@ -0,0 +1,150 @@
+# coding=utf-8
+"""
+This file is for sharing sqlalchemy engines and there connection pools between all database and table objects
+"""
+
+import hashlib
+import threading
+import urllib.parse
+import pymysql
+import sqlalchemy
+import sqlalchemy.event
+from .mysqlinstrumentation import MySQLInstrumentation
+
+# Pool options used when engine is created, can be overridden per engine with pool_options
+DEFAULT_POOL_OPTIONS = {"pool_size": 5, "max_overflow": 10, "pool_recycle": 3600, "pool_pre_ping": True}
+
+
+class MySQLEnginePool:
+    """
+    Process wide registry of sqlalchemy engines keyed by (host, user, db_name)
+    and hash of password. Every object connected to same database with same
+    credentials shares one engine and its connection pool, so creating new
+    object does not open any new connection, and object with other password
+    never gets connections opened with old one. Raw cursor operations and
+    pandas operations both take connections from this pool.
+    """
+    
+    __engines = {}
+    __lock = threading.Lock()
+    # Lock of every key, held while database and engine of key are created
+    __key_locks = {}
+    
+    @classmethod
+    def get_engine(cls, host: str, user: str, password: str, db_name: str,
+                   pool_options: dict = None) -> sqlalchemy.engine.Engine:
+        """
+        This method returns engine for given database. If engine is not created
+        yet, it will create database if it not exists and then engine with
+        pool_options.
+        
+        Note
+        ----
+            pool_options are used only when engine is created for first time,
+            afterwards existing engine is returned as it is.
+            
+            Database is created outside lock of registry, under lock of its
+            key only, so slow or unreachable server does not block objects of
+            other databases, and concurrent objects of same database create it
+            once.
+        
+        Parameters
+        ----------
+        host : str
+            Host name of MySQL database.
+        
+        user : str
+            User name of MySQL database.
+        
+        password : str
+            Password for above user name of MySQL database.
+        
+        db_name : str
+            Any MySQL database name from MySQL database, which you want connect.
+        
+        pool_options : dict
+            Options like pool_size, max_overflow, pool_recycle and pool_pre_ping
+            which will be passed to sqlalchemy.create_engine.
+        
+        Returns
+        -------
+        sqlalchemy.engine.Engine
+            Engine shared by every object connected to db_name with same
+            credentials.
+        """
+        # Password is kept in key only as hash, so registry holds no plain password
+        key = (host, user, db_name, hashlib.sha256(f"{user}\0{password}".encode()).hexdigest())
+        with cls.__lock:
+            engine = cls.__engines.get(key)
+            if engine is not None:
+                return engine
+            key_lock = cls.__key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with cls.__lock:
+                engine = cls.__engines.get(key)
+            if engine is not None:
+                return engine
+            cls.__create_database(host, user, password, db_name)
+            options = dict(DEFAULT_POOL_OPTIONS, **(pool_options or {}))
+            engine = sqlalchemy.create_engine(
+                f"mysql+pymysql://{urllib.parse.quote_plus(user)}:{urllib.parse.quote_plus(password)}"
+                f"@{host}/{db_name}", isolation_level="AUTOCOMMIT", connect_args={"local_infile": True},
+                **options)
+            sqlalchemy.event.listen(engine, "before_cursor_execute", MySQLInstrumentation.before_cursor_execute)
+            sqlalchemy.event.listen(engine, "after_cursor_execute", MySQLInstrumentation.after_cursor_execute)
+            sqlalchemy.event.listen(engine, "handle_error", MySQLInstrumentation.handle_error)
+            with cls.__lock:
+                cls.__engines[key] = engine
+        return engine
+    
+    @classmethod
+    def dispose(cls, host: str = None, user: str = None, db_name: str = None) -> None:
+        """
+        This method close all pooled connections of matching engines and remove
+        them from registry. Arguments which are None match every engine, engines
+        of every password of user are matched.
+        
+        Example
+        -------
+        This will close every pooled connection of this process.
+        
+        ``MySQLEnginePool.dispose()``
+        
+        Parameters
+        ----------
+        host : str
+            Host name of MySQL database.
+        
+        user : str
+            User name of MySQL database.
+        
+        db_name : str
+            MySQL database name.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with cls.__lock:
+            for key in list(cls.__engines):
+                if all(value is None or value == part for value, part in zip((host, user, db_name), key)):
+                    cls.__engines.pop(key).dispose()
+    
+    @staticmethod
+    def __create_database(host: str, user: str, password: str, db_name: str) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method create database name as db_name if it not exists.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        my_db = pymysql.connect(host=host, user=user, password=password)
+        try:
+            with my_db.cursor() as cursor:
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{db_name}`")
+        finally:
+            my_db.close()
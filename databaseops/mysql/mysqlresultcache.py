@@ -0,0 +1,250 @@
+# coding=utf-8
+"""
+This file is for caching results of repeated read queries, shared by table objects which use same cache
+"""
+
+import os
+import uuid
+import threading
+import collections
+import pandas
+from ..helper import ArrowConversion
+
+
+class MySQLResultCache(ArrowConversion):
+    """
+    Memory bounded least recently used cache of query results. Results are
+    stored with version of table they were read from, and are discarded when
+    version changes. Version is changed by every write of this library to
+    table, and, depending on validate, by UPDATE_TIME or CHECKSUM of table.
+    Results which do not fit in memory are written to spill_dir as Arrow IPC
+    file if spill_dir is given, else they are dropped. Spilled files are
+    removed, least recently used first, when their size crosses
+    max_spill_bytes.
+    
+    Note
+    ----
+        On MySQL 8 UPDATE_TIME of information_schema.TABLES is cached for
+        information_schema_stats_expiry seconds, so table objects set it to 0
+        for their session before reading UPDATE_TIME, to see changes made by
+        other clients immediately. UPDATE_TIME is kept in memory by InnoDB
+        and is lost on server restart. CHECKSUM TABLE reads whole table, use
+        it only for small tables.
+    
+    Example
+    -------
+    This will cache results of table_filter up to 256 MB in memory.
+    
+    ``MySQLTable(host, user, password, db_name, table_name, result_cache=MySQLResultCache())``
+    
+    Parameters
+    ----------
+    max_bytes : int
+        Maximum size of results kept in memory.
+    
+    spill_dir : str
+        Directory on local disk where results evicted from memory are written.
+        pyarrow is required for it.
+    
+    max_spill_bytes : int
+        Maximum size of files written to spill_dir.
+    
+    validate : str
+        None to trust only writes of this library, "update_time" to also
+        compare UPDATE_TIME of table and "checksum" to compare CHECKSUM TABLE
+        before every use of cached result.
+    """
+    
+    # Library writes to table, keyed by (host, db_name, table_name)
+    __versions = collections.Counter()
+    __versions_lock = threading.Lock()
+    
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2, spill_dir: str = None, validate: str = "update_time",
+                 max_spill_bytes: int = 1024 ** 3) -> None:
+        if validate not in (None, "update_time", "checksum"):
+            raise ValueError(f"validate should be None, 'update_time' or 'checksum', got {validate}")
+        if spill_dir:
+            self.import_pyarrow()
+            os.makedirs(spill_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.validate = validate
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = collections.OrderedDict()
+        self.__spilled = collections.OrderedDict()
+        self.__bytes = 0
+        self.__spilled_bytes = 0
+        self.__lock = threading.Lock()
+    
+    @classmethod
+    def table_written(cls, host: str, db_name: str, table_name: str) -> None:
+        """
+        This method changes version of table, so results read from it before
+        are not used by any cache. Table objects call it after every write.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with cls.__versions_lock:
+            cls.__versions[(host, db_name, table_name)] += 1
+    
+    @classmethod
+    def written(cls, host: str, db_name: str, table_name: str) -> int:
+        """
+        This method returns number of writes of this library to table.
+        
+        Returns
+        -------
+        int
+            Number of writes.
+        """
+        return cls.__versions[(host, db_name, table_name)]
+    
+    def get(self, key: tuple, version: tuple):
+        """
+        This method returns cached result for key, if it was cached with same
+        version of table.
+        
+        Parameters
+        ----------
+        key : tuple
+            Key of result, like query and its parameters.
+        
+        version : tuple
+            Current version of table.
+        
+        Returns
+        -------
+        pandas.DataFrame, pyarrow.Table or None
+            Copy of cached pandas.DataFrame, cached pyarrow.Table, or None if
+            result is not cached.
+        """
+        with self.__lock:
+            if key in self.__entries:
+                entry_version, result, size = self.__entries[key]
+                if entry_version == version:
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return result.copy() if isinstance(result, pandas.DataFrame) else result
+                self.__discard(key)
+            elif key in self.__spilled:
+                entry_version, path, is_pandas, size = self.__spilled[key]
+                if entry_version == version:
+                    self.__spilled.move_to_end(key)
+                    self.hits += 1
+                    table = self.import_pyarrow().ipc.open_file(path).read_all()
+                    return table.to_pandas() if is_pandas else table
+                self.__discard(key)
+            self.misses += 1
+            return None
+    
+    def put(self, key: tuple, version: tuple, result) -> None:
+        """
+        This method caches result for key, evicting least recently used
+        results if size of results crosses max_bytes.
+        
+        Parameters
+        ----------
+        key : tuple
+            Key of result.
+        
+        version : tuple
+            Version of table result was read from.
+        
+        result : pandas.DataFrame or pyarrow.Table
+            Result which need to be cached.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        if isinstance(result, pandas.DataFrame):
+            size = int(result.memory_usage(index=True, deep=True).sum())
+            result = result.copy()
+        else:
+            size = result.nbytes
+        with self.__lock:
+            self.__discard(key)
+            self.__entries[key] = (version, result, size)
+            self.__bytes += size
+            while self.__bytes > self.max_bytes and self.__entries:
+                self.__evict()
+    
+    def invalidate(self) -> None:
+        """
+        This method removes all cached results from memory and spill_dir.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with self.__lock:
+            for key in list(self.__entries) + list(self.__spilled):
+                self.__discard(key)
+    
+    def stats(self) -> dict:
+        """
+        This method returns counters of cache.
+        
+        Returns
+        -------
+        dict
+            Dictionary with hits, misses, evictions, number of entries in
+            memory and spilled to disk, and bytes in memory and on disk.
+        """
+        with self.__lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self.__entries), "spilled": len(self.__spilled), "bytes": self.__bytes,
+                    "spilled_bytes": self.__spilled_bytes}
+    
+    def __evict(self) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method removes least recently used result from memory, writing it
+        to spill_dir if spill_dir is given, and removes least recently used
+        spilled files while they are larger than max_spill_bytes.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        key, (version, result, size) = self.__entries.popitem(last=False)
+        self.__bytes -= size
+        self.evictions += 1
+        if self.spill_dir:
+            pyarrow = self.import_pyarrow()
+            is_pandas = isinstance(result, pandas.DataFrame)
+            table = pyarrow.Table.from_pandas(result, preserve_index=False) if is_pandas else result
+            path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.arrow")
+            with pyarrow.OSFile(path, "wb") as sink, pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            self.__spilled[key] = (version, path, is_pandas, os.path.getsize(path))
+            self.__spilled_bytes += self.__spilled[key][3]
+            while self.__spilled_bytes > self.max_spill_bytes and self.__spilled:
+                self.__discard(next(iter(self.__spilled)))
+    
+    def __discard(self, key: tuple) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method removes result of key from memory and spill_dir.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        if key in self.__entries:
+            self.__bytes -= self.__entries.pop(key)[2]
+        if key in self.__spilled:
+            _, path, _, size = self.__spilled.pop(key)
+            self.__spilled_bytes -= size
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,155 @@
+# coding=utf-8
+"""
+This file is for keeping local Arrow snapshots of tables, which are memory mapped when read and refreshed incrementally
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+from ..helper import ArrowConversion
+
+# Key of schema metadata under which snapshot manifest is stored
+MANIFEST_KEY = b"databaseops_snapshot"
+
+
+class MySQLSnapshotStore(ArrowConversion):
+    """
+    Directory of local snapshots of tables, one uncompressed Arrow IPC
+    (Feather v2) file per table. Snapshot is read with memory map, so
+    reading it copies no data until columns are used, and many processes
+    reading same snapshot share one copy in page cache. Manifest of snapshot,
+    with schema of table and state of incremental refresh, is stored in
+    schema metadata of same file, and file is replaced atomically on every
+    refresh. Snapshots are refreshed by MySQLTable.refresh_snapshot.
+    
+    Example
+    -------
+    This will keep snapshot of table in directory snapshots and read it from
+    there after refreshing it.
+    
+    ``table = MySQLTable(host, user, password, db_name, table_name, snapshot_store=MySQLSnapshotStore("snapshots"))``
+    
+    ``table.read_table(snapshot=True)``
+    
+    Parameters
+    ----------
+    directory : str
+        Directory on local disk where snapshots are written. pyarrow is
+        required for it.
+    """
+    
+    def __init__(self, directory: str) -> None:
+        self.import_pyarrow()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+    
+    def path(self, host: str, db_name: str, table_name: str) -> str:
+        """
+        This method returns path of snapshot file of table.
+        
+        Returns
+        -------
+        str
+            Path of Arrow file, which may not exist yet.
+        """
+        name = "__".join(re.sub(r"[^\w.-]", "_", part) for part in (host, db_name, table_name))
+        return os.path.join(self.directory, f"{name}.arrow")
+    
+    def load(self, host: str, db_name: str, table_name: str) -> tuple:
+        """
+        This method memory maps snapshot of table.
+        
+        Returns
+        -------
+        tuple
+            pyarrow.Table backed by memory map and manifest dictionary, or
+            (None, None) if there is no snapshot.
+        """
+        path = self.path(host, db_name, table_name)
+        if not os.path.exists(path):
+            return None, None
+        pyarrow = self.import_pyarrow()
+        try:
+            table = pyarrow.ipc.open_file(pyarrow.memory_map(path, "r")).read_all()
+        except (OSError, pyarrow.ArrowInvalid):
+            return None, None
+        metadata = table.schema.metadata or {}
+        if MANIFEST_KEY not in metadata:
+            return None, None
+        return table.replace_schema_metadata(None), json.loads(metadata[MANIFEST_KEY])
+    
+    def save(self, host: str, db_name: str, table_name: str, table, manifest: dict) -> None:
+        """
+        This method writes snapshot of table with its manifest. File is
+        written beside old snapshot and renamed over it, so readers never see
+        half written snapshot, and memory maps of old snapshot stay valid.
+        
+        Parameters
+        ----------
+        table : pyarrow.Table
+            Rows of table.
+        
+        manifest : dict
+            State of snapshot, saved as JSON.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        pyarrow = self.import_pyarrow()
+        path = self.path(host, db_name, table_name)
+        table = table.replace_schema_metadata({MANIFEST_KEY: json.dumps(manifest, default=str)})
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with pyarrow.OSFile(temporary, "wb") as sink, pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+    
+    def age(self, host: str, db_name: str, table_name: str) -> float:
+        """
+        This method returns seconds since snapshot of table was last written
+        or found up to date by refresh.
+        
+        Returns
+        -------
+        float
+            Age of snapshot in seconds, or None if there is no snapshot.
+        """
+        try:
+            return time.time() - os.path.getmtime(self.path(host, db_name, table_name))
+        except OSError:
+            return None
+    
+    def touch(self, host: str, db_name: str, table_name: str) -> None:
+        """
+        This method marks snapshot of table as up to date without writing it
+        again, by setting modification time of its file to now.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        path = self.path(host, db_name, table_name)
+        if os.path.exists(path):
+            os.utime(path)
+    
+    def invalidate(self, host: str, db_name: str, table_name: str) -> None:
+        """
+        This method removes snapshot of table, so next refresh reads whole
+        table again.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        path = self.path(host, db_name, table_name)
+        if os.path.exists(path):
+            os.remove(path)
@@ -3,14 +3,58 @@
 This file is for mysql database connection for user to use database operations as dataframe operations
 """
 
+import os
+import re
+import uuid
+import gzip
+import queue
+import threading
+import itertools
+import contextvars
+import concurrent.futures
+import json
+import time
+import random
+import numpy
 import pandas
+import tempfile
 import sqlalchemy
+import sqlalchemy.dialects.mysql
+import pymysql.cursors
 import pymysql.connections
 import warnings
 from .mysqldatabase import MySQLDataBase
+from .mysqlmetadata import MySQLMetadataCache
+from .mysqlresultcache import MySQLResultCache
+from .mysqlsnapshot import MySQLSnapshotStore
+from .mysqlfilter import Condition
+from .mysqlinstrumentation import MySQLInstrumentation
+from .mysqlinstrumentation import instrumented
+from ..helper import ArrowConversion
+from ..helper import DataFrameConversion
+from ..helper import DataTypeConversion
 
+# File formats of export and import_file and extensions they are known from
+FILE_FORMATS = {"parquet": (".parquet", ".pq"), "csv.gz": (".csv.gz", ".gz"), "csv": (".csv",)}
+# Error codes raised by server or client when LOAD DATA LOCAL INFILE is disabled
+LOCAL_INFILE_DISABLED_ERRORS = (1148, 2068, 3948)
+# Error codes of deadlock and lock wait timeout, after which chunk can be retried
+DEADLOCK_ERRORS = (1205, 1213)
+# Error codes raised when ALTER TABLE can not be done with ALGORITHM=INPLACE, LOCK=NONE
+ONLINE_ALTER_UNSUPPORTED_ERRORS = (1845, 1846)
+# Oldest server version knowing ALGORITHM and LOCK clauses of ALTER TABLE, MariaDB versions start from 10
+ONLINE_ALTER_MIN_VERSION = (5, 6)
+# Largest number of key ranges read by sample of aggregate
+SAMPLE_RANGES = 100
+# Rows fetched and converted to one pyarrow.RecordBatch at a time by reads with format="arrow"
+ARROW_FETCH_ROWS = 65536
+# Warning code given by InnoDB when ALTER TABLE ... ORDER BY is ignored for table clustered on unique key
+ORDER_BY_IGNORED_WARNING = 1105
+# Error code of unknown system variable, raised by servers older than MySQL 8 for information_schema_stats_expiry
+UNKNOWN_VARIABLE_ERROR = 1193
 
-class MySQLTable(MySQLDataBase):
+
+class MySQLTable(MySQLDataBase, DataFrameConversion, DataTypeConversion, ArrowConversion):
     """
     The object instance of this class will able to perform multiple operations
     on database table like read, filter, sort, remove_duplicates, update etc.
@@ -31,84 +75,414 @@ class MySQLTable(MySQLDataBase):
 
     table_name : str
         Table name from above MySQL database, which you want connect.
+    
+    pool_options : dict
+        Options like pool_size, max_overflow, pool_recycle and pool_pre_ping
+        for connection pool. Used only when pool for database is created first
+        time.
+    
+    result_cache : MySQLResultCache
+        Cache of results of table_filter. If None, results are not cached.
+        Same cache can be shared by many table objects.
+    
+    snapshot_store : MySQLSnapshotStore
+        Store of local snapshot of table, used by read_table with
+        snapshot=True. Same store can be shared by many table objects.
     """
     
-    def __init__(self, host: str, user: str, password: str, db_name: str, table_name: str) -> None:
+    # Pooled sqlalchemy connection checked out by conn
+    __conn = None
+    # False once server or client refused LOAD DATA LOCAL INFILE
+    __local_infile = True
+    # Maximum statement length for batched INSERT, derived from max_allowed_packet
+    __max_stmt_length = None
+    # False once server did not know information_schema_stats_expiry, which only MySQL 8 caches UPDATE_TIME with
+    __stats_expiry = True
+    # Cache of results of table_filter, None if results are not cached
+    result_cache = None
+    # Store of local snapshot of table, None if table has no snapshot
+    snapshot_store = None
+    
+    def __init__(self, host: str, user: str, password: str, db_name: str, table_name: str,
+                 pool_options: dict = None, result_cache: MySQLResultCache = None,
+                 snapshot_store: MySQLSnapshotStore = None) -> None:
         if not hasattr(self, "host") or not hasattr(self, "user") or not hasattr(self, "password") or not hasattr(
                 self, "db_name"):
-            MySQLDataBase.__init__(self, host, user, password, db_name)
+            MySQLDataBase.__init__(self, host, user, password, db_name, pool_options)
         self.table_name = table_name
-        self.__sqlalchemy()
+        self.result_cache = result_cache
+        self.snapshot_store = snapshot_store
     
-    @staticmethod
-    def __update_insertion_method(meta: sqlalchemy.MetaData):
+    def __reduce__(self) -> tuple:
+        """
+        Table object is pickled as arguments it was created with, so it can be
+        sent to worker process, where it connects through MySQLEnginePool of
+        that process. result_cache and snapshot_store are not sent.
+        """
+        return type(self), (self.host, self.user, self.password, self.db_name, self.table_name, self.pool_options)
+    
+    @property
+    def conn(self) -> sqlalchemy.engine.Connection:
+        """
+        Pooled sqlalchemy connection kept by this object for its whole life.
+        Methods of this class use sqlalchemy_engine instead, which gives
+        connection back to pool after use.
+        """
+        if self.__conn is None:
+            self.__conn = self.sqlalchemy_engine.connect()
+        return self.__conn
+    
+    @instrumented("populate_table")
+    def populate_table(self, dataframe: pandas.DataFrame, if_exists: str = 'append', bulk: str = None,
+                       chunksize: int = 100000, parallel: int = None, infer_schema: bool = False) -> dict or None:
+        """
+        This method append dataframe data to MySQL table.
+        
+        Note
+        ----
+            if_exists : This parameter is about table, Don't confuse it about
+            data inside table.
+            
+            With bulk="load_data" string values equal to 'NULL' will be
+            stored as NULL, as this is how LOAD DATA represents missing values.
+            
+            With parallel, chunks are written at same time over parallel pooled
+            connections. Every chunk is written in its own transaction and is
+            retried on deadlock or lock wait timeout.
+        
+        Example
+        -------
+        This will add the data to database table.
+        
+        ``self.populate_table(dataframe = Data)``
+        
+        This will add the data to database table with LOAD DATA LOCAL INFILE in
+        chunks of 100000 rows.
+        
+        ``self.populate_table(dataframe = Data, bulk = "load_data")``
+        
+        This will add chunks of every dataframe of iterable object over 4
+        connections at same time.
+        
+        ``self.populate_table(dataframe = pandas.read_csv(file, chunksize = 100000), parallel = 4)``
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame or Iterable object
+            Data which need to added to table, or iterable object which will
+            give pandas.DataFrame.
+        
+        if_exists : str
+            This parameter will decide what to do if table name
+            table_name already exists. Options are 'fail', 'replace' and 'append'.
+        
+        bulk : str
+            If None, data is added with pandas.DataFrame.to_sql. If "load_data",
+            data is written in chunks to temporary csv file and loaded with
+            LOAD DATA LOCAL INFILE, falling back to "insert" if local_infile is
+            disabled. If "insert", data is added with batched multi-row INSERT.
+            If parallel is given, None is same as "insert".
+        
+        chunksize : int
+            Number of rows in one chunk for bulk loading.
+        
+        parallel : int
+            Number of chunks written at same time.
+        
+        infer_schema : bool
+            If True and table gets created, narrowest MySQL data type which
+            can hold values is used for every column, like VARCHAR(n) instead
+            of TEXT and TINYINT instead of BIGINT. For iterable object types
+            are inferred from first dataframe with some headroom, and columns
+            are widened with ALTER TABLE before dataframe whose values do not
+            fit them is written, see widen_mysql_types.
+        
+        Returns
+        -------
+        dict or None
+            None if data is added with pandas.DataFrame.to_sql, else dictionary
+            with total rows, seconds and rows_per_second, same figures for every
+            loading method used under methods, and rows, seconds, attempts and
+            method of every chunk under chunks.
+        """
+        if bulk is None and parallel:
+            bulk = "insert"
+        if bulk is None:
+            sample = not isinstance(dataframe, pandas.DataFrame)
+            inferred = False
+            for frame in dataframe if sample else [dataframe]:
+                if infer_schema:
+                    inferred = if_exists == "replace" or self.metadata_cache.table(self.table_name) is None
+                elif inferred:
+                    self.__widen_columns(frame.reset_index())
+                dtype = self.infer_mysql_types(frame.reset_index(), widen=sample) if infer_schema else None
+                frame.to_sql(name=self.table_name, con=self.sqlalchemy_engine, if_exists=if_exists, method=None,
+                             dtype=dtype)
+                self.__table_written()
+                if if_exists == "replace":
+                    self.metadata_cache.invalidate()
+                if_exists, infer_schema = "append", False
+            return None
+        if bulk not in ("load_data", "insert"):
+            raise ValueError(f"bulk should be None, 'load_data' or 'insert', got {bulk}")
+        table_columns, chunks = self.__prepare_chunks(dataframe, if_exists, chunksize, infer_schema)
+        try:
+            return self.__write_chunks(chunks, self.__bulk_writer(table_columns, bulk), parallel)
+        finally:
+            self.__table_written()
+    
+    def __bulk_writer(self, table_columns: list, bulk: str):
         """
         This is privet method. Created for internal used only.
         
         Parameters
         ----------
-        meta : sqlalchemy.MetaData
-            This is the metadata for MySQL database table.
-
+        table_columns : list
+            Columns of table in order of chunk columns.
+        
+        bulk : str
+            "load_data" or "insert".
+        
         Returns
         -------
         Method
-            It returns the method which will be used into update_table.
+            Method which add chunk to table with LOAD DATA LOCAL INFILE or
+            batched INSERT and return name of method used.
+        """
+        columns = ", ".join(f"`{col}`" for col in table_columns)
+        statement = f"INSERT INTO `{self.table_name}` ({columns}) VALUES ({', '.join(['%s'] * len(table_columns))})"
+        
+        def write(chunk: pandas.DataFrame) -> str:
+            if bulk == "load_data" and self.__local_infile:
+                try:
+                    self.__load_data(chunk, columns)
+                    return "load_data"
+                except pymysql.err.MySQLError as error:
+                    if error.args[0] not in LOCAL_INFILE_DISABLED_ERRORS:
+                        raise
+                    if self.__local_infile:
+                        self.__local_infile = False
+                        warnings.warn("LOAD DATA LOCAL INFILE is disabled, falling back to batched INSERT",
+                                      stacklevel=5)
+            self.__insert_rows(chunk, statement)
+            return "insert"
+        
+        return write
+    
+    def __prepare_chunks(self, dataframe: pandas.DataFrame, if_exists: str, chunksize: int,
+                         infer_schema: bool = False, index: bool = True) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        This method create table from columns of first dataframe, as
+        pandas.DataFrame.to_sql would, and split data into chunks.
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame or Iterable object
+            Data which need to added to table, or iterable object which will
+            give pandas.DataFrame.
+        
+        if_exists : str
+            What to do if table_name already exists. Options are 'fail',
+            'replace' and 'append'.
+        
+        chunksize : int
+            Number of rows in one chunk.
+        
+        infer_schema : bool
+            If True, table is created with narrowest MySQL data types for
+            values of first dataframe, and columns of created table are
+            widened for values of later dataframes.
+        
+        index : bool
+            If True, index of dataframe is written as column, as
+            pandas.DataFrame.to_sql does.
+        
+        Returns
+        -------
+        tuple
+            list of table columns and iterable object which will give
+            pandas.DataFrame of chunksize rows with index as column.
         """
-        def method(table, conn, keys, data_iter):
-            sql_table = sqlalchemy.Table(table.name, meta, autoload=True)
-            insert_stmt = sqlalchemy.dialects.mysql.insert(sql_table).values(
-                [dict(zip(keys, data)) for data in data_iter])
-            upsert_stmt = insert_stmt.on_duplicate_key_update({x.name: x for x in insert_stmt.inserted})
-            conn.execute(upsert_stmt)
+        frames = iter([dataframe]) if isinstance(dataframe, pandas.DataFrame) else iter(dataframe)
+        first = next(frames, None)
+        if first is None:
+            raise ValueError("No dataframe is given to write into table")
+        with_index = (lambda frame: frame.reset_index()) if index else (lambda frame: frame)
+        dtype = None
+        if infer_schema:
+            infer_schema = if_exists == "replace" or self.metadata_cache.table(self.table_name) is None
+            dtype = self.infer_mysql_types(with_index(first), widen=not isinstance(dataframe, pandas.DataFrame))
+        first.head(0).to_sql(name=self.table_name, con=self.sqlalchemy_engine, if_exists=if_exists, index=index,
+                             dtype=dtype)
+        if if_exists == "replace":
+            self.metadata_cache.invalidate()
         
-        return method
+        def widened(later_frames):
+            for frame in later_frames:
+                self.__widen_columns(with_index(frame))
+                yield frame
+        
+        if infer_schema:
+            # Columns inferred from first dataframe are widened before later dataframe is split into chunks
+            frames = widened(frames)
+        chunks = (chunk for frame in itertools.chain([first], frames)
+                  for chunk in self.iter_chunks(with_index(frame), chunksize))
+        return list(with_index(first.head(0)).columns), chunks
     
-    def __sqlalchemy(self) -> None:
+    def __widen_columns(self, dataframe: pandas.DataFrame) -> None:
         """
         This is privet method. Created for internal used only.
+        This method widens data types of table columns which can not hold
+        values of dataframe, with one ALTER TABLE.
         
         Returns
         -------
         None
-            But create sqlalchemy_engine.connect inside object instance.
+            It returns nothing.
         """
-        self.sqlalchemy_engine = sqlalchemy.create_engine(
-            f"mysql+pymysql://{self.user}:{self.password}@{self.host}/{self.db_name}", isolation_level="AUTOCOMMIT")
-        self.conn = self.sqlalchemy_engine.connect()
+        wider = self.widen_mysql_types(self.get_data_type(), dataframe)
+        if not wider:
+            return
+        dialect = sqlalchemy.dialects.mysql.dialect()
+        modify = ", ".join(f"MODIFY COLUMN `{col}` {data_type.compile(dialect=dialect)}"
+                           for col, data_type in wider.items())
+        with self.pooled_cursor() as cursor:
+            cursor.execute(f"ALTER TABLE `{self.table_name}` {modify}")
+        self.metadata_cache.invalidate()
     
-    def populate_table(self, dataframe: pandas.DataFrame, if_exists: str = 'append') -> None:
+    def __write_chunks(self, chunks, write, parallel: int = None, retries: int = 3) -> dict:
         """
-        This method append dataframe data to MySQL table.
+        This is privet method. Created for internal used only.
+        This method write chunks with write method, over parallel pooled
+        connections at same time if parallel is given. Chunk which fails on
+        deadlock or lock wait timeout is retried up to retries times.
         
-        Note
-        ----
-            if_exists : This parameter is about table, Don't confuse it about
-            data inside table.
+        Parameters
+        ----------
+        chunks : Iterable object
+            Iterable object which will give pandas.DataFrame.
         
-        Example
+        write : Method
+            Method which write one chunk and returns name of method used.
+        
+        parallel : int
+            Number of chunks written at same time. At most twice as many
+            chunks are kept in memory.
+        
+        retries : int
+            Number of times chunk is retried.
+        
+        Returns
         -------
-        This will add the data to database table.
+        dict
+            Dictionary with total rows, seconds and rows_per_second, same
+            figures for every method under methods and figures of every chunk
+            under chunks.
+        """
+        start = time.perf_counter()
         
-        ``self.populate_table(dataframe = Data)``
+        def run(number: int, chunk: pandas.DataFrame) -> dict:
+            chunk_start = time.perf_counter()
+            for attempt in range(1, retries + 2):
+                try:
+                    method = write(chunk)
+                except pymysql.err.MySQLError as error:
+                    if error.args[0] not in DEADLOCK_ERRORS or attempt > retries:
+                        raise
+                    time.sleep(0.05 * 2 ** attempt)
+                    continue
+                return {"chunk": number, "rows": len(chunk), "seconds": time.perf_counter() - chunk_start,
+                        "attempts": attempt, "method": method}
+        
+        if not parallel or parallel <= 1:
+            chunk_reports = [run(number, chunk) for number, chunk in enumerate(chunks)]
+        else:
+            chunk_reports = []
+            with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+                pending = set()
+                for number, chunk in enumerate(chunks):
+                    if len(pending) >= 2 * parallel:
+                        done, pending = concurrent.futures.wait(pending,
+                                                                return_when=concurrent.futures.FIRST_COMPLETED)
+                        chunk_reports.extend(future.result() for future in done)
+                    pending.add(executor.submit(contextvars.copy_context().run, run, number, chunk))
+                chunk_reports.extend(future.result() for future in concurrent.futures.as_completed(pending))
+            chunk_reports.sort(key=lambda chunk_report: chunk_report["chunk"])
+        methods = {}
+        for chunk_report in chunk_reports:
+            stats = methods.setdefault(chunk_report["method"], {"rows": 0, "seconds": 0.0})
+            stats["rows"] += chunk_report["rows"]
+            stats["seconds"] += chunk_report["seconds"]
+        for stats in methods.values():
+            stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        seconds = time.perf_counter() - start
+        rows = sum(chunk_report["rows"] for chunk_report in chunk_reports)
+        return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds else 0.0,
+                "methods": methods, "chunks": chunk_reports}
+    
+    def __load_data(self, dataframe: pandas.DataFrame, columns: str) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method write dataframe to temporary csv file and load it to table
+        with LOAD DATA LOCAL INFILE.
         
         Parameters
         ----------
         dataframe : pandas.DataFrame
             Data which need to added to table.
         
-        if_exists : str
-            This parameter will decide what to do if table name
-            table_name already exists. Options are 'fail', 'replace' and 'append'.
+        columns : str
+            Comma separated column names of table in order of dataframe columns.
 
         Returns
         -------
         None
             It returns nothing.
         """
-        dataframe.to_sql(name=self.table_name, con=self.sqlalchemy_engine, if_exists=if_exists, method=None)
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", encoding="utf-8", delete=False) as file:
+            self.frame_to_csv(dataframe, file)
+        MySQLInstrumentation.current().add_bytes(os.path.getsize(file.name))
+        try:
+            with self.pooled_cursor() as cursor:
+                cursor.execute(f"LOAD DATA LOCAL INFILE %s INTO TABLE `{self.table_name}` "
+                               "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                               f"ESCAPED BY '' LINES TERMINATED BY '\\n' ({columns})", (file.name,))
+        finally:
+            os.remove(file.name)
+    
+    def __insert_rows(self, dataframe: pandas.DataFrame, statement: str) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method add dataframe to table with statement in one transaction.
+        PyMySQL executemany rewrites statement into multi-row INSERT statements,
+        each one shorter than max_allowed_packet of server.
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            Data which need to added to table.
+        
+        statement : str
+            INSERT statement with one %s placeholder for every column of dataframe.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        with self.pooled_cursor() as cursor:
+            if self.__max_stmt_length is None:
+                cursor.execute("SELECT @@max_allowed_packet")
+                # Leave room for packet header and statement prefix
+                self.__max_stmt_length = max(cursor.fetchone()[0] - 1024, 1024)
+            cursor.max_stmt_length = self.__max_stmt_length
+            cursor.execute("START TRANSACTION")
+            cursor.executemany(statement, self.frame_to_records(dataframe))
     
-    def update_table(self, dataframe: pandas.DataFrame, if_exists: str = 'append') -> None:
+    @instrumented("update_table")
+    def update_table(self, dataframe: pandas.DataFrame, if_exists: str = 'append', update_columns: list = None,
+                     chunksize: int = 100000, parallel: int = None) -> dict:
         """
         This method will replace data in table if it already exist based upon
         duplicate values in primary key of table.
@@ -120,6 +494,10 @@ class MySQLTable(MySQLDataBase):
         
             if_exists : This parameter is about table, Don't confuse it about
             data inside table.
+            
+            With parallel, chunks are written at same time over parallel pooled
+            connections. Every chunk is written in its own transaction and is
+            retried on deadlock or lock wait timeout.
         
         Example
         -------
@@ -127,25 +505,228 @@ class MySQLTable(MySQLDataBase):
         
         ``self.update_table(dataframe = Data)``
         
+        This will update only column_1 for rows which already exist in table.
+        
+        ``self.update_table(dataframe = Data, update_columns = ["column_1"])``
+        
         Parameters
         ----------
-        dataframe : pandas.DataFrame
-            Data which need to added to table.
+        dataframe : pandas.DataFrame or Iterable object
+            Data which need to added to table, or iterable object which will
+            give pandas.DataFrame.
         
         if_exists : str
             This parameter will decide what to do if table_name already
             exists. Options are 'fail', 'replace' and 'append'.
+        
+        update_columns : list
+            Columns which will be updated for rows already existing in table.
+            If None, all columns of dataframe will be updated. If empty list,
+            existing rows will be kept as it is.
+        
+        chunksize : int
+            Number of rows converted and sent to database at one time. Every
+            chunk is sent as multi-row INSERT statements no longer than
+            max_allowed_packet of server.
+        
+        parallel : int
+            Number of chunks written at same time.
 
         Returns
         -------
-        None
-            This returns nothing
+        dict
+            Dictionary with total rows, seconds and rows_per_second, and rows,
+            seconds and attempts of every chunk under chunks.
+        """
+        table_columns, chunks = self.__prepare_chunks(dataframe, if_exists, chunksize)
+        try:
+            return self.__write_chunks(chunks, self.__upsert_writer(table_columns, update_columns), parallel)
+        finally:
+            self.__table_written()
+    
+    def __upsert_writer(self, table_columns: list, update_columns: list = None):
         """
-        with self.conn.begin():
-            meta = sqlalchemy.MetaData(self.conn)
-        dataframe.to_sql(name=self.table_name, con=self.sqlalchemy_engine, if_exists=if_exists,
-                         method=self.__update_insertion_method(meta))
+        This is privet method. Created for internal used only.
+        
+        Parameters
+        ----------
+        table_columns : list
+            Columns of table in order of chunk columns.
+        
+        update_columns : list
+            Columns updated for rows already existing in table, all columns if
+            None, none if empty list.
+        
+        Returns
+        -------
+        Method
+            Method which insert or update rows of chunk on primary key of table.
+        """
+        if update_columns is None:
+            update_columns = table_columns
+        elif isinstance(update_columns, str):
+            update_columns = [update_columns]
+        data_types = self.get_data_type()
+        missing_columns = [col for col in update_columns if col not in data_types]
+        if missing_columns:
+            raise ValueError(f"Columns {','.join(map(str, missing_columns))} are not in table {self.table_name}")
+        columns = ", ".join(f"`{col}`" for col in table_columns)
+        values = ", ".join(["%s"] * len(table_columns))
+        if update_columns:
+            updates = ", ".join(f"`{col}` = VALUES(`{col}`)" for col in update_columns)
+            statement = (f"INSERT INTO `{self.table_name}` ({columns}) VALUES ({values}) "
+                         f"ON DUPLICATE KEY UPDATE {updates}")
+        else:
+            statement = f"INSERT IGNORE INTO `{self.table_name}` ({columns}) VALUES ({values})"
+        
+        def write(chunk: pandas.DataFrame) -> str:
+            self.__insert_rows(chunk, statement)
+            return "upsert"
+        
+        return write
+    
+    @instrumented("sync_table")
+    def sync_table(self, dataframe: pandas.DataFrame, key: str or list = None, delete: bool = False,
+                   chunksize: int = 100000, parallel: int = None) -> dict:
+        """
+        This method will make table same as dataframe by writing only rows
+        which are new or changed. Hash of every row is computed on server and
+        read in pages in order of key, compared with hash of same row of
+        dataframe, and only rows with different hash are written with
+        update_table.
+        
+        Note
+        ----
+            It will directly affect the source table with no way of going
+            back previous point.
+            
+            Index of dataframe is written as column, same as update_table.
+            FLOAT and DOUBLE values are compared at full precision of double,
+            changes below 1e-30 and of values above 1e35 are not seen.
+            Values whose text differs between MySQL and pandas, like JSON,
+            are always written.
+        
+        Example
+        -------
+        This will write changed rows of daily snapshot and delete rows which
+        are not in it anymore.
+        
+        ``self.sync_table(dataframe = Data, delete = True)``
+        
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            Complete data which table should have.
+        
+        key : str or list
+            Column or columns identifying row. If None, primary key of table.
+        
+        delete : bool
+            If True, rows of table whose key is not in dataframe are deleted.
+        
+        chunksize : int
+            Number of rows hashed on server in one page, written in one chunk
+            or deleted by one statement.
+        
+        parallel : int
+            Number of chunks written at same time.
+        
+        Returns
+        -------
+        dict
+            Dictionary with rows of dataframe, unchanged, written and deleted
+            rows, seconds, and report of update_table under written_report.
+        """
+        start = time.perf_counter()
+        if key is None:
+            key = self.__primary_key()
+            if not key:
+                raise ValueError(f"Table {self.table_name} has no primary key, pass key to sync_table")
+        elif isinstance(key, str):
+            key = [key]
+        frame = dataframe.reset_index()
+        data_types = self.get_data_type()
+        missing_columns = [col for col in frame.columns if col not in data_types]
+        if missing_columns:
+            raise ValueError(f"Columns {','.join(map(str, missing_columns))} are not in table {self.table_name}")
+        frame_keys = pandas.MultiIndex.from_frame(frame[key]) if len(key) > 1 else pandas.Index(frame[key[0]])
+        if not frame_keys.is_unique:
+            raise ValueError(f"Key {','.join(key)} has duplicate values in dataframe")
+        frame_hashes = self.frame_to_hashes(frame, data_types)
+        unchanged = numpy.zeros(len(frame), dtype=bool)
+        deleted_keys = []
+        for page in self.__hash_pages(key, list(frame.columns), data_types, chunksize):
+            page_keys = pandas.MultiIndex.from_frame(page[key]) if len(key) > 1 else pandas.Index(page[key[0]])
+            positions = frame_keys.get_indexer(page_keys)
+            found = positions >= 0
+            same = numpy.zeros(len(page), dtype=bool)
+            same[found] = frame_hashes[positions[found]] == page["row_hash"].to_numpy()[found]
+            unchanged[positions[same]] = True
+            if delete:
+                deleted_keys.extend(page_keys[~found])
+        changed = dataframe.iloc[numpy.flatnonzero(~unchanged)]
+        written_report = self.update_table(changed, chunksize=chunksize, parallel=parallel) if len(changed) else None
+        deleted = self.__delete_keys(key, deleted_keys, chunksize) if deleted_keys else 0
+        return {"rows": len(frame), "unchanged": int(unchanged.sum()), "written": len(changed), "deleted": deleted,
+                "seconds": time.perf_counter() - start, "written_report": written_report}
+    
+    def __hash_pages(self, key: list, columns: list, data_types: dict, page_size: int):
+        """
+        This is privet method. Created for internal used only.
+        This method reads key and MD5 of columns of every row of table, in
+        pages of page_size rows in order of key.
+        
+        Returns
+        -------
+        Iterable object
+            Iterable object which will give pandas.DataFrame with key columns
+            and row_hash.
+        """
+        select = ", ".join([f"`{col}`" for col in key] + [self.row_hash_sql(columns, data_types) + " AS `row_hash`"])
+        order_by = ", ".join(f"`{col}`" for col in key)
+        last_seen = None
+        while True:
+            query = f"SELECT {select} FROM `{self.table_name}`"
+            params = None
+            if last_seen is not None:
+                condition, params = self.__seek_condition(key, last_seen)
+                query = query + f" WHERE {condition}"
+            page = self.__read_query(query + f" ORDER BY {order_by} LIMIT {int(page_size)}", params)
+            if page.empty:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last_seen = [page[col].iloc[-1] for col in key]
+            last_seen = [value.item() if hasattr(value, "item") else value for value in last_seen]
+    
+    def __delete_keys(self, key: list, keys: list, batch_size: int) -> int:
+        """
+        This is privet method. Created for internal used only.
+        This method deletes rows with given values of key, batch_size rows
+        by one statement.
+        
+        Returns
+        -------
+        int
+            Number of rows deleted.
+        """
+        columns = ", ".join(f"`{col}`" for col in key)
+        placeholder = "%s" if len(key) == 1 else f"({', '.join(['%s'] * len(key))})"
+        deleted = 0
+        try:
+            with self.pooled_cursor() as cursor:
+                for start in range(0, len(keys), batch_size):
+                    batch = keys[start:start + batch_size]
+                    params = batch if len(key) == 1 else list(itertools.chain.from_iterable(batch))
+                    params = [value.item() if hasattr(value, "item") else value for value in params]
+                    deleted += cursor.execute(f"DELETE FROM `{self.table_name}` WHERE ({columns}) IN "
+                                              f"({', '.join([placeholder] * len(batch))})", params)
+        finally:
+            self.__table_written()
+        return deleted
     
+    @instrumented("get_data_type")
     def get_data_type(self) -> dict:
         """
         Use this method to get column name and there data type for entire table.
@@ -156,24 +737,108 @@ class MySQLTable(MySQLDataBase):
         
         ``self.get_data_type()``
         
+        Note
+        ----
+            Data types are read from metadata cache shared by all table objects
+            of database, which is loaded again after MySQLMetadataCache.ttl
+            seconds or after structure of table is changed by this library.
+        
         Returns
         -------
         dict
             Dictionary with column name as key and data type as value.
         """
-        self.my_cursor.execute(f"Show fields from {self.table_name}")
-        return {i[0]: i[1] for i in self.my_cursor}
+        return dict(self.__metadata()["columns"])
+    
+    def __metadata(self) -> dict:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        dict
+            Cached metadata of table with "columns", "nullable" and "indexes".
+        """
+        metadata = self.metadata_cache.table(self.table_name)
+        if metadata is None:
+            raise pymysql.err.ProgrammingError(1146, f"Table '{self.db_name}.{self.table_name}' doesn't exist")
+        return metadata
+    
+    def __table_written(self) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method changes version of table, so cached results of table are
+        not used anymore.
+        
+        Returns
+        -------
+        None
+            It returns nothing.
+        """
+        MySQLResultCache.table_written(self.host, self.db_name, self.table_name)
+    
+    def __table_version(self) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        This method returns version of table, made of number of writes of this
+        library to table and, depending on validate of result_cache,
+        UPDATE_TIME or CHECKSUM of table. UPDATE_TIME is read with
+        information_schema_stats_expiry set to 0 for session, so MySQL 8 does
+        not give value cached for up to a day.
+        
+        Returns
+        -------
+        tuple
+            Version of table.
+        """
+        version = MySQLResultCache.written(self.host, self.db_name, self.table_name)
+        if self.result_cache.validate is None:
+            return version,
+        with self.pooled_cursor() as cursor:
+            if self.result_cache.validate == "checksum":
+                cursor.execute(f"CHECKSUM TABLE `{self.table_name}`")
+                return version, cursor.fetchone()[1]
+            if self.__stats_expiry:
+                try:
+                    cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+                except pymysql.err.MySQLError as error:
+                    if error.args[0] != UNKNOWN_VARIABLE_ERROR:
+                        raise
+                    self.__stats_expiry = False
+            cursor.execute("SELECT UPDATE_TIME FROM information_schema.TABLES "
+                           "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (self.table_name,))
+            row = cursor.fetchone()
+            return version, row[0] if row else None
+    
+    @property
+    def metadata_cache(self) -> MySQLMetadataCache:
+        """
+        Metadata cache shared by every object using same engine.
+        """
+        return MySQLMetadataCache.for_engine(self.sqlalchemy_engine)
     
-    def remove_duplicates(self, list_of_columns: list) -> None:
+    @instrumented("remove_duplicates")
+    def remove_duplicates(self, list_of_columns: list, batch_size: int = 10000) -> int:
         """
         This method will delete duplicates rows from table based upon give list
-        of columns.
+        of columns. From every group of rows with same values in all of
+        list_of_columns, row with smallest value of integer unique key is
+        kept. Without such key, first row in order rows are stored is kept,
+        which is order of primary key, or order of insertion for InnoDB
+        table without primary key.
         
         Note
         ----
             It will directly affect the source table with no way of going
             back previous point.
             
+            Rows are deleted in place in batches of batch_size rows, so table
+            keeps its indexes, keys and auto increment. If table has no
+            integer unique key, temporary AUTO_INCREMENT column
+            databaseops_row_id is added for duration of this method. Adding
+            and dropping it rebuilds whole table twice, and table can not
+            already have AUTO_INCREMENT column in that case.
+            
         Example
         -------
         This will remove duplicate values for list_of_columns
@@ -185,26 +850,161 @@ class MySQLTable(MySQLDataBase):
         list_of_columns : list
             list of columns names which should be used for
             removing duplicate values.
+        
+        batch_size : int
+            Number of rows of table scanned by one DELETE statement.
 
         Returns
         -------
-        None
-            This returns nothing
+        int
+            Number of rows removed.
         """
+        if isinstance(list_of_columns, str):
+            list_of_columns = [list_of_columns]
         warnings.warn(f"Removing duplicate entries from columns {','.join(list_of_columns)}", stacklevel=2)
-        for col in list_of_columns:
-            self.my_cursor.execute(f"CREATE TABLE copy_of_source_{self.table_name} "
-                                   f"SELECT * FROM {self.table_name} GROUP BY({col})")
-            self.my_cursor.execute(f"DROP TABLE {self.table_name}")
-            self.my_cursor.execute(f"ALTER TABLE copy_of_source_{self.table_name} RENAME TO {self.table_name}")
+        unique_keys = self.__unique_keys()
+        if any(set(key_columns) <= set(list_of_columns) for key_columns in unique_keys.values()):
+            return 0
+        row_id = self.__row_id_column(unique_keys, list_of_columns)
+        with self.pooled_cursor() as cursor:
+            if row_id is None:
+                row_id = "databaseops_row_id"
+                cursor.execute(f"ALTER TABLE `{self.table_name}` ADD COLUMN `{row_id}` "
+                               f"BIGINT UNSIGNED NOT NULL AUTO_INCREMENT, ADD UNIQUE KEY (`{row_id}`)")
+            try:
+                return self.__delete_duplicates(cursor, list_of_columns, row_id, batch_size)
+            finally:
+                if row_id == "databaseops_row_id":
+                    cursor.execute(f"ALTER TABLE `{self.table_name}` DROP COLUMN `{row_id}`")
+                    self.metadata_cache.invalidate()
+                self.__table_written()
+    
+    def __delete_duplicates(self, cursor: pymysql.cursors.Cursor, list_of_columns: list, row_id: str,
+                            batch_size: int) -> int:
+        """
+        This is privet method. Created for internal used only.
+        This method collect groups of duplicates with smallest row_id of every
+        group into indexed temporary table, and delete other rows of those
+        groups with ``DELETE ... JOIN``, batch_size rows of row_id at a time.
+        
+        Parameters
+        ----------
+        cursor : pymysql.cursors.Cursor
+            Cursor on connection on which temporary table is created.
+        
+        list_of_columns : list
+            list of columns names which should be used for removing duplicate values.
+        
+        row_id : str
+            Integer column with unique values.
+        
+        batch_size : int
+            Number of rows of table scanned by one DELETE statement.
+        
+        Returns
+        -------
+        int
+            Number of rows removed.
+        """
+        duplicates = f"duplicates_of_source_{self.table_name}"
+        columns = ", ".join(f"`{col}`" for col in list_of_columns)
+        cursor.execute(f"CREATE TEMPORARY TABLE `{duplicates}` SELECT {columns}, MIN(`{row_id}`) AS keep_id "
+                       f"FROM `{self.table_name}` GROUP BY {columns} HAVING COUNT(*) > 1")
+        try:
+            data_types = self.get_data_type()
+            index_columns = ", ".join(f"`{col}`(255)" if "text" in data_types[col] or "blob" in data_types[col]
+                                      else f"`{col}`" for col in list_of_columns)
+            try:
+                cursor.execute(f"ALTER TABLE `{duplicates}` ADD INDEX ({index_columns})")
+            except pymysql.err.MySQLError:
+                # Index only speeds up join, key may be too long to index
+                pass
+            cursor.execute(f"SELECT MIN(keep_id) FROM `{duplicates}`")
+            last_id = cursor.fetchone()[0]
+            join = " AND ".join(f"source.`{col}` <=> duplicate.`{col}`" for col in list_of_columns)
+            removed = 0
+            while last_id is not None:
+                cursor.execute(f"SELECT `{row_id}` FROM `{self.table_name}` WHERE `{row_id}` > %s "
+                               f"ORDER BY `{row_id}` LIMIT 1 OFFSET %s", (last_id, batch_size - 1))
+                batch_end = cursor.fetchone()
+                condition = f"source.`{row_id}` > %s"
+                params = (last_id,)
+                if batch_end is not None:
+                    condition = condition + f" AND source.`{row_id}` <= %s"
+                    params = (last_id, batch_end[0])
+                removed += cursor.execute(f"DELETE source FROM `{self.table_name}` AS source "
+                                          f"JOIN `{duplicates}` AS duplicate ON {join} "
+                                          f"WHERE source.`{row_id}` > duplicate.keep_id AND {condition}", params)
+                last_id = batch_end[0] if batch_end is not None else None
+            return removed
+        finally:
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS `{duplicates}`")
+    
+    def __unique_keys(self) -> dict:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        dict
+            Dictionary with name of primary or unique key as key and list of its
+            columns in index order as value. Unique keys on nullable columns are
+            not included, as they allow duplicate NULL values.
+        """
+        metadata = self.__metadata()
+        return {key: index["columns"] for key, index in metadata["indexes"].items()
+                if index["unique"] and not set(index["columns"]) & metadata["nullable"]}
+    
+    def __row_id_column(self, unique_keys: dict, excluded_columns: list) -> str or None:
+        """
+        This is privet method. Created for internal used only.
+        
+        Parameters
+        ----------
+        unique_keys : dict
+            Dictionary with key name as key and list of key columns as value.
+        
+        excluded_columns : list
+            Columns which can not be used.
+        
+        Returns
+        -------
+        str or None
+            Integer column which alone is primary or unique key of table, None
+            if table has no such column.
+        """
+        data_types = self.get_data_type()
+        for key_columns in unique_keys.values():
+            col = key_columns[0]
+            if len(key_columns) == 1 and col not in excluded_columns and \
+                    self.type_name(data_types[col]) in self.integer_type_names:
+                return col
+        return None
     
-    def set_primary_key(self, column_name: str or list, remove_duplicates=True) -> None:
+    @instrumented("set_primary_key")
+    def set_primary_key(self, column_name: str or list, remove_duplicates=True, online: bool = False,
+                        batch_size: int = 10000, throttle: float = 0.0, progress=None) -> None:
         """
         This method will set column_name as primary key for table.
         
         Note
         ----
             By default it remove duplicate value for column_name.
+            
+            With online=True, key is added with ALGORITHM=INPLACE, LOCK=NONE so
+            table can be read and written meanwhile. If server can not do that,
+            table is copied to shadow table with key in batches and shadow table
+            replaces table with atomic RENAME. Triggers keep shadow table in sync
+            with writes made during copy.
+            
+            With online=True and remove_duplicates, duplicates are not deleted
+            from table, which would need blocking ALTER TABLE when table has no
+            integer unique key. Table is copied to shadow table instead,
+            skipping every row whose key is same as key of row with smaller
+            value of integer unique key, so same rows are kept as by
+            remove_duplicates. Row written during copy replaces row with same
+            key in shadow table. Table with duplicates and no integer unique
+            key raises ValueError.
         
         Example
         -------
@@ -216,6 +1016,10 @@ class MySQLTable(MySQLDataBase):
         
         ``self.set_primary_key(column_name = ["column_1", "column_2"])``
         
+        This will create primary key without blocking table, printing progress.
+        
+        ``self.set_primary_key(column_name = "column_1", online = True, progress = print)``
+        
         Parameters
         ----------
         column_name : str or list
@@ -227,8 +1031,21 @@ class MySQLTable(MySQLDataBase):
             columns or not. Pass this as False if you don't to remove duplicate on given
             columns, But it will raise exception and primary key will not be set. As
             primary key need to have unique values.
-
-        Returns
+        
+        online : bool
+            If True, table is not locked while primary key is added.
+        
+        batch_size : int
+            Number of rows copied at a time, if table is copied to shadow table.
+        
+        throttle : float
+            Seconds to wait after every batch copied to shadow table.
+        
+        progress : Method
+            Method which will be called after every batch copied to shadow
+            table, with dictionary of copied rows, total rows, seconds and eta.
+
+        Returns
         -------
         None
             This returns nothing
@@ -236,23 +1053,25 @@ class MySQLTable(MySQLDataBase):
         if isinstance(column_name, str):
             column_name = [column_name]
         self.primary_key_columns = ','.join(column_name)
-        if remove_duplicates:
-            self.remove_duplicates(column_name)
-        database_dtype = self.get_data_type()
-        columns = [f'{i}(255)' if 'text' in database_dtype[i] else i for i in column_name]
-        try:
-            self.my_cursor.execute(f"ALTER TABLE {self.table_name} ADD PRIMARY KEY ({','.join(columns)})")
-        except pymysql.err.IntegrityError:
-            raise UserWarning(f"Duplicate entries in column {','.join(columns)}, "
-                              f"remove_duplicates attribute should be true in case of duplicates")
+        self.__add_key("PRIMARY KEY", column_name, remove_duplicates, online, batch_size, throttle, progress)
     
-    def set_unique_keys(self, column_name: str or list, remove_duplicates=True) -> None:
+    @instrumented("set_unique_keys")
+    def set_unique_keys(self, column_name: str or list, remove_duplicates=True, online: bool = False,
+                        batch_size: int = 10000, throttle: float = 0.0, progress=None) -> None:
         """
         This method will set columns to contain only unique values.
         
         Note
         ----
             This method will directly affect source table.
+            
+            With online=True, key is added with ALGORITHM=INPLACE, LOCK=NONE so
+            table can be read and written meanwhile. If server can not do that,
+            table is copied to shadow table with key in batches and shadow table
+            replaces table with atomic RENAME.
+            
+            With online=True and remove_duplicates, duplicates are skipped
+            while table is copied to shadow table, same as set_primary_key.
         
         Example
         -------
@@ -273,6 +1092,19 @@ class MySQLTable(MySQLDataBase):
             Either you want delete duplicate value for given
             columns or not. Pass this as False, if you don't to remove duplicate on given
             columns, But it will raise exception.
+        
+        online : bool
+            If True, table is not locked while unique key is added.
+        
+        batch_size : int
+            Number of rows copied at a time, if table is copied to shadow table.
+        
+        throttle : float
+            Seconds to wait after every batch copied to shadow table.
+        
+        progress : Method
+            Method which will be called after every batch copied to shadow
+            table, with dictionary of copied rows, total rows, seconds and eta.
 
         Returns
         -------
@@ -282,55 +1114,323 @@ class MySQLTable(MySQLDataBase):
         if isinstance(column_name, str):
             column_name = [column_name]
         self.unique_column = ','.join(column_name)
-        if remove_duplicates:
+        self.__add_key("UNIQUE", column_name, remove_duplicates, online, batch_size, throttle, progress)
+    
+    def __add_key(self, key_type: str, column_name: list, remove_duplicates: bool, online: bool,
+                  batch_size: int, throttle: float, progress) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method add primary or unique key on column_name to table.
+        
+        Parameters
+        ----------
+        key_type : str
+            "PRIMARY KEY" or "UNIQUE".
+        
+        Other parameters are same as of set_primary_key.
+        
+        Returns
+        -------
+        None
+            This returns nothing
+        """
+        if remove_duplicates and not online:
             self.remove_duplicates(column_name)
         database_dtype = self.get_data_type()
-        columns = [f'{i}(255)' if 'text' in database_dtype[i] else i for i in column_name]
+        columns = [f'`{i}`(255)' if 'text' in database_dtype[i] else f'`{i}`' for i in column_name]
+        add_key = f"ADD {key_type} ({','.join(columns)})"
         try:
-            self.my_cursor.execute(f"ALTER TABLE {self.table_name} ADD unique ({','.join(columns)})")
+            with self.pooled_cursor() as cursor:
+                if not online:
+                    cursor.execute(f"ALTER TABLE `{self.table_name}` {add_key}")
+                    return
+                unique_keys = self.__unique_keys()
+                duplicates = False
+                if not any(set(key_columns) <= set(column_name) for key_columns in unique_keys.values()):
+                    group_by = ", ".join(f"`{col}`" for col in column_name)
+                    cursor.execute(f"SELECT 1 FROM `{self.table_name}` GROUP BY {group_by} HAVING COUNT(*) > 1 LIMIT 1")
+                    duplicates = cursor.fetchone() is not None
+                if duplicates and not remove_duplicates:
+                    raise pymysql.err.IntegrityError(1062, "Duplicate entry")
+                if duplicates:
+                    if self.__row_id_column(unique_keys, []) is None:
+                        raise ValueError(f"Table {self.table_name} has duplicates in columns {','.join(column_name)} "
+                                         f"and no integer unique key, duplicates can not be removed online")
+                    warnings.warn(f"Removing duplicate entries from columns {','.join(column_name)}", stacklevel=4)
+                else:
+                    cursor.execute("SELECT VERSION()")
+                    version = tuple(int(part) for part in re.findall(r"\d+", cursor.fetchone()[0])[:2])
+                    if version >= ONLINE_ALTER_MIN_VERSION:
+                        try:
+                            cursor.execute(f"ALTER TABLE `{self.table_name}` {add_key}, ALGORITHM=INPLACE, LOCK=NONE")
+                            return
+                        except pymysql.err.MySQLError as error:
+                            if error.args[0] not in ONLINE_ALTER_UNSUPPORTED_ERRORS:
+                                raise
+            self.__shadow_copy([add_key], column_name, batch_size, throttle, progress, duplicates)
         except pymysql.err.IntegrityError:
-            raise UserWarning(f"Duplicate entries in column {','.join(columns)},"
-                              f" remove_duplicates attribute should be true in case of duplicates")
+            raise UserWarning(f"Duplicate entries in column {','.join(columns)}, "
+                              f"remove_duplicates attribute should be true in case of duplicates")
+        finally:
+            self.metadata_cache.invalidate()
+            self.__table_written()
+    
+    def __shadow_copy(self, alterations: list, key: list, batch_size: int, throttle: float, progress,
+                      skip_duplicates: bool = False) -> None:
+        """
+        This is privet method. Created for internal used only.
+        This method create shadow table like table with alterations, copy rows
+        into it in batches and replace table with it by atomic RENAME. Triggers
+        on table apply writes made during copy to shadow table, and rows
+        already copied by triggers are skipped by batches. Rows are copied with
+        plain INSERT, so NULL in NOT NULL column or duplicate key raise error,
+        and number of rows of both tables is compared before RENAME.
+        
+        Parameters
+        ----------
+        alterations : list
+            ALTER TABLE clauses applied to empty shadow table.
+        
+        key : list
+            Columns with unique values in shadow table, used to find rows when
+            table has no primary key or integer unique key. They must not
+            contain NULL.
+        
+        batch_size : int
+            Number of rows copied by one statement.
+        
+        throttle : float
+            Seconds to wait after every batch.
+        
+        progress : Method
+            Method which will be called after every batch with dictionary of
+            copied rows, total rows, seconds and eta.
+        
+        skip_duplicates : bool
+            If True, row is not copied when row with same values of key and
+            smaller value of integer unique key of table is in table, or row
+            with same values of key is already in shadow table. Table must
+            have integer unique key.
+        
+        Returns
+        -------
+        None
+            This returns nothing
+        """
+        # Suffix keeps names apart from existing tables and triggers, names are limited to 64 characters
+        prefix = f"{self.table_name[:40]}_{uuid.uuid4().hex[:8]}"
+        shadow, old = f"_{prefix}_new", f"_{prefix}_old"
+        table_columns = list(self.get_data_type())
+        columns = ", ".join(f"`{col}`" for col in table_columns)
+        new_values = ", ".join(f"NEW.`{col}`" for col in table_columns)
+        unique_keys = self.__unique_keys()
+        row_id = self.__row_id_column(unique_keys, [])
+        order = [row_id] if row_id else unique_keys.get("PRIMARY", key)
+        order_by = ", ".join(f"`{col}`" for col in order)
+        old_key = " AND ".join(f"`{col}` <=> OLD.`{col}`" for col in order)
+        copied_key = " AND ".join(f"s.`{col}` = t.`{col}`" for col in order)
+        # Conditions of rows kept from table and of rows copied to shadow table when duplicates are skipped
+        kept = copy_kept = ""
+        if skip_duplicates:
+            same_key = " AND ".join(f"d.`{col}` <=> t.`{col}`" for col in key)
+            kept = f" AND NOT EXISTS (SELECT 1 FROM `{self.table_name}` AS d WHERE {same_key} " \
+                   f"AND d.`{row_id}` < t.`{row_id}`)"
+            copy_kept = kept + f" AND NOT EXISTS (SELECT 1 FROM `{shadow}` AS d WHERE {same_key})"
+        triggers = {
+            f"{prefix}_ins": f"AFTER INSERT ON `{self.table_name}` FOR EACH ROW "
+                             f"REPLACE INTO `{shadow}` ({columns}) VALUES ({new_values})",
+            f"{prefix}_upd": f"AFTER UPDATE ON `{self.table_name}` FOR EACH ROW BEGIN "
+                             f"DELETE FROM `{shadow}` WHERE {old_key}; "
+                             f"REPLACE INTO `{shadow}` ({columns}) VALUES ({new_values}); END",
+            f"{prefix}_del": f"AFTER DELETE ON `{self.table_name}` FOR EACH ROW "
+                             f"DELETE FROM `{shadow}` WHERE {old_key}",
+        }
+        with self.pooled_cursor() as cursor:
+            nullable = [col for col in order if col in self.__metadata()["nullable"]]
+            if nullable:
+                is_null = " OR ".join(f"`{col}` IS NULL" for col in nullable)
+                cursor.execute(f"SELECT 1 FROM `{self.table_name}` WHERE {is_null} LIMIT 1")
+                if cursor.fetchone():
+                    raise ValueError(f"Columns {','.join(nullable)} contain NULL, table can not be copied online "
+                                     f"without primary key or integer unique key")
+            cursor.execute("SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() "
+                           "AND TABLE_NAME = %s", (self.table_name,))
+            total = (cursor.fetchone() or [0])[0] or 0
+            cursor.execute(f"CREATE TABLE `{shadow}` LIKE `{self.table_name}`")
+            try:
+                for alteration in alterations:
+                    cursor.execute(f"ALTER TABLE `{shadow}` {alteration}")
+                for name, definition in triggers.items():
+                    cursor.execute(f"CREATE TRIGGER `{name}` {definition}")
+                start, copied, last_seen = time.perf_counter(), 0, None
+                while True:
+                    condition, params = self.__seek_condition(order, last_seen) if last_seen else ("1 = 1", ())
+                    cursor.execute(f"SELECT {order_by} FROM `{self.table_name}` WHERE {condition} "
+                                   f"ORDER BY {order_by} LIMIT 1 OFFSET %s", params + (batch_size - 1,))
+                    batch_end = cursor.fetchone()
+                    if batch_end is not None:
+                        end_condition, end_params = self.__seek_condition(order, list(batch_end))
+                        condition, params = f"({condition}) AND NOT ({end_condition})", params + end_params
+                    copied += cursor.execute(f"INSERT INTO `{shadow}` ({columns}) SELECT {columns} "
+                                             f"FROM `{self.table_name}` AS t WHERE ({condition}) AND NOT EXISTS "
+                                             f"(SELECT 1 FROM `{shadow}` AS s WHERE {copied_key})"
+                                             f"{copy_kept}", params)
+                    if progress is not None:
+                        seconds = time.perf_counter() - start
+                        eta = seconds / copied * max(total - copied, 0) if copied else None
+                        progress({"copied": copied, "total": max(total, copied), "seconds": seconds, "eta": eta})
+                    if batch_end is None:
+                        break
+                    last_seen = list(batch_end)
+                    if throttle:
+                        time.sleep(throttle)
+                cursor.execute(f"SELECT (SELECT COUNT(*) FROM `{self.table_name}` AS t WHERE TRUE{kept}), "
+                               f"(SELECT COUNT(*) FROM `{shadow}`)")
+                table_rows, shadow_rows = cursor.fetchone()
+                if table_rows != shadow_rows:
+                    raise ValueError(f"Shadow table has {shadow_rows} rows instead of {table_rows}, "
+                                     f"table is left unchanged")
+                cursor.execute(f"RENAME TABLE `{self.table_name}` TO `{old}`, `{shadow}` TO `{self.table_name}`")
+                self.metadata_cache.invalidate()
+            except BaseException:
+                for name in triggers:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS `{name}`")
+                cursor.execute(f"DROP TABLE IF EXISTS `{shadow}`")
+                raise
+            cursor.execute(f"DROP TABLE `{old}`")
     
-    def sort_table(self, column: str or dict, order="ascending") -> None:
+    @instrumented("sort_table")
+    def sort_table(self, column: str or dict or list, order="ascending", batch_size: int = 10000,
+                   throttle: float = 0.0, progress=None) -> None:
         """
         This method will perform sort operation on source database table.
+        Table is rebuilt clustered on column, so rows are stored in pages in
+        that order and range reads on column read contiguous pages.
         
         Note
         ----
             This method will directly affect source table.
-        
+            
+            InnoDB stores rows in order of primary key. If table has primary
+            key, it is replaced with primary key of column followed by old
+            primary key columns, and old primary key is kept as unique key
+            old_primary_key, which is used again when table is sorted again.
+            Table is copied in batches to shadow table which replaces table by
+            atomic RENAME, same as set_primary_key with online=True. Columns
+            allowing NULL can not be used.
+            
+            If table has no primary key, table is rebuilt with
+            ALTER TABLE ... ORDER BY, which locks table while it is copied.
+            InnoDB ignores ORDER BY, with warning 1105, when it clusters table
+            on UNIQUE key of NOT NULL columns. Then warning is given and table
+            is copied to shadow table with primary key of column followed by
+            columns of that unique key, same as table with primary key.
         
         Example
         -------
         ``self.sort_table(column = "column_1", order="descending")``
         
+        ``self.sort_table(column = {"column_1": "ascending", "column_2": "descending"})``
+        
         Parameters
         ----------
-        column : str or dict
-            Columns will used for sorting operation.
+        column : str or dict or list
+            Columns will used for sorting operation. If dict, column name as
+            key and order as value.
         
         order : str
             Order of sorting, Which can "ascending" or "descending"
+        
+        batch_size : int
+            Number of rows copied at a time to shadow table.
+        
+        throttle : float
+            Seconds to wait after every batch copied to shadow table.
+        
+        progress : Method
+            Method which will be called after every batch copied to shadow
+            table, with dictionary of copied rows, total rows, seconds and eta.
 
         Returns
         -------
         None
             This returns nothing
         """
+        order_by, columns = self.__order_clause(column, order)
+        primary_key = self.__primary_key()
+        drop_primary_key = "DROP PRIMARY KEY, " if primary_key else ""
+        try:
+            if not primary_key:
+                with self.pooled_cursor() as cursor:
+                    cursor.execute(f"ALTER TABLE `{self.table_name}` ORDER BY {order_by}")
+                    cursor.execute("SHOW WARNINGS")
+                    ignored = any(warning[1] == ORDER_BY_IGNORED_WARNING for warning in cursor.fetchall())
+                if not ignored:
+                    return
+                metadata = self.__metadata()
+                primary_key = next((index["columns"] for index in metadata["indexes"].values()
+                                    if index["unique"] and not set(index["columns"]) & metadata["nullable"]), None)
+                if primary_key is None:
+                    raise ValueError(f"ALTER TABLE ... ORDER BY was ignored by server for table {self.table_name}")
+                warnings.warn(f"ALTER TABLE ... ORDER BY is ignored as table is clustered on unique key "
+                              f"{','.join(primary_key)}, table is rebuilt with primary key instead", stacklevel=3)
+            metadata = self.__metadata()
+            nullable = [col for col in columns if col in metadata["nullable"]]
+            if nullable:
+                raise ValueError(f"Columns {','.join(nullable)} allow NULL and can not be used in clustered key")
+            old_primary_key = metadata["indexes"].get("old_primary_key", {}).get("columns")
+            key = columns + [col for col in old_primary_key or primary_key if col not in columns]
+            if key == primary_key and " DESC" not in order_by:
+                return
+            database_dtype = self.get_data_type()
+            parts = [part.replace(f"`{col}`", f"`{col}`(255)") if "text" in database_dtype[col] else part
+                     for col, part in zip(columns, order_by.split(", "))]
+            parts += [f"`{col}`(255)" if "text" in database_dtype[col] else f"`{col}`" for col in key[len(columns):]]
+            alteration = f"{drop_primary_key}ADD PRIMARY KEY ({', '.join(parts)})"
+            if not old_primary_key:
+                old_key = ", ".join(f"`{col}`(255)" if "text" in database_dtype[col] else f"`{col}`"
+                                    for col in primary_key)
+                alteration = alteration + f", ADD UNIQUE KEY `old_primary_key` ({old_key})"
+            self.__shadow_copy([alteration], key, batch_size, throttle, progress)
+            self.primary_key_columns = ",".join(key)
+        finally:
+            self.metadata_cache.invalidate()
+            self.__table_written()
+    
+    @staticmethod
+    def __order_clause(column: str or dict or list, order: str = "ascending") -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        
+        Parameters
+        ----------
+        column : str or dict or list
+            Column, list of columns sorted in order, or dictionary with column
+            name as key and order as value.
+        
+        order : str
+            "ascending" or "descending", used for columns without order.
+        
+        Returns
+        -------
+        tuple
+            ORDER BY clause without ORDER BY and list of columns.
+        """
+        directions = {"ascending": "", "asc": "", "descending": " DESC", "desc": " DESC"}
         if isinstance(column, str):
-            query = f"SELECT * FROM {self.table_name} ORDER BY {column} {order}"
-        elif isinstance(column, dict):
-            query = f"SELECT * FROM {self.table_name} ORDER BY "
-            col_and_order = [[col, c_ord] for col, c_ord in column.items()]
-            col_and_order_str = " ,"
-            for i in col_and_order:
-                col_and_order_str = col_and_order_str.join(i)
-            query = query + col_and_order_str
-        self.my_cursor.execute(query=query)
-    
-    def table_filter(self, where: list, select: str or list = None,
-                     limit: int = None, chunksize: int = None) -> pandas.DataFrame:
+            column = {column: order}
+        elif not isinstance(column, dict):
+            column = {col: order for col in column}
+        invalid = [col_order for col_order in column.values() if str(col_order).lower() not in directions]
+        if invalid:
+            raise ValueError(f"order should be 'ascending' or 'descending', got {invalid[0]}")
+        order_by = ", ".join(f"`{col}`{directions[col_order.lower()]}" for col, col_order in column.items())
+        return order_by, list(column)
+    
+    @instrumented("table_filter")
+    def table_filter(self, where: Condition or list, select: str or list = None, limit: int = None,
+                     chunksize: int = None, format: str = "pandas", downcast: bool = False,
+                     explain: bool = False) -> pandas.DataFrame:
         """
         If you want read filtered table use this method.
         
@@ -346,10 +1446,16 @@ class MySQLTable(MySQLDataBase):
                     
         ``self.table_filter(where = ["column_Name = Value or  column_Name > Value"], chunksize = 100)``
         
+        This will filter with values bound as parameters, and warn if filter
+        reads whole table.
+        
+        ``self.table_filter(where = (Column("age") >= 18) & Column("city").isin(["Pune", "Mumbai"]), explain = True)``
+        
         Parameters
         ----------
-        where : list
-            list of conditions in string format.
+        where : Condition or list
+            Condition built from Column, or list of Condition and conditions
+            in string format. All conditions of list are joined with AND.
         
         select : str
             Will only return data for these columns. If None, will
@@ -360,11 +1466,26 @@ class MySQLTable(MySQLDataBase):
         
         chunksize : int
             Number of rows in one iteration.
+        
+        format : str
+            "pandas" for pandas.DataFrame, "arrow" for pyarrow.Table built
+            column by column from rows, with types from get_data_type.
+        
+        downcast : bool
+            If True, pandas.DataFrame columns get narrowest pandas data type
+            matching MySQL data type, like Int8 for TINYINT and category for ENUM.
+        
+        explain : bool
+            If True, query is checked with EXPLAIN before it is run, and
+            warning is given if it reads whole table instead of using key.
 
         Returns
         -------
         pandas.DataFrame or Object
-            pandas.DataFrame if chunksize is None else iterable object.
+            pandas.DataFrame or pyarrow.Table if chunksize is None else iterable
+            object of pandas.DataFrame or pyarrow.RecordBatch, which streams rows
+            from server with server side cursor. Results without chunksize are
+            taken from result_cache if it is given.
         """
         if select:
             if isinstance(select, list):
@@ -373,31 +1494,1374 @@ class MySQLTable(MySQLDataBase):
                 query = "SELECT " + select
         else:
             query = "SELECT *"
-        query = query + f" FROM {self.table_name}" + " where " + " ,".join(where)
+        query = query + f" FROM `{self.table_name}`"
+        where, params, columns = Condition.compile(where)
+        if params is not None:
+            query = query.replace("%", "%%")
+        query = query + " WHERE " + where
         if limit:
-            query = query + f" LIMIT {limit}"
-        return pandas.read_sql_query(sql=query, con=self.sqlalchemy_engine, chunksize=chunksize)
+            query = query + f" LIMIT {int(limit)}"
+        if explain:
+            self.__explain(query, params, columns)
+        if chunksize:
+            return self.__read_query(query, params, chunksize=chunksize, format=format, downcast=downcast)
+        return self.__cached_query(query, params, format, downcast)
+    
+    @instrumented("aggregate")
+    def aggregate(self, group_by: str or list = None, metrics: dict = None, where: Condition or list = None,
+                  sample: float = None, format: str = "pandas") -> pandas.DataFrame:
+        """
+        This method will aggregate table on server and return only aggregated
+        rows, instead of reading whole table for pandas.DataFrame.groupby.
+        
+        Note
+        ----
+            With sample, aggregates are computed from sample of rows. If table
+            has integer primary or unique key, sample is read as random ranges
+            of key, so only sampled rows are read, else rows are picked with
+            RAND() which still reads every row on server. sum and count are
+            scaled up by sampled fraction, other aggregates are of sample as
+            it is.
+        
+        Example
+        -------
+        This will return sum of amount and number of orders for every city.
+        
+        ``self.aggregate(group_by = "city", metrics = {"amount": ["sum", "avg"], "order_id": "count"})``
+        
+        This will estimate total amount from 1% of rows.
+        
+        ``self.aggregate(metrics = {"amount": "sum"}, sample = 0.01)``
+        
+        Parameters
+        ----------
+        group_by : str or list
+            Column names on which rows are grouped. If None, whole table is
+            aggregated to one row.
+        
+        metrics : dict
+            Dictionary with column name as key and aggregate, or list of
+            aggregates, as value. Aggregates are "count", "count_distinct",
+            "sum", "avg", "min", "max", "std" and "var". Column "*" can be used
+            with "count". Result column is named column_aggregate. If None,
+            only number of rows is returned as column count.
+        
+        where : Condition or list
+            Filter applied before aggregation, same as where of table_filter.
+        
+        sample : float
+            Fraction of rows, between 0 and 1, used for approximate result.
+        
+        format : str
+            "pandas" for pandas.DataFrame, "arrow" for pyarrow.Table.
+        
+        Returns
+        -------
+        pandas.DataFrame or pyarrow.Table
+            One row for every group, with group_by columns and metrics.
+        """
+        functions = {"count": "COUNT({})", "count_distinct": "COUNT(DISTINCT {})", "sum": "SUM({})", "avg": "AVG({})",
+                     "mean": "AVG({})", "min": "MIN({})", "max": "MAX({})", "std": "STDDEV_SAMP({})",
+                     "var": "VAR_SAMP({})"}
+        if isinstance(group_by, str):
+            group_by = [group_by]
+        group_by = group_by or []
+        metrics = {col: [aggregates] if isinstance(aggregates, str) else list(aggregates)
+                   for col, aggregates in (metrics or {"*": "count"}).items()}
+        for col, aggregates in metrics.items():
+            for aggregate in aggregates:
+                if aggregate not in functions:
+                    raise ValueError(f"Aggregate should be one of {', '.join(functions)}, got {aggregate}")
+                if col == "*" and aggregate != "count":
+                    raise ValueError(f"Column * can be used only with count, got {aggregate}")
+        conditions = [] if where is None else [where] if isinstance(where, (Condition, str)) else list(where)
+        fraction = None
+        if sample is not None:
+            if not 0 < sample <= 1:
+                raise ValueError(f"sample should be between 0 and 1, got {sample}")
+            sampled, fraction = self.__sample_condition(sample)
+            conditions.append(sampled)
+        select, params = [f"`{col}`" for col in group_by], []
+        for col, aggregates in metrics.items():
+            for aggregate in aggregates:
+                expression = functions[aggregate].format("*" if col == "*" else f"`{col}`")
+                if fraction is not None and aggregate in ("count", "sum"):
+                    expression, params = expression + " / %s", params + [fraction]
+                name = "count" if col == "*" else f"{col}_{aggregate}"
+                select.append(f"{expression} AS `{name}`")
+        query = f"SELECT {', '.join(select)} FROM `{self.table_name}`"
+        where, where_params, columns = Condition.compile(conditions)
+        if where:
+            query = query + " WHERE " + where
+        if group_by:
+            query = query + f" GROUP BY {', '.join(select[:len(group_by)])}"
+        params = tuple(params) + (where_params or ()) or None
+        if fraction is not None:
+            return self.__read_query(query, params, format=format)
+        return self.__cached_query(query, params, format)
+    
+    def __sample_condition(self, sample: float) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        This method builds condition which picks about sample fraction of rows.
+        With integer key, rows are picked as up to SAMPLE_RANGES random ranges
+        of key, together as wide as sample fraction of key span, so server
+        reads only picked rows.
+        
+        Parameters
+        ----------
+        sample : float
+            Fraction of rows.
+        
+        Returns
+        -------
+        tuple
+            Condition and fraction of rows it is expected to pick.
+        """
+        key = self.__row_id_column(self.__unique_keys(), [])
+        if key is not None:
+            with self.pooled_cursor() as cursor:
+                cursor.execute(f"SELECT MIN(`{key}`), MAX(`{key}`) FROM `{self.table_name}`")
+                low, high = cursor.fetchone()
+            if low is not None and sample < 1:
+                span = high - low + 1
+                target = max(int(span * sample), 1)
+                ranges = min(SAMPLE_RANGES, target)
+                width = target // ranges
+                starts = sorted(random.sample(range(low, high + 1, width), ranges))
+                condition = Condition(" OR ".join([f"`{key}` BETWEEN %s AND %s"] * len(starts)),
+                                      itertools.chain.from_iterable((start, start + width - 1) for start in starts),
+                                      (key,))
+                return condition, min(len(starts) * width / span, 1.0)
+        return Condition("RAND() < %s", (sample,)), sample
+    
+    def __cached_query(self, query: str, params: tuple, format: str = "pandas", downcast: bool = False):
+        """
+        This is privet method. Created for internal used only.
+        This method runs query, taking result from result_cache if it is given
+        and result was cached for current version of table.
+        
+        Returns
+        -------
+        pandas.DataFrame or pyarrow.Table
+            Result of query.
+        """
+        if self.result_cache is None:
+            return self.__read_query(query, params, format=format, downcast=downcast)
+        key = (self.host, self.db_name, query, repr(params), format, downcast)
+        version = self.__table_version()
+        result = self.result_cache.get(key, version)
+        if result is None:
+            result = self.__read_query(query, params, format=format, downcast=downcast)
+            self.result_cache.put(key, version, result)
+        return result
     
-    def read_table(self, chunksize: int = None):
+    def __explain(self, query: str, params: tuple, columns: tuple) -> list:
+        """
+        This is privet method. Created for internal used only.
+        This method runs EXPLAIN for query and warns if table is read without
+        key, naming keys of table and whether filtered columns lead any of them.
+        
+        Parameters
+        ----------
+        query : str
+            SELECT query, with %s placeholders.
+        
+        params : tuple
+            Parameters which will be bound to query.
+        
+        columns : tuple
+            Column names used by Condition objects of filter.
+        
+        Returns
+        -------
+        list
+            Rows of EXPLAIN as dictionaries.
+        """
+        with self.pooled_cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute("EXPLAIN " + query, params)
+            plan = cursor.fetchall()
+        if any(row["type"] == "ALL" for row in plan):
+            keys = {name: index["columns"] for name, index in self.__metadata()["indexes"].items()}
+            leading = [col for col in columns if any(key_columns[0] == col for key_columns in keys.values())]
+            described = ", ".join(f"{name}({','.join(key_columns)})" for name, key_columns in keys.items())
+            if leading:
+                advice = (f"Columns {','.join(leading)} lead a key, but key is not used, check OR, functions or "
+                          f"type of values compared with them")
+            else:
+                advice = "No filtered column leads a key, add one with set_primary_key or set_unique_keys"
+            warnings.warn(f"Filter reads whole table {self.table_name}, keys of table are {described or 'none'}. "
+                          f"{advice}", stacklevel=3)
+        return plan
+    
+    @instrumented("read_query")
+    def read_query(self, query: str, params: tuple = None, chunksize: int = None, format: str = "pandas",
+                   data_types: dict = None):
+        """
+        This method will run SELECT query on pooled connection and read its
+        result same as read_table, streaming rows with server side cursor if
+        chunksize is given.
+        
+        Example
+        -------
+        ``self.read_query(query = "SELECT * FROM orders WHERE city = %s", params = ("Pune",), chunksize = 100)``
+        
+        Parameters
+        ----------
+        query : str
+            SELECT query, with %s placeholders if params are given.
+        
+        params : tuple
+            Parameters which will be bound to query.
+        
+        chunksize : int
+            Number of rows in one iteration.
+        
+        format : str
+            "pandas" for pandas.DataFrame, "arrow" for pyarrow.Table.
+        
+        data_types : dict
+            MySQL data types of result columns for arrow format, if None
+            get_data_type of table is used.
+        
+        Returns
+        -------
+        pandas.DataFrame or Object
+            pandas.DataFrame or pyarrow.Table if chunksize is None else iterable
+            object of pandas.DataFrame or pyarrow.RecordBatch.
+        """
+        return self.__read_query(query, params, chunksize=chunksize, format=format, data_types=data_types)
+    
+    @instrumented("read_table")
+    def read_table(self, chunksize: int = None, parallel: int = None, partition_column: str = None,
+                   format: str = "pandas", downcast: bool = False, order_by: str or list or dict = None,
+                   snapshot: bool = False, max_age: float = 0, parallel_mode: str = "thread"):
         """
         This method will read table as pandas.DataFrame if chunksize is not given else
         it will return object which can be iterated in for loop every loop will
         given pandas.DataFrame of chunksize.
         
+        Note
+        ----
+            With chunksize rows are streamed from server with server side
+            cursor, so only one chunk is kept in memory at a time. Pooled
+            connection is held until iteration is finished.
+            
+            With parallel, table is split into parallel ranges of
+            partition_column between its MIN and MAX value, and every range is
+            read on its own pooled connection in thread pool. Connection pool
+            should allow parallel connections. Threads overlap waiting for
+            server, but decoding rows by PyMySQL and building pandas.DataFrame
+            hold GIL, so with thread pool reading is limited to about one core
+            of Python work, whatever parallel is. With parallel_mode="process"
+            ranges are read in worker processes, every worker with its own
+            engine from MySQLEnginePool, and partitions are pickled back,
+            which costs copy of every partition.
+            
+            With order_by, rows are read in order of index whose leading columns
+            are order_by columns. If there is no such index, server sorts whole
+            table before first row is given and warning is given.
+            
+            With snapshot, only changes since last refresh are read from server,
+            see refresh_snapshot. With format="arrow", pyarrow.Table is memory
+            mapped from snapshot file without copying it. With max_age,
+            snapshot refreshed less than max_age seconds ago is read without
+            asking server at all.
+        
         Example
         -------
         This will return object filtered on where argument and chunksize of 100
         
         ``self.read_table(where = ["column_Name = value"], select = None, limit = None, chunksize = 100)``
         
+        This will read table in 8 partitions of primary key at same time.
+        
+        ``self.read_table(parallel = 8)``
+        
+        This will read table in 8 partitions in 8 worker processes.
+        
+        ``self.read_table(parallel = 8, parallel_mode = "process")``
+        
+        This will stream table in order of column_1, 10000 rows at a time.
+        
+        ``self.read_table(chunksize = 10000, order_by = "column_1")``
+        
+        This will refresh local snapshot of table and read it.
+        
+        ``self.read_table(snapshot = True, format = "arrow")``
+        
+        This will read snapshot without refreshing it if it was refreshed in
+        last minute.
+        
+        ``self.read_table(snapshot = True, max_age = 60)``
+        
         Parameters
         ----------
         chunksize : int
             number of row you want read at one time.
+        
+        parallel : int
+            Number of partitions read at same time. If None, table is read
+            over single connection.
+        
+        partition_column : str
+            Numeric column used for partitioning table. If None, first column
+            of primary key is used.
+        
+        format : str
+            "pandas" for pandas.DataFrame, "arrow" for pyarrow.Table built
+            column by column from rows, with types from get_data_type.
+        
+        downcast : bool
+            If True, pandas.DataFrame columns get narrowest pandas data type
+            matching MySQL data type, like Int8 for TINYINT and category for ENUM.
+        
+        order_by : str or list or dict
+            Column, list of columns, or dictionary with column name as key and
+            "ascending" or "descending" as value, in which order rows are read.
+            Can not be used with parallel.
+        
+        snapshot : bool
+            If True, table is read from snapshot in snapshot_store, after it is
+            refreshed. Can not be used with parallel or order_by.
+        
+        max_age : float
+            With snapshot, seconds after last refresh during which snapshot
+            is read without refreshing it. 0 refreshes on every read, None
+            refreshes only when there is no snapshot yet.
+        
+        parallel_mode : str
+            With parallel, "thread" to read partitions in thread pool or
+            "process" to read them in process pool, for tables where building
+            result takes more time than server.
 
         Returns
         -------
         pandas.DataFrame or Iterable object
-            pandas.DataFrame or Iterable object which will give pandas.DataFrame
+            pandas.DataFrame or Iterable object which will give pandas.DataFrame.
+            With format="arrow", pyarrow.Table or Iterable object which will give
+            pyarrow.RecordBatch.
+            With parallel and chunksize, pandas.DataFrame are given from
+            partitions in order of partition_column ranges.
+        """
+        if parallel and order_by is not None:
+            raise ValueError("order_by can not be used with parallel")
+        if parallel_mode not in ("thread", "process"):
+            raise ValueError(f"parallel_mode should be 'thread' or 'process', got {parallel_mode}")
+        if snapshot:
+            if parallel or order_by is not None:
+                raise ValueError("parallel and order_by can not be used with snapshot")
+            return self.__read_snapshot(chunksize, format, downcast, max_age)
+        if parallel:
+            partitions = self.__read_partitions(parallel, partition_column, format, downcast, parallel_mode)
+            if format == "arrow":
+                if chunksize:
+                    return (batch for partition in partitions for batch in partition.to_batches(chunksize))
+                return self.import_pyarrow().concat_tables(list(partitions))
+            if chunksize:
+                return (chunk for partition in partitions for chunk in self.iter_chunks(partition, chunksize))
+            partitions = list(partitions)
+            # Empty partitions have object columns, which would turn every column of concatenated frame to object
+            return pandas.concat([partition for partition in partitions if len(partition)] or partitions[:1],
+                                 ignore_index=True)
+        query = f"SELECT * FROM `{self.table_name}`"
+        if order_by is not None:
+            order_clause, columns = self.__order_clause(order_by)
+            indexes = self.__metadata()["indexes"].values()
+            if not any(index["columns"][:len(columns)] == columns for index in indexes):
+                warnings.warn(f"No index of table {self.table_name} starts with {','.join(columns)}, server will sort "
+                              f"whole table before first row is read, add key with set_unique_keys or sort_table",
+                              stacklevel=2)
+            query = query + f" ORDER BY {order_clause}"
+        return self.__read_query(query, chunksize=chunksize, format=format, downcast=downcast)
+    
+    def __read_partitions(self, parallel: int, partition_column: str = None, format: str = "pandas",
+                          downcast: bool = False, parallel_mode: str = "thread"):
+        """
+        This is privet method. Created for internal used only.
+        This method split table into parallel ranges of partition_column and
+        read every range in thread pool, or in process pool with table object
+        pickled to every worker.
+        
+        Parameters
+        ----------
+        parallel : int
+            Number of partitions read at same time.
+        
+        partition_column : str
+            Numeric column used for partitioning table. If None, first column
+            of primary key is used.
+        
+        format : str
+            "pandas" for pandas.DataFrame, "arrow" for pyarrow.Table.
+        
+        downcast : bool
+            If True, pandas.DataFrame columns get narrowest pandas data type.
+        
+        parallel_mode : str
+            "thread" or "process".
+        
+        Returns
+        -------
+        Iterable object
+            Iterable object which will give pandas.DataFrame or pyarrow.Table of every partition
+            in order of ranges, followed by rows with NULL if partition_column allows NULL.
+        """
+        if partition_column is None:
+            key = self.__primary_key()
+            if not key:
+                raise ValueError(f"Table {self.table_name} has no primary key, pass partition_column to read_table")
+            partition_column = key[0]
+        data_type = self.get_data_type()[partition_column]
+        if self.type_name(data_type) not in self.integer_type_names + ("decimal", "numeric", "float", "double"):
+            raise ValueError(f"Column {partition_column} of type {data_type} can not be used for partitioning")
+        with self.pooled_cursor() as cursor:
+            cursor.execute(f"SELECT MIN(`{partition_column}`), MAX(`{partition_column}`) FROM `{self.table_name}`")
+            low, high = cursor.fetchone()
+        query = f"SELECT * FROM `{self.table_name}`"
+        if low is None:
+            queries = [(query, None)]
+        else:
+            step = (high - low) / parallel
+            if self.type_name(data_type) in self.integer_type_names:
+                step = max(int(step) + 1, 1)
+            bounds = [low + step * part for part in range(parallel)] + [high]
+            queries = [(query + f" WHERE `{partition_column}` >= %s AND `{partition_column}` < %s",
+                        (bounds[part], bounds[part + 1])) for part in range(parallel - 1)]
+            queries.append((query + f" WHERE `{partition_column}` >= %s AND `{partition_column}` <= %s",
+                            (bounds[-2], high)))
+            if partition_column in self.__metadata()["nullable"]:
+                queries.append((query + f" WHERE `{partition_column}` IS NULL", None))
+        if parallel_mode == "process":
+            with concurrent.futures.ProcessPoolExecutor(max_workers=min(parallel, len(queries))) as executor:
+                futures = [executor.submit(read_partition, self, sql, params, format, downcast)
+                           for sql, params in queries]
+                for future in futures:
+                    yield future.result()
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, self.__read_query, sql, params, None, format,
+                                       downcast) for sql, params in queries]
+            for future in futures:
+                yield future.result()
+    
+    @instrumented("iter_pages")
+    def iter_pages(self, key: str or list = None, page_size: int = 10000, checkpoint: str = None):
+        """
+        This method will walk table in order of key, one page at a time. Every
+        page is read with ``WHERE key > last_seen ORDER BY key LIMIT page_size``,
+        so reading later pages is as fast as reading first one.
+        
+        Example
+        -------
+        This will read table in pages of 1000 rows on primary key.
+        
+        ``for page, checkpoint in self.iter_pages(page_size = 1000):``
+        
+        This will resume reading after page for which checkpoint was returned.
+        
+        ``for page, checkpoint in self.iter_pages(page_size = 1000, checkpoint = checkpoint):``
+        
+        Parameters
+        ----------
+        key : str or list
+            Column or list of columns with unique values in which order table
+            will be read. If None, key set by set_primary_key is used, else
+            primary key of table.
+        
+        page_size : int
+            Number of rows in one page.
+        
+        checkpoint : str
+            Checkpoint returned with a page. If given, reading starts after
+            that page.
+        
+        Returns
+        -------
+        Iterable object
+            Iterable object which will give tuple of pandas.DataFrame and
+            checkpoint of that page.
+        """
+        if key is None:
+            key = self.__primary_key()
+            if not key:
+                raise ValueError(f"Table {self.table_name} has no primary key, pass key to iter_pages")
+        elif isinstance(key, str):
+            key = [key]
+        last_seen = json.loads(checkpoint) if checkpoint else None
+        order_by = ", ".join(f"`{col}`" for col in key)
+        while True:
+            query = f"SELECT * FROM `{self.table_name}`"
+            params = None
+            if last_seen is not None:
+                condition, params = self.__seek_condition(key, last_seen)
+                query = query + f" WHERE {condition}"
+            page = self.__read_query(query + f" ORDER BY {order_by} LIMIT {int(page_size)}", params)
+            if page.empty:
+                return
+            last_seen = [page[col].iloc[-1] for col in key]
+            last_seen = [value.item() if hasattr(value, "item") else value for value in last_seen]
+            yield page, json.dumps(last_seen, default=str)
+            if len(page) < page_size:
+                return
+    
+    @instrumented("export")
+    def export(self, path: str, format: str = None, where: Condition or list = None, chunksize: int = 100000,
+               prefetch: int = 2, compression: str = None) -> dict:
+        """
+        This method will write table to Parquet or CSV file, streaming rows from
+        server side cursor in chunks, so whole table is never held in memory.
+        Every chunk becomes one row group of Parquet file.
+        
+        Note
+        ----
+            With prefetch, next chunks are read from server in background
+            thread while current chunk is encoded, compressed and written.
+        
+        Example
+        -------
+        This will write whole table to Parquet file.
+        
+        ``self.export("table.parquet")``
+        
+        This will write filtered rows to gzip compressed CSV file.
+        
+        ``self.export("table.csv.gz", where = Column("year") == 2022)``
+        
+        Parameters
+        ----------
+        path : str
+            Path of file which will be written.
+        
+        format : str
+            "parquet", "csv.gz" or "csv". If None, it is taken from extension
+            of path.
+        
+        where : Condition or list
+            Condition of rows written, same as where of table_filter. If None,
+            all rows are written.
+        
+        chunksize : int
+            Number of rows read from server and written at one time.
+        
+        prefetch : int
+            Number of chunks read ahead in background thread, 0 reads and
+            writes in same thread.
+        
+        compression : str
+            Parquet codec like "snappy" (default) or "zstd", or gzip level
+            from "1" to "9" (default "6") for "csv.gz".
+        
+        Returns
+        -------
+        dict
+            Dictionary with rows, seconds, rows_per_second and bytes of file.
         """
-        return pandas.read_sql_table(table_name=self.table_name, con=self.sqlalchemy_engine, chunksize=chunksize)
+        start = time.perf_counter()
+        format = format or self.__file_format(path)
+        query = f"SELECT * FROM `{self.table_name}`"
+        params = None
+        if where is not None:
+            clause, params, _ = Condition.compile(where)
+            query += f" WHERE {clause}"
+        rows = 0
+        if format == "parquet":
+            pyarrow = self.import_pyarrow()
+            import pyarrow.parquet
+            batches = self.__prefetch(self.__read_query(query, params, chunksize, "arrow"), prefetch)
+            writer = None
+            try:
+                for batch in batches:
+                    if writer is None:
+                        writer = pyarrow.parquet.ParquetWriter(path, batch.schema, compression=compression or "snappy")
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+                if writer is None:
+                    data_types = self.get_data_type()
+                    empty = self.rows_to_record_batch([], list(data_types), data_types)
+                    writer = pyarrow.parquet.ParquetWriter(path, empty.schema, compression=compression or "snappy")
+            finally:
+                batches.close()
+                if writer is not None:
+                    writer.close()
+        elif format in ("csv", "csv.gz"):
+            frames = self.__prefetch(self.__read_query(query, params, chunksize), prefetch)
+            if format == "csv.gz":
+                file = gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=int(compression or 6))
+            else:
+                file = open(path, "w", newline="", encoding="utf-8")
+            try:
+                header = True
+                for frame in frames:
+                    frame.to_csv(file, header=header, index=False)
+                    header = False
+                    rows += len(frame)
+                if header:
+                    file.write(",".join(self.get_data_type()) + "\n")
+            finally:
+                frames.close()
+                file.close()
+        else:
+            raise ValueError(f"format should be 'parquet', 'csv.gz' or 'csv', got {format}")
+        seconds = time.perf_counter() - start
+        return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds else 0.0,
+                "bytes": os.path.getsize(path)}
+    
+    @instrumented("import_file")
+    def import_file(self, path: str, format: str = None, if_exists: str = "append", bulk: str = "load_data",
+                    upsert: bool = False, chunksize: int = 100000, parallel: int = None, prefetch: int = 2,
+                    infer_schema: bool = False) -> dict:
+        """
+        This method will add rows of Parquet or CSV file to table. File is read
+        in chunks, which are written with LOAD DATA LOCAL INFILE, batched
+        INSERT or upsert as in populate_table and update_table, so memory used
+        is bounded by chunksize, not by size of file.
+        
+        Note
+        ----
+            With prefetch, next chunks are read, decompressed and parsed in
+            background thread while current chunk is sent to server.
+            
+            Columns of file are written as they are, index is not added as
+            column.
+        
+        Example
+        -------
+        This will add rows of Parquet file to table, over 4 connections at same
+        time.
+        
+        ``self.import_file("table.parquet", parallel = 4)``
+        
+        This will insert or update rows of CSV file on primary key of table.
+        
+        ``self.import_file("table.csv.gz", upsert = True)``
+        
+        Parameters
+        ----------
+        path : str
+            Path of file which will be read.
+        
+        format : str
+            "parquet", "csv.gz" or "csv". If None, it is taken from extension
+            of path.
+        
+        if_exists : str
+            This parameter will decide what to do if table_name already
+            exists. Options are 'fail', 'replace' and 'append'.
+        
+        bulk : str
+            "load_data" or "insert", same as bulk of populate_table.
+        
+        upsert : bool
+            If True, rows which already exist on primary key are updated, same
+            as update_table, and bulk is not used.
+        
+        chunksize : int
+            Number of rows read from file and sent to server at one time.
+        
+        parallel : int
+            Number of chunks written at same time.
+        
+        prefetch : int
+            Number of chunks read ahead in background thread, 0 reads and
+            writes in same thread.
+        
+        infer_schema : bool
+            If True and table gets created, narrowest MySQL data types are
+            used, inferred from first chunk with some headroom.
+        
+        Returns
+        -------
+        dict
+            Same dictionary as populate_table returns.
+        """
+        format = format or self.__file_format(path)
+        if format == "parquet":
+            self.import_pyarrow()
+            import pyarrow.parquet
+            frames = (batch.to_pandas() for batch in
+                      pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunksize))
+        elif format in ("csv", "csv.gz"):
+            frames = pandas.read_csv(path, chunksize=chunksize, compression="gzip" if format == "csv.gz" else None)
+        else:
+            raise ValueError(f"format should be 'parquet', 'csv.gz' or 'csv', got {format}")
+        if bulk not in ("load_data", "insert"):
+            raise ValueError(f"bulk should be 'load_data' or 'insert', got {bulk}")
+        frames = self.__prefetch(frames, prefetch)
+        try:
+            table_columns, chunks = self.__prepare_chunks(frames, if_exists, chunksize, infer_schema, index=False)
+            write = self.__upsert_writer(table_columns) if upsert else self.__bulk_writer(table_columns, bulk)
+            return self.__write_chunks(chunks, write, parallel)
+        finally:
+            frames.close()
+            self.__table_written()
+    
+    @instrumented("refresh_snapshot")
+    def refresh_snapshot(self, strategy: str = "auto", watermark: str = None, range_size: int = 10000) -> dict:
+        """
+        This method will bring local snapshot of table in snapshot_store up to
+        date, reading only rows changed since last refresh where it can.
+        
+        Note
+        ----
+            "updated_at" reads rows whose watermark column, updated on every
+            change of row, is not older than newest value in snapshot, and
+            replaces rows with same primary key. "auto_increment" reads rows
+            whose watermark column is greater than largest value in snapshot,
+            so it is for tables where rows are only inserted. With both,
+            whole table is read again when number of rows differs from table,
+            as rows were deleted. Rows at newest value are read again on
+            every "updated_at" refresh, as more rows can get same value
+            later, and ones equal to rows in snapshot are not counted as read.
+            
+            Snapshot file is written again only when rows were read, so
+            refresh which found no change leaves file and its memory maps as
+            they were.
+            
+            "checksum" splits table into ranges of range_size rows on primary
+            key, and reads again only ranges whose number of rows or checksum
+            of rows changed. Checksums are computed on server, one range scan
+            per range. Range which grew past twice range_size rows is split
+            again into ranges of range_size rows.
+            
+            Whole table is read again when columns or data types of table
+            changed, or strategy, watermark or key of snapshot changed.
+        
+        Example
+        -------
+        This will refresh snapshot with strategy chosen from table.
+        
+        ``self.refresh_snapshot()``
+        
+        Parameters
+        ----------
+        strategy : str
+            "updated_at", "auto_increment", "checksum", "full" to read whole
+            table every time, or "auto" to use "updated_at" if table has
+            column with ON UPDATE CURRENT_TIMESTAMP and primary key, else
+            "checksum" if it has primary key, else "full". "auto_increment"
+            misses updated rows, so it is used only when passed.
+        
+        watermark : str
+            Watermark column of "updated_at" or "auto_increment". If None,
+            it is found from table.
+        
+        range_size : int
+            Number of rows in one range of "checksum", used when ranges are
+            created on first refresh, after whole table is read again, or
+            when range is split again.
+        
+        Returns
+        -------
+        dict
+            Dictionary with strategy, rows of snapshot, rows read from server,
+            full which is True if whole table was read, and seconds.
+        """
+        if self.snapshot_store is None:
+            raise ValueError(f"Table object of {self.table_name} has no snapshot_store")
+        start = time.perf_counter()
+        with self.pooled_cursor() as cursor:
+            cursor.execute("SELECT COLUMN_NAME, COLUMN_TYPE, EXTRA FROM information_schema.COLUMNS "
+                           "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+                           (self.db_name, self.table_name))
+            definitions = cursor.fetchall()
+        if not definitions:
+            raise pymysql.err.ProgrammingError(1146, f"Table '{self.db_name}.{self.table_name}' doesn't exist")
+        data_types = {name: column_type for name, column_type, _ in definitions}
+        if data_types != self.get_data_type():
+            self.metadata_cache.invalidate()
+        key = self.__primary_key()
+        if strategy == "auto":
+            strategy, watermark = self.__snapshot_strategy(definitions, key, watermark)
+        if strategy in ("updated_at", "auto_increment") and watermark is None:
+            extra_name = "on update current_timestamp" if strategy == "updated_at" else "auto_increment"
+            watermark = next((name for name, _, extra in definitions if extra_name in extra.lower()), None)
+            if watermark is None:
+                raise ValueError(f"Table {self.table_name} has no {strategy} column, pass watermark")
+        if strategy in ("updated_at", "checksum") and not key:
+            raise ValueError(f"Table {self.table_name} has no primary key, needed by strategy {strategy}")
+        if strategy not in ("updated_at", "auto_increment", "checksum", "full"):
+            raise ValueError(f"strategy should be 'auto', 'updated_at', 'auto_increment', 'checksum' or 'full', "
+                             f"got {strategy}")
+        store = self.snapshot_store
+        snapshot, manifest = store.load(self.host, self.db_name, self.table_name)
+        settings = {"schema": [[name, column_type] for name, column_type, _ in definitions], "strategy": strategy,
+                    "watermark": watermark, "key": key}
+        if manifest is None or any(manifest.get(name) != value for name, value in settings.items()):
+            snapshot, manifest = None, dict(settings)
+        full = snapshot is None
+        if strategy == "checksum":
+            snapshot, read = self.__checksum_refresh(snapshot, manifest, key, data_types, range_size)
+        elif strategy in ("updated_at", "auto_increment"):
+            snapshot, read, full = self.__watermark_refresh(snapshot, manifest, key, watermark, data_types,
+                                                            strategy == "auto_increment")
+        else:
+            snapshot = self.__read_query(f"SELECT * FROM `{self.table_name}`", format="arrow", data_types=data_types)
+            read = snapshot.num_rows
+        if read or full:
+            store.save(self.host, self.db_name, self.table_name, snapshot, manifest)
+        else:
+            store.touch(self.host, self.db_name, self.table_name)
+        return {"strategy": strategy, "rows": snapshot.num_rows, "read": read, "full": full,
+                "seconds": time.perf_counter() - start}
+    
+    @staticmethod
+    def __snapshot_strategy(definitions: list, key: list, watermark: str = None) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        
+        Parameters
+        ----------
+        definitions : list
+            Column name, column type and extra of every column of table.
+        
+        key : list
+            Primary key columns of table.
+        
+        watermark : str
+            Watermark column given by user.
+        
+        Returns
+        -------
+        tuple
+            Strategy of refresh_snapshot and watermark column or None.
+        """
+        extras = {name: extra.lower() for name, _, extra in definitions}
+        if watermark is not None and "auto_increment" not in extras.get(watermark, ""):
+            return "updated_at", watermark
+        updated = [name for name, extra in extras.items() if "on update current_timestamp" in extra]
+        if updated and key:
+            return "updated_at", updated[0]
+        return ("checksum" if key else "full"), None
+    
+    def __watermark_refresh(self, snapshot, manifest: dict, key: list, watermark: str, data_types: dict,
+                            append: bool) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        This method reads rows at or after watermark of manifest and adds them
+        to snapshot, replacing rows with same key unless append is True.
+        Rows read again which are equal to rows of snapshot with same key are
+        dropped, so they are not counted as read. Whole table is read when
+        there is no snapshot or number of rows differs from table.
+        
+        Returns
+        -------
+        tuple
+            pyarrow.Table of new snapshot, number of rows read and True if
+            whole table was read.
+        """
+        pyarrow = self.import_pyarrow()
+        import pyarrow.compute
+        query = f"SELECT * FROM `{self.table_name}`"
+        full = snapshot is None
+        read = 0
+        if not full:
+            operator = ">" if append else ">="
+            changed = self.__read_query(query + f" WHERE `{watermark}` {operator} %s", (manifest["mark"],),
+                                        format="arrow", data_types=data_types)
+            if changed.num_rows and not append:
+                changed = changed.cast(snapshot.schema)
+                replaced = self.__key_isin(snapshot, changed, key)
+                old_rows = snapshot.filter(pyarrow.array(replaced)).to_pandas().drop_duplicates()
+                same = changed.to_pandas().merge(old_rows, how="left", indicator="databaseops_merge")
+                changed = changed.filter(pyarrow.array(same["databaseops_merge"].ne("both").to_numpy()))
+                if changed.num_rows:
+                    snapshot = snapshot.filter(pyarrow.array(~self.__key_isin(snapshot, changed, key)))
+            read = changed.num_rows
+            if read:
+                snapshot = pyarrow.concat_tables([snapshot, changed.cast(snapshot.schema)])
+            with self.pooled_cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM `{self.table_name}`")
+                full = cursor.fetchone()[0] != snapshot.num_rows
+        if full:
+            snapshot = self.__read_query(query, format="arrow", data_types=data_types)
+            read = snapshot.num_rows
+        mark = pyarrow.compute.max(snapshot[watermark]).as_py() if snapshot.num_rows else None
+        manifest["mark"] = manifest.get("mark") if mark is None else mark
+        return snapshot, read, full
+    
+    @staticmethod
+    def __key_isin(rows, keys, key: list):
+        """
+        This is privet method. Created for internal used only.
+        
+        Parameters
+        ----------
+        rows : pyarrow.Table
+            Rows whose key is looked up.
+        
+        keys : pyarrow.Table
+            Rows whose key values are looked for.
+        
+        key : list
+            Primary key columns.
+        
+        Returns
+        -------
+        numpy.ndarray
+            True for every row of rows whose key is in keys.
+        """
+        old_keys = rows.select(key).to_pandas()
+        new_keys = keys.select(key).to_pandas()
+        if len(key) > 1:
+            return pandas.MultiIndex.from_frame(old_keys).isin(pandas.MultiIndex.from_frame(new_keys))
+        return old_keys[key[0]].isin(new_keys[key[0]]).to_numpy()
+    
+    def __checksum_refresh(self, snapshot, manifest: dict, key: list, data_types: dict, range_size: int) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        This method computes number of rows and checksum of every key range
+        of table on server, and reads again ranges which differ from
+        manifest. Range with more than twice range_size rows is split into
+        ranges of range_size rows, which are read again. Checksums are
+        computed before rows are read, so row changed in between is read
+        again on next refresh. Range whose rows read differ in number from
+        its checksum gets no checksum, so it is read again on next refresh.
+        
+        Returns
+        -------
+        tuple
+            pyarrow.Table of new snapshot and number of rows read.
+        """
+        pyarrow = self.import_pyarrow()
+        if snapshot is None:
+            manifest["boundaries"] = self.__key_boundaries(key, range_size)
+            manifest["ranges"] = None
+        bounds = [None] + manifest["boundaries"] + [None]
+        old = manifest["ranges"] or [None] * (len(bounds) - 1)
+        offsets = list(itertools.accumulate(entry[0] if entry is not None else 0 for entry in old))
+        row_hash = self.row_hash_sql(list(data_types), data_types)
+        checksum_sql = f"COALESCE(BIT_XOR(CAST(CONV(LEFT({row_hash}, 16), 16, 10) AS UNSIGNED)), 0)"
+        # Every range as low and high boundary, checksum, and rows of snapshot it can be taken from
+        ranges = []
+        with self.pooled_cursor() as cursor:
+            for number, (low, high) in enumerate(zip(bounds, bounds[1:])):
+                condition, params = self.__range_condition(key, low, high)
+                cursor.execute(f"SELECT COUNT(*), {checksum_sql} FROM `{self.table_name}` WHERE {condition}", params)
+                count, checksum = cursor.fetchone()
+                if count <= 2 * range_size:
+                    start = offsets[number] - (old[number][0] if old[number] is not None else 0)
+                    ranges.append((low, high, [int(count), int(checksum)], old[number], start))
+                    continue
+                splits = [low] + self.__key_boundaries(key, range_size, low, high) + [high]
+                for split_low, split_high in zip(splits, splits[1:]):
+                    condition, params = self.__range_condition(key, split_low, split_high)
+                    cursor.execute(f"SELECT COUNT(*), {checksum_sql} FROM `{self.table_name}` WHERE {condition}",
+                                   params)
+                    count, checksum = cursor.fetchone()
+                    ranges.append((split_low, split_high, [int(count), int(checksum)], None, None))
+        order_by = ", ".join(f"`{col}`" for col in key)
+        parts, checksums, read = [], [], 0
+        for low, high, checksum, old_checksum, start in ranges:
+            if old_checksum is not None and old_checksum[1] is not None and old_checksum == checksum:
+                parts.append(snapshot.slice(start, old_checksum[0]))
+            else:
+                condition, params = self.__range_condition(key, low, high)
+                part = self.__read_query(f"SELECT * FROM `{self.table_name}` WHERE {condition} ORDER BY {order_by}",
+                                         params, format="arrow", data_types=data_types)
+                parts.append(part)
+                read += part.num_rows
+                if part.num_rows != checksum[0]:
+                    checksum = [part.num_rows, None]
+            checksums.append(checksum)
+        manifest["boundaries"] = [low for low, *_ in ranges[1:]]
+        manifest["ranges"] = checksums
+        schema = parts[0].schema if snapshot is None else snapshot.schema
+        return pyarrow.concat_tables([part.cast(schema) for part in parts]), read
+    
+    def __key_boundaries(self, key: list, range_size: int, low: list = None, high: list = None) -> list:
+        """
+        This is privet method. Created for internal used only.
+        This method finds key of every range_size-th row in order of key, by
+        skipping range_size rows of index from previous boundary. With low
+        and high, only rows with key at or after low and before high are used.
+        
+        Returns
+        -------
+        list
+            Values of key columns where every range after first starts.
+        """
+        columns = ", ".join(f"`{col}`" for col in key)
+        boundaries = []
+        with self.pooled_cursor() as cursor:
+            while True:
+                condition, params = self.__range_condition(key, low, high)
+                if boundaries:
+                    seek_condition, seek_params = self.__seek_condition(key, boundaries[-1])
+                    condition, params = f"({seek_condition}) AND ({condition})", seek_params + params
+                cursor.execute(f"SELECT {columns} FROM `{self.table_name}` WHERE {condition} ORDER BY {columns} "
+                               f"LIMIT 1 OFFSET {int(range_size) - bool(boundaries)}", params or None)
+                row = cursor.fetchone()
+                if row is None:
+                    return boundaries
+                boundaries.append([value.isoformat(" ") if hasattr(value, "isoformat") else value for value in row])
+    
+    @staticmethod
+    def __range_condition(key: list, low: list = None, high: list = None) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        This method build condition for rows with key at or after low and
+        before high, expanded column by column as in __seek_condition so
+        MySQL can use it as range on index.
+        
+        Returns
+        -------
+        tuple
+            Condition with %s placeholders and tuple of parameters.
+        """
+        clauses, params = [], []
+        for values, operator, strict in ((low, ">=", ">"), (high, "<", "<")):
+            if values is None:
+                continue
+            conditions = []
+            for position, col in enumerate(key):
+                last = position == len(key) - 1
+                parts = [f"`{prev}` = %s" for prev in key[:position]] + [f"`{col}` {operator if last else strict} %s"]
+                conditions.append("(" + " AND ".join(parts) + ")")
+                params.extend(values[:position + 1])
+            clauses.append("(" + " OR ".join(conditions) + ")")
+        return " AND ".join(clauses) or "TRUE", tuple(params)
+    
+    def __read_snapshot(self, chunksize: int = None, format: str = "pandas", downcast: bool = False,
+                        max_age: float = 0):
+        """
+        This is privet method. Created for internal used only.
+        This method refreshes snapshot of table, unless it is younger than
+        max_age, and reads it from memory map.
+        
+        Returns
+        -------
+        pandas.DataFrame, pyarrow.Table or Iterable object
+            Same as read_table.
+        """
+        if self.snapshot_store is None:
+            raise ValueError(f"Table object of {self.table_name} has no snapshot_store")
+        age = self.snapshot_store.age(self.host, self.db_name, self.table_name)
+        snapshot = None
+        if age is not None and (max_age is None or age < max_age):
+            snapshot, _ = self.snapshot_store.load(self.host, self.db_name, self.table_name)
+        if snapshot is None:
+            self.refresh_snapshot()
+            snapshot, _ = self.snapshot_store.load(self.host, self.db_name, self.table_name)
+        if format == "arrow":
+            return snapshot.to_batches(chunksize) if chunksize else snapshot
+        if format != "pandas":
+            raise ValueError(f"format should be 'pandas' or 'arrow', got {format}")
+        pandas_types = self.mysql_to_pandas_types(self.get_data_type()) if downcast else {}
+        
+        def to_pandas(data) -> pandas.DataFrame:
+            frame = data.to_pandas()
+            return frame.astype({col: pandas_types[col] for col in frame.columns if col in pandas_types})
+        
+        if chunksize:
+            return (to_pandas(batch) for batch in snapshot.to_batches(chunksize))
+        return to_pandas(snapshot)
+    
+    @staticmethod
+    def __file_format(path: str) -> str:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        str
+            "parquet", "csv.gz" or "csv" from extension of path.
+        """
+        name = os.fspath(path).lower()
+        for format, extensions in FILE_FORMATS.items():
+            if name.endswith(extensions):
+                return format
+        raise ValueError(f"format of {path} is not known from its extension, pass format")
+    
+    @staticmethod
+    def __prefetch(iterator, depth: int):
+        """
+        This is privet method. Created for internal used only.
+        This method takes items of iterator in background thread, up to depth
+        items ahead of caller, so reading of next items runs while caller
+        works on current one. Exception raised by iterator is raised to caller.
+        
+        Returns
+        -------
+        Iterable object
+            Iterable object which will give items of iterator.
+        """
+        if not depth:
+            yield from iterator
+            return
+        items = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        finished = object()
+        
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce() -> None:
+            try:
+                for item in iterator:
+                    if not put((item, None)):
+                        return
+                put((finished, None))
+            except BaseException as error:
+                put((finished, error))
+        
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(produce,), daemon=True)
+        thread.start()
+        try:
+            while True:
+                item, error = items.get()
+                if error is not None:
+                    raise error
+                if item is finished:
+                    return
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+            if hasattr(iterator, "close"):
+                iterator.close()
+    
+    @staticmethod
+    def __seek_condition(key: list, last_seen: list) -> tuple:
+        """
+        This is privet method. Created for internal used only.
+        This method build condition for rows after last_seen in order of key.
+        Composite key (a, b) gives ``a > x OR (a = x AND b > y)``, which MySQL
+        can use as range on index.
+        
+        Parameters
+        ----------
+        key : list
+            Columns in which order table is read.
+        
+        last_seen : list
+            Values of key columns for last row read.
+        
+        Returns
+        -------
+        tuple
+            Condition with %s placeholders and tuple of parameters.
+        """
+        conditions, params = [], []
+        for position, col in enumerate(key):
+            parts = [f"`{prev}` = %s" for prev in key[:position]] + [f"`{col}` > %s"]
+            conditions.append("(" + " AND ".join(parts) + ")")
+            params.extend(last_seen[:position + 1])
+        return " OR ".join(conditions), tuple(params)
+    
+    def __primary_key(self) -> list:
+        """
+        This is privet method. Created for internal used only.
+        
+        Returns
+        -------
+        list
+            Columns of key set by set_primary_key, else columns of primary key
+            of table in index order.
+        """
+        if getattr(self, "primary_key_columns", None):
+            return self.primary_key_columns.split(",")
+        return list(self.__metadata()["indexes"].get("PRIMARY", {}).get("columns", []))
+    
+    def __read_query(self, query: str, params: tuple = None, chunksize: int = None, format: str = "pandas",
+                     downcast: bool = False, data_types: dict = None):
+        """
+        This is privet method. Created for internal used only.
+        This method run query on pooled connection and build pandas.DataFrame
+        or pyarrow data from rows.
+        
+        Parameters
+        ----------
+        query : str
+            SELECT query, with %s placeholders if params are given.
+        
+        params : tuple
+            Parameters which will be bound to query.
+        
+        chunksize : int
+            If given, rows are streamed with server side cursor and returned
+            as iterable object of chunksize rows.
+        
+        format : str
+            "pandas" for pandas.DataFrame, "arrow" for pyarrow.Table, or
+            pyarrow.RecordBatch with chunksize.
+        
+        downcast : bool
+            If True, pandas.DataFrame columns get narrowest pandas data type.
+        
+        data_types : dict
+            MySQL data types of result columns, if None get_data_type is used.
+
+        Returns
+        -------
+        pandas.DataFrame, pyarrow.Table or Iterable object
+            pandas.DataFrame or pyarrow.Table, or Iterable object which will give
+            pandas.DataFrame or pyarrow.RecordBatch
+        """
+        build = self.__result_builder(format, downcast, data_types)
+        if chunksize:
+            return self.__stream_query(query, params, chunksize, build)
+        if format == "arrow":
+            return self.__read_arrow(query, params, build)
+        with self.pooled_cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            with MySQLInstrumentation.current().timing("build"):
+                result = build(cursor.fetchall(), columns)
+        return result
+    
+    def __read_arrow(self, query: str, params: tuple, build):
+        """
+        This is privet method. Created for internal used only.
+        This method run query with server side cursor and converts every
+        ARROW_FETCH_ROWS rows to pyarrow.RecordBatch as they arrive, so only
+        one batch of rows is kept as Python objects beside pyarrow.Table.
+        
+        Parameters
+        ----------
+        query : str
+            SELECT query, with %s placeholders if params are given.
+        
+        params : tuple
+            Parameters which will be bound to query.
+        
+        build : Method
+            Method which build pyarrow.RecordBatch from rows and column names.
+        
+        Returns
+        -------
+        pyarrow.Table
+            Table of all rows, with one empty batch if query gave no rows.
+        """
+        span = MySQLInstrumentation.current()
+        batches = []
+        with self.pooled_cursor(pymysql.cursors.SSCursor) as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            while True:
+                with span.timing("fetch"):
+                    rows = cursor.fetchmany(ARROW_FETCH_ROWS)
+                if rows or not batches:
+                    with span.timing("build"):
+                        batches.append(build(rows, columns))
+                if len(rows) < ARROW_FETCH_ROWS:
+                    break
+        return self.import_pyarrow().Table.from_batches(batches)
+    
+    def __result_builder(self, format: str, downcast: bool = False, data_types: dict = None):
+        """
+        This is privet method. Created for internal used only.
+        
+        Parameters
+        ----------
+        format : str
+            "pandas" or "arrow".
+        
+        downcast : bool
+            If True, pandas.DataFrame columns get narrowest pandas data type
+            matching MySQL data type from get_data_type.
+        
+        data_types : dict
+            MySQL data types of result columns, if None get_data_type is used.
+        
+        Returns
+        -------
+        Method
+            Method which build pandas.DataFrame or pyarrow.RecordBatch from
+            rows and column names. Arrow types are taken from get_data_type.
+        """
+        if format in ("pandas", "arrow") and (downcast or format == "arrow") and data_types is None:
+            data_types = self.get_data_type()
+        if format == "pandas" and downcast:
+            pandas_types = self.mysql_to_pandas_types(data_types)
+            return lambda rows, columns: pandas.DataFrame.from_records(rows, columns=columns, coerce_float=True).astype(
+                {col: pandas_types[col] for col in columns if col in pandas_types})
+        if format == "pandas":
+            return lambda rows, columns: pandas.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        if format == "arrow":
+            return lambda rows, columns: self.rows_to_record_batch(rows, columns, data_types)
+        raise ValueError(f"format should be 'pandas' or 'arrow', got {format}")
+    
+    def __stream_query(self, query: str, params: tuple, chunksize: int, build):
+        """
+        This is privet method. Created for internal used only.
+        This method run query with server side cursor (SSCursor) and yields
+        chunksize rows as they arrive from server.
+        
+        Note
+        ----
+            If iteration is stopped before all rows are read, connection is
+            discarded instead of reading remaining rows from server.
+        
+        Parameters
+        ----------
+        query : str
+            SELECT query, with %s placeholders if params are given.
+        
+        params : tuple
+            Parameters which will be bound to query.
+        
+        chunksize : int
+            Number of rows in one iteration.
+        
+        build : Method
+            Method which build result from rows and column names.
+        
+        Returns
+        -------
+        Iterable object
+            Iterable object which will give result of build.
+        """
+        connection = self.sqlalchemy_engine.raw_connection()
+        span = MySQLInstrumentation.start("query", self.table_name, query)
+        finished = False
+        error = None
+        rows_read = 0
+        try:
+            cursor = connection.cursor(pymysql.cursors.SSCursor)
+            with span.timing("execute"):
+                cursor.execute(query, params)
+            executed = getattr(cursor, "_executed", None)
+            span.sql = executed if isinstance(executed, str) else query
+            span.add_bytes(len(span.sql or ""))
+            columns = [col[0] for col in cursor.description]
+            while True:
+                with span.timing("fetch"):
+                    rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                rows_read += len(rows)
+                with span.timing("build"):
+                    result = build(rows, columns)
+                yield result
+            cursor.close()
+            finished = True
+        except Exception as raised:
+            error = raised
+            raise
+        finally:
+            if not finished:
+                connection.invalidate()
+            connection.close()
+            span.rows = rows_read
+            # Time spent by caller between chunks is not part of query
+            MySQLInstrumentation.finish(span, error, sum(getattr(span, "timings", {}).values()))
+
+
+def read_partition(table: MySQLTable, query: str, params: tuple, format: str = "pandas", downcast: bool = False):
+    """
+    This function reads one partition of read_table with parallel_mode="process"
+    in worker process. It is module level function, so process pool can pickle it.
+    
+    Returns
+    -------
+    pandas.DataFrame or pyarrow.Table
+        Rows of partition.
+    """
+    return table._MySQLTable__read_query(query, params, None, format, downcast)
@@ -34,5 +34,9 @@ setup(
 		"sqlalchemy",
 		"PyMySQL",
 		"pandas"
-	]
+	],
+	extras_require={
+		# Optional dependencies for arrow format
+		"arrow": ["pyarrow"]
+	}
 )
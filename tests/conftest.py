@@ -0,0 +1,174 @@
+# coding=utf-8
+"""
+Fixtures of tests. Tests run on SQLite stand-in of MySQL server, whose connections accept PyMySQL %s placeholders, or on
+MySQL server given by DATABASEOPS_TEST_HOST, DATABASEOPS_TEST_USER and DATABASEOPS_TEST_PASSWORD
+"""
+
+import os
+import uuid
+import sqlite3
+import pandas
+import pymysql
+import pytest
+import sqlalchemy
+import sqlalchemy.pool
+from databaseops.mysql.mysqltable import MySQLTable
+
+# SQLite declared types and MySQL data types information_schema of stand-in gives for them
+SQLITE_TYPES = {"BIGINT": "bigint", "INTEGER": "bigint", "FLOAT": "double", "REAL": "double", "TEXT": "text",
+                "TIMESTAMP": "datetime", "DATETIME": "datetime", "DATE": "date", "BOOLEAN": "tinyint(1)"}
+# Timestamps are written as text, same as MySQL gives them
+sqlite3.register_adapter(pandas.Timestamp, lambda value: value.isoformat(" "))
+# Column type of information_schema.COLUMNS of stand-in, built from declared type of SQLite column
+COLUMN_TYPE = "CASE upper(p.type) " + " ".join(f"WHEN '{name}' THEN '{data_type}'"
+                                                for name, data_type in SQLITE_TYPES.items()) + " ELSE 'text' END"
+# Views of stand-in with columns of information_schema tables read by this library, created on every connection
+INFORMATION_SCHEMA = {
+    "COLUMNS": f"""SELECT :schema AS TABLE_SCHEMA, m.name AS TABLE_NAME, p.name AS COLUMN_NAME,
+                  {COLUMN_TYPE} AS COLUMN_TYPE, CASE WHEN p."notnull" OR p.pk THEN 'NO' ELSE 'YES' END AS IS_NULLABLE,
+                  p.cid + 1 AS ORDINAL_POSITION, '' AS EXTRA
+                  FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p WHERE m.type = 'table'""",
+    "STATISTICS": """SELECT :schema AS TABLE_SCHEMA, m.name AS TABLE_NAME, i.name AS COLUMN_NAME,
+                     CASE WHEN l.origin = 'pk' THEN 'PRIMARY' ELSE l.name END AS INDEX_NAME,
+                     1 - l."unique" AS NON_UNIQUE, i.seqno + 1 AS SEQ_IN_INDEX
+                     FROM sqlite_master AS m JOIN pragma_index_list(m.name) AS l JOIN pragma_index_info(l.name) AS i
+                     WHERE m.type = 'table'
+                     UNION ALL
+                     SELECT :schema, m.name, p.name, 'PRIMARY', 0, p.pk
+                     FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p WHERE m.type = 'table' AND p.pk > 0
+                     AND NOT EXISTS (SELECT 1 FROM pragma_index_list(m.name) AS l WHERE l.origin = 'pk')""",
+    "TABLES": """SELECT :schema AS TABLE_SCHEMA, name AS TABLE_NAME, NULL AS TABLE_ROWS, NULL AS UPDATE_TIME
+                 FROM sqlite_master WHERE type = 'table'""",
+    "KEY_COLUMN_USAGE": """SELECT :schema AS TABLE_SCHEMA, NULL AS TABLE_NAME, NULL AS CONSTRAINT_NAME,
+                           NULL AS COLUMN_NAME, NULL AS REFERENCED_TABLE_NAME, NULL AS REFERENCED_COLUMN_NAME,
+                           NULL AS ORDINAL_POSITION WHERE 0""",
+}
+
+
+class StandInCursor:
+    """
+    SQLite cursor which takes PyMySQL placeholders and returns number of rows
+    from execute, as PyMySQL cursor does. Cursors of SQLAlchemy, made without
+    cursor class, take SQLite placeholders. Tables of information_schema are
+    read from views information_schema_<table> of connection.
+    """
+    
+    def __init__(self, cursor: sqlite3.Cursor, pymysql_style: bool = True) -> None:
+        self.cursor = cursor
+        self.pymysql_style = pymysql_style
+        self._executed = None
+    
+    def execute(self, query: str, args=None) -> int:
+        self._executed = query
+        if query == "SELECT @@max_allowed_packet":
+            query = "SELECT 16777216"
+        elif query == "START TRANSACTION":
+            query = "BEGIN"
+        elif query == "SET SESSION information_schema_stats_expiry = 0":
+            raise pymysql.err.OperationalError(1193, "Unknown system variable 'information_schema_stats_expiry'")
+        query = query.replace("information_schema.", "information_schema_")
+        if args is not None and self.pymysql_style:
+            # Formatted only when args are given, as PyMySQL does, so literal % fails same way
+            args = tuple(args)
+            query = query % (("?",) * len(args))
+        self.cursor.execute(query, args or ())
+        return self.cursor.rowcount
+    
+    def executemany(self, query: str, args) -> int:
+        args = [tuple(row) for row in args]
+        if self.pymysql_style:
+            query = query % (("?",) * len(args[0]))
+        self.cursor.executemany(query, args)
+        return self.cursor.rowcount
+    
+    def __getattr__(self, name: str):
+        return getattr(self.cursor, name)
+
+
+class StandInConnection:
+    """
+    SQLite connection whose cursor method takes PyMySQL cursor class, which is
+    ignored, and gives StandInCursor. Path of database is name of database,
+    given by DATABASE() and TABLE_SCHEMA of information_schema views.
+    """
+    
+    def __init__(self, path: str) -> None:
+        connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        connection.create_function("DATABASE", 0, lambda: path)
+        schema = "'" + path.replace("'", "''") + "'"
+        for name, definition in INFORMATION_SCHEMA.items():
+            connection.execute(f"CREATE TEMP VIEW information_schema_{name} AS {definition.replace(':schema', schema)}")
+        object.__setattr__(self, "connection", connection)
+    
+    def cursor(self, cursor_class=None):
+        return StandInCursor(self.connection.cursor(), cursor_class is not None)
+    
+    def __getattr__(self, name: str):
+        return getattr(self.connection, name)
+    
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self.connection, name, value)
+
+
+class StandInTable(MySQLTable):
+    """
+    MySQLTable on SQLite stand-in, whose engine is engine of stand-in.
+    """
+    
+    def __init__(self, engine: sqlalchemy.engine.Engine, table_name: str, **kwargs) -> None:
+        self.host, self.user, self.password, self.db_name = "stand-in", "test", "", engine.url.database
+        MySQLTable.__init__(self, self.host, self.user, self.password, self.db_name, table_name, **kwargs)
+        self.engine = engine
+    
+    @property
+    def sqlalchemy_engine(self) -> sqlalchemy.engine.Engine:
+        return self.engine
+    
+    def __reduce__(self) -> tuple:
+        return stand_in_table, (self.db_name, self.table_name)
+
+
+def stand_in_engine_of(path: str) -> sqlalchemy.engine.Engine:
+    """
+    Engine of SQLite stand-in in file path.
+    """
+    return sqlalchemy.create_engine(f"sqlite:///{path}", creator=lambda: StandInConnection(path),
+                                    poolclass=sqlalchemy.pool.QueuePool, pool_size=4, max_overflow=4)
+
+
+def stand_in_table(path: str, table_name: str) -> StandInTable:
+    """
+    Table object on stand-in in file path, as it is unpickled in worker process.
+    """
+    return StandInTable(stand_in_engine_of(path), table_name)
+
+
+@pytest.fixture
+def stand_in_engine(tmp_path):
+    engine = stand_in_engine_of(str(tmp_path / "stand_in.db"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_table(stand_in_engine):
+    """
+    Fixture which gives function creating table object of table_name on
+    SQLite stand-in, or on MySQL server if DATABASEOPS_TEST_HOST is set.
+    """
+    host = os.environ.get("DATABASEOPS_TEST_HOST")
+    created = []
+
+    def make(table_name: str, **kwargs) -> MySQLTable:
+        if host is None:
+            return StandInTable(stand_in_engine, table_name, **kwargs)
+        table = MySQLTable(host, os.environ.get("DATABASEOPS_TEST_USER", "root"),
+                           os.environ.get("DATABASEOPS_TEST_PASSWORD", ""), f"databaseops_test_{uuid.uuid4().hex[:8]}",
+                           table_name, **kwargs)
+        created.append(table)
+        return table
+
+    yield make
+    for table in created:
+        with table.pooled_cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{table.db_name}`")
@@ -0,0 +1,26 @@
+# coding=utf-8
+"""
+Tests of aggregate
+"""
+
+import pandas
+import pytest
+
+
+def test_aggregate(make_table):
+    table = make_table("aggregate")
+    table.populate_table(pandas.DataFrame({"city": ["Pune", "Mumbai", "Pune"], "amount": [10, 20, 30]}),
+                         bulk="insert")
+    result = table.aggregate(group_by="city", metrics={"amount": ["sum", "max"], "*": "count"})
+    result = result.sort_values("city").reset_index(drop=True)
+    assert result["city"].tolist() == ["Mumbai", "Pune"]
+    assert result["amount_sum"].tolist() == [20, 40]
+    assert result["amount_max"].tolist() == [20, 30]
+    assert result["count"].tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("metrics", [{"*": "sum"}, {"amount": "median"}])
+def test_aggregate_rejects_metrics_before_reading(make_table, metrics):
+    table = make_table("aggregate_missing")
+    with pytest.raises(ValueError):
+        table.aggregate(metrics=metrics, sample=0.1)
@@ -0,0 +1,40 @@
+# coding=utf-8
+"""
+Tests of pyarrow data built from rows, and of reads with format="arrow" on stand-in
+"""
+
+import decimal
+import datetime
+import pandas
+import pytest
+from databaseops.helper import ArrowConversion
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+def test_rows_to_record_batch_uses_mysql_types():
+    rows = [(1, "a", decimal.Decimal("1.50"), datetime.date(2024, 1, 2)), (None, None, None, None)]
+    batch = ArrowConversion.rows_to_record_batch(rows, ["id", "name", "amount", "day"],
+                                                 {"id": "tinyint unsigned", "name": "varchar(10)",
+                                                  "amount": "decimal(5,2)"})
+    assert [str(field.type) for field in batch.schema] == ["uint8", "string", "decimal128(5, 2)", "date32[day]"]
+    assert batch.column(0).to_pylist() == [1, None]
+    assert batch.column(3).null_count == 1
+
+
+def test_rows_to_record_batch_without_rows_keeps_columns():
+    batch = ArrowConversion.rows_to_record_batch([], ["id", "name"], {"id": "bigint"})
+    assert (batch.num_rows, batch.schema.names, str(batch.schema.field("id").type)) == (0, ["id", "name"], "int64")
+
+
+@pytest.mark.parametrize("rows", [0, 7, 10, 25])
+def test_arrow_read_is_built_in_batches(make_table, monkeypatch, rows):
+    monkeypatch.setattr("databaseops.mysql.mysqltable.ARROW_FETCH_ROWS", 10)
+    table = make_table("arrow_rows")
+    table.populate_table(pandas.DataFrame({"id": range(rows), "name": [f"n{i}" for i in range(rows)]}),
+                         bulk="insert")
+    result = table.read_table(format="arrow")
+    assert len(result.to_batches()) == -(-rows // 10)
+    assert result.schema.names == ["index", "id", "name"]
+    assert result.column("id").to_pylist() == list(range(rows))
+    pandas.testing.assert_frame_equal(result.to_pandas(), table.read_table(), check_dtype=False)
@@ -0,0 +1,40 @@
+# coding=utf-8
+"""
+Tests of benchmark script, run on small table
+"""
+
+import os
+import importlib.util
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "benchmark.py")
+
+
+def load_benchmark():
+    """
+    Module of benchmarks/benchmark.py, which is script and not package.
+    """
+    spec = importlib.util.spec_from_file_location("benchmark", BENCHMARK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_stream_benchmark(make_table):
+    benchmark = load_benchmark()
+    table = make_table("benchmark")
+    frame = benchmark.synthetic_frame(1000, 4, ("int", "float", "str"))
+    results = benchmark.stream_benchmark(table, frame, 5000, 500)
+    assert set(results) == {"read_table_stream", "read_table_buffered"}
+    for result in results.values():
+        assert result["rows"] == 5000
+        assert result["latency"]["p50"] > 0
+    assert len(table.read_table()) == 5000
+
+
+def test_compare_reports_regression():
+    benchmark = load_benchmark()
+    baseline = {"operations": {"read_table": {"latency": {"p50": 1.0}}}}
+    results = {"operations": {"read_table": {"latency": {"p50": 1.5}}, "table_filter": {"latency": {"p50": 0.1}}}}
+    regressions = benchmark.compare(results, baseline, 0.1)
+    assert [regression["operation"] for regression in regressions] == ["read_table"]
+    assert results["operations"]["read_table"]["change"] == 0.5
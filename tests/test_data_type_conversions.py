@@ -0,0 +1,95 @@
+# coding=utf-8
+"""
+Tests of MySQL data types inferred from dataframes, widened for later dataframes and mapped back to pandas
+"""
+
+import os
+import datetime
+import decimal
+import pandas
+import pytest
+from sqlalchemy.dialects import mysql
+from databaseops.helper import DataTypeConversion
+
+# MySQL dialect, used to compare inferred types by their DDL
+DIALECT = mysql.dialect()
+# ALTER TABLE of widened columns needs MySQL server
+mysql_only = pytest.mark.skipif(not os.environ.get("DATABASEOPS_TEST_HOST"), reason="needs MySQL server")
+
+
+def ddl(data_types: dict) -> dict:
+    return {col: data_type.compile(dialect=DIALECT) for col, data_type in data_types.items()}
+
+
+def test_infer_mysql_types_picks_narrowest_type():
+    frame = pandas.DataFrame({
+        "tiny": pandas.Series([0, 200], dtype="int64"),
+        "signed": pandas.Series([-129, 5], dtype="int64"),
+        "nullable": pandas.Series([1, None], dtype="Int64"),
+        "flag": [True, False],
+        "single": pandas.Series([1.5, 2.5], dtype="float32"),
+        "double": [1.5, None],
+        "when": pandas.to_datetime(["2024-01-01", "2024-01-02"]),
+        "precise": pandas.to_datetime(["2024-01-01 00:00:00.5", None]),
+        "name": ["a" * 20, None],
+        "long": ["b" * 1000, "c"],
+        "kind": pandas.Categorical(["x", "y"]),
+        "amount": [decimal.Decimal("123.45"), decimal.Decimal("-1.5")],
+        "day": [datetime.date(2024, 1, 1), None],
+        "mixed": [1, "a"],
+        "empty": [None, None],
+    })
+    assert ddl(DataTypeConversion.infer_mysql_types(frame)) == {
+        "tiny": "TINYINT UNSIGNED", "signed": "SMALLINT", "nullable": "TINYINT UNSIGNED", "flag": "TINYINT(1)",
+        "single": "FLOAT", "double": "DOUBLE", "when": "DATETIME", "precise": "DATETIME(6)", "name": "VARCHAR(32)",
+        "long": "TEXT", "kind": "ENUM('x','y')", "amount": "DECIMAL(5, 2)", "day": "DATE"}
+
+
+def test_infer_mysql_types_with_widen_leaves_headroom():
+    frame = pandas.DataFrame({"id": [1, 100], "name": ["a" * 20, "b"], "amount": [decimal.Decimal("9.5")] * 2})
+    assert ddl(DataTypeConversion.infer_mysql_types(frame, widen=True)) == {
+        "id": "SMALLINT", "name": "VARCHAR(64)", "amount": "DECIMAL(4, 1)"}
+
+
+def test_long_varchar_columns_become_text_to_fit_row():
+    frame = pandas.DataFrame({f"c{number}": ["a" * 700] for number in range(25)})
+    data_types = ddl(DataTypeConversion.infer_mysql_types(frame))
+    assert sum(data_type == "VARCHAR(768)" for data_type in data_types.values()) == 19
+    assert sum(data_type == "TEXT" for data_type in data_types.values()) == 6
+
+
+def test_widen_mysql_types_widens_only_columns_which_overflow():
+    frame = pandas.DataFrame({"kind": pandas.Categorical(["x", "z"]), "name": ["a" * 40, None], "id": [300, 1],
+                              "count": [-1, 2], "amount": [decimal.Decimal("1234.567"), None],
+                              "body": ["b" * 20000, "c"], "short": ["aa", "b"], "flag": [True, False]})
+    data_types = {"kind": "enum('x','y')", "name": "varchar(32)", "id": "tinyint unsigned", "count": "int unsigned",
+                  "amount": "decimal(5,2)", "body": "text", "short": "varchar(16)", "flag": "tinyint(1)",
+                  "missing": "int"}
+    assert ddl(DataTypeConversion.widen_mysql_types(data_types, frame)) == {
+        "kind": "ENUM('x','y','z')", "name": "VARCHAR(128)", "id": "MEDIUMINT", "count": "BIGINT",
+        "amount": "DECIMAL(7, 3)", "body": "MEDIUMTEXT"}
+
+
+def test_widen_mysql_types_keeps_fitting_columns():
+    frame = pandas.DataFrame({"kind": ["y", None], "name": ["a" * 32, "b"], "id": [255, 0]})
+    assert DataTypeConversion.widen_mysql_types({"kind": "enum('x','y')", "name": "varchar(32)",
+                                                 "id": "tinyint(3) unsigned"}, frame) == {}
+
+
+def test_mysql_to_pandas_types_downcasts():
+    assert DataTypeConversion.mysql_to_pandas_types({
+        "a": "tinyint(4)", "b": "int(10) unsigned", "c": "bigint", "d": "float", "e": "double",
+        "f": "enum('x','it''s')", "g": "varchar(20)", "h": "MEDIUMINT UNSIGNED"}) == {
+        "a": "Int8", "b": "UInt32", "c": "Int64", "d": "float32", "f": pandas.CategoricalDtype(["x", "it's"]),
+        "h": "UInt32"}
+
+
+@mysql_only
+def test_populate_table_widens_inferred_columns_for_later_frames(make_table):
+    table = make_table("widened_rows")
+    frames = [pandas.DataFrame({"name": ["a"], "kind": pandas.Categorical(["x"]), "id": [1]}),
+              pandas.DataFrame({"name": ["b" * 100], "kind": pandas.Categorical(["y"]), "id": [100000]})]
+    table.populate_table(iter(frames), bulk="insert", infer_schema=True, chunksize=1)
+    data_types = table.get_data_type()
+    assert (data_types["name"], data_types["kind"]) == ("varchar(255)", "enum('x','y')")
+    assert table.read_table()["name"].tolist() == ["a", "b" * 100]
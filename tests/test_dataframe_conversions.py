@@ -0,0 +1,50 @@
+# coding=utf-8
+"""
+Tests of row hashes, which need to be same on server and in dataframe
+"""
+
+import hashlib
+import datetime
+import decimal
+import pandas
+import pytest
+from databaseops.helper import DataFrameConversion
+
+# MySQL data type, value in dataframe, expression of row_hash_sql and text hashed for value
+HASH_CASES = [
+    ("bigint", 42, "`c`", "42"),
+    ("tinyint(1)", -7, "`c`", "-7"),
+    ("double", 1e-9, "CAST(`c` AS DECIMAL(65, 30))", "0.000000001000000000000000000000"),
+    ("double", 5e-9, "CAST(`c` AS DECIMAL(65, 30))", "0.000000005000000000000000000000"),
+    ("double", 0.1234564, "CAST(`c` AS DECIMAL(65, 30))", "0.123456400000000000000000000000"),
+    ("double", 0.1234561, "CAST(`c` AS DECIMAL(65, 30))", "0.123456100000000000000000000000"),
+    ("double", -2.5, "CAST(`c` AS DECIMAL(65, 30))", "-2.500000000000000000000000000000"),
+    ("double", 1e40, "CAST(`c` AS DECIMAL(65, 30))", "9" * 35 + "." + "9" * 30),
+    ("float", 0.1, "CAST(`c` AS DECIMAL(65, 30))", "0.100000001490116120000000000000"),
+    ("decimal(10,2)", decimal.Decimal("3.5"), "`c`", "3.50"),
+    ("datetime", datetime.datetime(2024, 1, 2, 3, 4, 5), "`c`", "2024-01-02 03:04:05"),
+    ("datetime(3)", datetime.datetime(2024, 1, 2, 3, 4, 5, 123000), "`c`", "2024-01-02 03:04:05.123"),
+    ("date", datetime.date(2024, 1, 2), "`c`", "2024-01-02"),
+    ("varchar(20)", "text %", "`c`", "text %"),
+]
+
+
+@pytest.mark.parametrize("data_type, value, expression, text", HASH_CASES)
+def test_row_hash_sql_and_frame_to_hashes_match(data_type, value, expression, text):
+    data_types = {"c": data_type}
+    assert DataFrameConversion.row_hash_sql(["c"], data_types) == \
+        f"MD5(CONCAT_WS(CHAR(31 USING utf8mb4), COALESCE(CAST({expression} AS CHAR), CHAR(0 USING utf8mb4))))"
+    hashes = DataFrameConversion.frame_to_hashes(pandas.DataFrame({"c": [value]}), data_types)
+    assert hashes.tolist() == [hashlib.md5(text.encode("utf-8")).hexdigest()]
+
+
+def test_frame_to_hashes_joins_columns_and_nulls():
+    frame = pandas.DataFrame({"a": [1, 2], "b": [0.5, None], "c": [None, decimal.Decimal("1.25")]})
+    hashes = DataFrameConversion.frame_to_hashes(frame, {"a": "int", "b": "double", "c": "decimal(5,2)"})
+    expected = ["1\x1f0.500000000000000000000000000000\x1f\x00", "2\x1f\x00\x1f1.25"]
+    assert hashes.tolist() == [hashlib.md5(text.encode("utf-8")).hexdigest() for text in expected]
+
+
+def test_small_float_changes_change_hash():
+    frame = pandas.DataFrame({"c": [1e-9, 5e-9, 0.1234564, 0.1234561]})
+    assert len(set(DataFrameConversion.frame_to_hashes(frame, {"c": "double"}))) == 4
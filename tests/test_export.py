@@ -0,0 +1,23 @@
+# coding=utf-8
+"""
+Tests of export and import_file
+"""
+
+import pandas
+import pytest
+
+
+@pytest.mark.parametrize("format", ["parquet", "csv.gz", "csv"])
+def test_export_import_round_trip(make_table, tmp_path, format):
+    pytest.importorskip("pyarrow")
+    source = make_table("export_source")
+    source.populate_table(pandas.DataFrame({"id": range(50), "value": [i / 3 for i in range(50)],
+                                            "name": [f"row {i}" for i in range(50)]}), bulk="insert")
+    path = str(tmp_path / f"export.{format}")
+    exported = source.export(path, chunksize=7)
+    target = make_table("export_target")
+    imported = target.import_file(path, bulk="insert")
+    expected, result = source.read_table(), target.read_table()
+    assert exported["rows"] == imported["rows"] == len(expected) == len(result) == 50
+    assert result.dtypes.to_dict() == expected.dtypes.to_dict()
+    pandas.testing.assert_frame_equal(result, expected)
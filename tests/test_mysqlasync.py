@@ -0,0 +1,68 @@
+# coding=utf-8
+"""
+Tests of AsyncMySQLTable
+"""
+
+import asyncio
+import pandas
+from databaseops.mysql.mysqlasync import AsyncMySQLTable
+
+
+def async_table(table) -> AsyncMySQLTable:
+    """
+    AsyncMySQLTable running methods of given table.
+    """
+    wrapped = object.__new__(AsyncMySQLTable)
+    wrapped.table = table
+    return wrapped
+
+
+def test_read_table(make_table):
+    table = async_table(make_table("async_read"))
+    dataframe = pandas.DataFrame({"id": range(10), "value": [i * 0.5 for i in range(10)]})
+
+    async def run():
+        await table.populate_table(dataframe, bulk="insert")
+        return await table.read_table()
+
+    result = asyncio.run(run())
+    assert result["id"].tolist() == list(range(10))
+    assert result["value"].tolist() == dataframe["value"].tolist()
+
+
+def test_chunked_read_is_async_iterator(make_table):
+    table = async_table(make_table("async_chunks"))
+    table.table.populate_table(pandas.DataFrame({"id": range(25)}), bulk="insert")
+
+    async def run():
+        return [chunk async for chunk in await table.read_table(chunksize=10)]
+
+    chunks = asyncio.run(run())
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert pandas.concat(chunks)["id"].tolist() == list(range(25))
+
+
+def test_break_returns_connection(make_table):
+    table = async_table(make_table("async_break"))
+    table.table.populate_table(pandas.DataFrame({"id": range(25)}), bulk="insert")
+
+    async def run():
+        chunks = await table.read_table(chunksize=10)
+        async for chunk in chunks:
+            break
+        await chunks.aclose()
+        return chunk
+
+    assert len(asyncio.run(run())) == 10
+    assert table.table.sqlalchemy_engine.pool.checkedout() == 0
+
+
+def test_calls_run_concurrently(make_table):
+    table = async_table(make_table("async_gather"))
+    table.table.populate_table(pandas.DataFrame({"id": range(100)}), bulk="insert")
+
+    async def run():
+        return await asyncio.gather(*[table.table_filter(where=f"id < {limit}") for limit in range(1, 21)])
+
+    results = asyncio.run(run())
+    assert [len(result) for result in results] == list(range(1, 21))
@@ -0,0 +1,79 @@
+# coding=utf-8
+"""
+Tests of Condition and Column, and of table_filter with them on stand-in
+"""
+
+import datetime
+import pandas
+import pytest
+from databaseops import Column, Condition
+
+
+def test_conditions_nest_with_and_or_not():
+    condition = ~((Column("a") == 1) | (Column("b") > 2)) & Column("a").between(0, 5)
+    assert condition.sql == "(NOT ((`a` = %s) OR (`b` > %s))) AND (`a` BETWEEN %s AND %s)"
+    assert condition.params == (1, 2, 0, 5)
+    assert condition.columns == ("a", "b")
+
+
+def test_none_is_compared_with_is():
+    assert (Column("a") == None).sql == "`a` IS NULL"  # noqa: E711
+    assert (Column("a") != None).sql == "`a` IS NOT NULL"  # noqa: E711
+    assert Column("a").is_null().params == ()
+
+
+def test_isin_with_empty_list_is_false():
+    assert (Column("a").isin([]).sql, Column("a").isin([]).params) == ("FALSE", ())
+    condition = Column("a").isin(iter([1, 2]))
+    assert (condition.sql, condition.params) == ("`a` IN (%s, %s)", (1, 2))
+
+
+def test_identifiers_are_quoted_with_backticks():
+    assert (Column("order", "sales") < 3).sql == "`sales`.`order` < %s"
+    assert Column("first name").like("A%").sql == "`first name` LIKE %s"
+
+
+def test_combining_with_other_type_fails():
+    with pytest.raises(TypeError):
+        (Column("a") == 1) & "b = 2"
+
+
+def test_compile_escapes_percent_only_with_params():
+    assert Condition.compile("name LIKE 'A%'") == ("(name LIKE 'A%')", None, ())
+    assert Condition.compile(["name LIKE 'A%'", Column("b").like("%x%")]) == \
+        ("(name LIKE 'A%%') AND (`b` LIKE %s)", ("%x%",), ("b",))
+    assert Condition.compile(Column("a").isin([])) == ("(FALSE)", None, ("a",))
+    with pytest.raises(TypeError):
+        Condition.compile([1])
+
+
+@pytest.fixture
+def people(make_table):
+    table = make_table("filter_people")
+    table.populate_table(pandas.DataFrame({"name": ["Anil", "Asha", "Ravi", "100%", None],
+                                           "age": [17, 25, 40, 30, 50],
+                                           "joined": pandas.to_datetime(["2020-01-01", "2021-06-01", "2022-01-01",
+                                                                         "2023-01-01", "2024-01-01"])}),
+                         bulk="insert")
+    return table
+
+
+def names(frame: pandas.DataFrame) -> list:
+    return sorted(frame["name"].fillna("NULL").tolist())
+
+
+def test_table_filter_combines_conditions(people):
+    assert names(people.table_filter(where=[Column("age") >= 18, Column("name").like("A%")])) == ["Asha"]
+    assert names(people.table_filter(where=(Column("age") < 18) | Column("name").is_null())) == ["Anil", "NULL"]
+    assert names(people.table_filter(where=~Column("name").isin(["Anil", "Ravi"]) & (Column("age") > 20))) == \
+        ["100%", "Asha"]
+    assert names(people.table_filter(where=Column("name").isin([]))) == []
+    assert names(people.table_filter(where=[Column("joined") >= datetime.datetime(2022, 1, 1), "age < 45"])) == \
+        ["100%", "Ravi"]
+
+
+def test_table_filter_keeps_literal_percent(people):
+    assert names(people.table_filter(where="name LIKE '%\\%%' ESCAPE '\\'")) == ["100%"]
+    assert names(people.table_filter(where=["name LIKE '%\\%%' ESCAPE '\\'", Column("age") > 0])) == ["100%"]
+    assert names(people.table_filter(where=Column("name").like("%0%"))) == ["100%"]
+    assert names(people.table_filter(where=Column("name") == "100%", select=["name", "age"], limit=1)) == ["100%"]
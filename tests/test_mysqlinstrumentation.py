@@ -0,0 +1,104 @@
+# coding=utf-8
+"""
+Tests of spans of table operations and of slow query log
+"""
+
+import logging
+import pandas
+import pytest
+from databaseops.mysql.mysqlinstrumentation import InstrumentationHook, MySQLInstrumentation
+
+
+class RecordingHook(InstrumentationHook):
+    """
+    Hook keeping started spans and finished spans in order.
+    """
+    
+    def __init__(self) -> None:
+        self.started = []
+        self.finished = []
+    
+    def span_started(self, span) -> None:
+        self.started.append(span)
+    
+    def span_finished(self, span) -> None:
+        self.finished.append(span)
+    
+    def operations(self, finished: bool = True) -> list:
+        return [span for span in (self.finished if finished else self.started) if span.operation != "query"]
+
+
+@pytest.fixture
+def hook():
+    hook = RecordingHook()
+    MySQLInstrumentation.add_hook(hook)
+    yield hook
+    MySQLInstrumentation.remove_hook(hook)
+
+
+@pytest.fixture
+def filled_table(make_table):
+    table = make_table("instrumented_rows")
+    with table.pooled_cursor() as cursor:
+        cursor.execute("CREATE TABLE `instrumented_rows` (id BIGINT NOT NULL PRIMARY KEY, value TEXT)")
+    table.metadata_cache.invalidate()
+    table.populate_table(pandas.DataFrame({"id": range(10), "value": list("abcdefghij")}).set_index("id"),
+                         bulk="insert")
+    return table
+
+
+@pytest.mark.parametrize("with_hook", [False, True])
+def test_chunked_read_gives_same_rows_with_and_without_hook(filled_table, request, with_hook):
+    if with_hook:
+        request.getfixturevalue("hook")
+    assert MySQLInstrumentation.active == with_hook
+    chunks = list(filled_table.read_table(chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    pages = list(filled_table.iter_pages(page_size=4))
+    assert [len(page) for page, _ in pages] == [4, 4, 2]
+
+
+@pytest.mark.parametrize("method, kwargs", [("read_table", {"chunksize": 4}), ("iter_pages", {"page_size": 4})])
+def test_span_of_iterator_stays_open_until_iteration_ends(filled_table, hook, method, kwargs):
+    iterator = iter(getattr(filled_table, method)(**kwargs))
+    next(iterator)
+    started = hook.operations(finished=False)[-1]
+    assert started.operation == method
+    assert started not in hook.finished
+    assert MySQLInstrumentation.current().operation is None
+    list(iterator)
+    assert hook.operations()[-1] is started
+    assert (started.rows, started.error) == (10, None)
+    assert started.seconds is not None
+
+
+def test_span_of_closed_iterator_is_finished(filled_table, hook):
+    iterator = iter(filled_table.iter_pages(page_size=4))
+    next(iterator)
+    iterator.close()
+    span = hook.operations()[-1]
+    assert (span.operation, span.rows) == ("iter_pages", 4)
+
+
+def test_removed_hook_disables_instrumentation(filled_table):
+    hook = RecordingHook()
+    MySQLInstrumentation.add_hook(hook)
+    MySQLInstrumentation.remove_hook(hook)
+    filled_table.read_table()
+    assert not MySQLInstrumentation.active
+    assert not hook.started
+
+
+def test_slow_query_log_uses_threshold(caplog):
+    logger = logging.getLogger("databaseops.test_slow_query")
+    MySQLInstrumentation.slow_query_log(seconds=0.5, logger=logger)
+    try:
+        with caplog.at_level(logging.WARNING, logger=logger.name):
+            for seconds in (0.1, 0.5, 2.0):
+                MySQLInstrumentation.finish(MySQLInstrumentation.start("query", "rows", f"SELECT {seconds}"),
+                                            seconds=seconds)
+            MySQLInstrumentation.finish(MySQLInstrumentation.start("read_table", "rows"), seconds=5.0)
+    finally:
+        MySQLInstrumentation.slow_query_log(seconds=None)
+    assert [record.args[-1] for record in caplog.records] == ["SELECT 0.5", "SELECT 2.0"]
+    assert not MySQLInstrumentation.active
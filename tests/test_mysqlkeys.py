@@ -0,0 +1,57 @@
+# coding=utf-8
+"""
+Tests of adding keys online, with duplicates removed while table is copied to shadow table
+"""
+
+import os
+import pandas
+import pytest
+
+# Shadow copy needs CREATE TABLE LIKE, ALTER TABLE and triggers of MySQL server
+mysql_only = pytest.mark.skipif(not os.environ.get("DATABASEOPS_TEST_HOST"), reason="needs MySQL server")
+
+
+def fill(table, definition: str, rows: list) -> None:
+    with table.pooled_cursor() as cursor:
+        cursor.execute(f"CREATE TABLE `{table.table_name}` ({definition})")
+        cursor.executemany(f"INSERT INTO `{table.table_name}` (id, a) VALUES (%s, %s)", rows)
+    table.metadata_cache.invalidate()
+
+
+def test_online_key_with_duplicates_needs_integer_unique_key(make_table):
+    table = make_table("online_no_row_id")
+    fill(table, "id TEXT, a BIGINT", [("x", 1), ("y", 1)])
+    with pytest.raises(ValueError, match="can not be removed online"):
+        table.set_unique_keys("a", online=True)
+    assert len(table.read_table()) == 2
+    assert list(table.get_data_type()) == ["id", "a"]
+
+
+def test_online_key_with_duplicates_fails_without_remove_duplicates(make_table):
+    table = make_table("online_keep_duplicates")
+    fill(table, "id BIGINT NOT NULL PRIMARY KEY, a BIGINT", [(1, 1), (2, 1)])
+    with pytest.raises(UserWarning, match="Duplicate entries"):
+        table.set_unique_keys("a", remove_duplicates=False, online=True)
+    assert len(table.read_table()) == 2
+
+
+@mysql_only
+def test_online_key_skips_duplicates_in_shadow_copy(make_table):
+    table = make_table("online_duplicates")
+    fill(table, "id BIGINT NOT NULL PRIMARY KEY, a BIGINT", [(5, 1), (2, 1), (3, 2), (4, None), (1, None)])
+    with pytest.warns(UserWarning, match="Removing duplicate"):
+        table.set_unique_keys("a", online=True, batch_size=2)
+    result = table.read_table().sort_values("id")
+    assert result["id"].tolist() == [1, 2, 3]
+    assert pandas.isna(result["a"].iloc[0])
+    assert list(table.get_data_type()) == ["id", "a"]
+
+
+@mysql_only
+def test_sort_table_clustered_on_unique_key_is_rebuilt_with_primary_key(make_table):
+    table = make_table("sort_unique")
+    fill(table, "id BIGINT NOT NULL, a BIGINT NOT NULL, UNIQUE KEY (id)", [(1, 3), (2, 1), (3, 2)])
+    with pytest.warns(UserWarning, match="ORDER BY is ignored"):
+        table.sort_table("a")
+    assert table.metadata_cache.table("sort_unique")["indexes"]["PRIMARY"]["columns"] == ["a", "id"]
+    assert table.read_table()["id"].tolist() == [2, 3, 1]
@@ -0,0 +1,165 @@
+# coding=utf-8
+"""
+Tests of MySQLMetadataCache, on stubbed cursor and on tables of stand-in
+"""
+
+import pandas
+import pytest
+from databaseops.mysql.mysqlmetadata import MySQLMetadataCache
+
+# Rows of columns query: table, column, data type, nullable, index, non unique and position in index
+COLUMN_ROWS = [
+    ("orders", "id", "int", "NO", "PRIMARY", 0, 1),
+    ("orders", "customer", "varchar(20)", "YES", "customer_day", 1, 1),
+    ("orders", "day", "date", "NO", "customer_day", 1, 2),
+    ("orders", "day", "date", "NO", "day_customer", 0, 1),
+    ("orders", "customer", "varchar(20)", "YES", "day_customer", 0, 2),
+    ("customers", "name", "varchar(20)", "NO", None, None, None),
+]
+# Rows of foreign key query: table, constraint, column, referenced table and referenced column
+FOREIGN_KEY_ROWS = [("orders", "orders_customer", "customer", "customers", "name")]
+
+
+class StubCursor:
+    """
+    Cursor giving rows of columns query and foreign key query in turn.
+    """
+    
+    def __init__(self, engine: "StubEngine") -> None:
+        self.engine = engine
+        self.rows = None
+    
+    def execute(self, query: str) -> None:
+        self.engine.queries.append(query)
+        self.rows = FOREIGN_KEY_ROWS if "KEY_COLUMN_USAGE" in query else self.engine.column_rows
+    
+    def fetchall(self) -> list:
+        return list(self.rows)
+    
+    def close(self) -> None:
+        pass
+
+
+class StubEngine:
+    """
+    Engine whose raw connections give StubCursor and which records queries.
+    """
+    
+    def __init__(self) -> None:
+        self.queries = []
+        self.column_rows = list(COLUMN_ROWS)
+    
+    def raw_connection(self) -> "StubEngine":
+        return self
+    
+    def cursor(self) -> StubCursor:
+        return StubCursor(self)
+    
+    def close(self) -> None:
+        pass
+
+
+def test_metadata_of_all_tables_is_loaded_once():
+    engine = StubEngine()
+    cache = MySQLMetadataCache(engine)
+    orders = cache.table("orders")
+    assert cache.table("customers")["columns"] == {"name": "varchar(20)"}
+    assert len(engine.queries) == 2
+    assert orders["columns"] == {"id": "int", "customer": "varchar(20)", "day": "date"}
+    assert orders["nullable"] == {"customer"}
+    assert orders["indexes"] == {"PRIMARY": {"unique": True, "columns": ["id"]},
+                                 "customer_day": {"unique": False, "columns": ["customer", "day"]},
+                                 "day_customer": {"unique": True, "columns": ["day", "customer"]}}
+    assert orders["foreign_keys"] == {"orders_customer": {"columns": ["customer"], "referenced_table": "customers",
+                                                          "referenced_columns": ["name"]}}
+
+
+def test_metadata_is_loaded_again_after_ttl(monkeypatch):
+    engine = StubEngine()
+    cache = MySQLMetadataCache(engine)
+    now = [1000.0]
+    monkeypatch.setattr("databaseops.mysql.mysqlmetadata.time.monotonic", lambda: now[0])
+    cache.table("orders")
+    now[0] += MySQLMetadataCache.ttl - 1
+    cache.table("orders")
+    assert len(engine.queries) == 2
+    now[0] += 2
+    cache.table("orders")
+    assert len(engine.queries) == 4
+
+
+def test_metadata_is_loaded_again_after_invalidate_and_for_new_table():
+    engine = StubEngine()
+    cache = MySQLMetadataCache(engine)
+    cache.table("orders")
+    engine.column_rows.append(("orders", "amount", "double", "YES", None, None, None))
+    assert "amount" not in cache.table("orders")["columns"]
+    cache.invalidate()
+    assert cache.table("orders")["columns"]["amount"] == "double"
+    assert cache.table("missing") is None
+    assert len(engine.queries) == 6
+
+
+def test_cache_is_shared_by_engine():
+    engine = StubEngine()
+    assert MySQLMetadataCache.for_engine(engine) is MySQLMetadataCache.for_engine(engine)
+    assert MySQLMetadataCache.for_engine(engine) is not MySQLMetadataCache.for_engine(StubEngine())
+
+
+def test_data_types_follow_table_changes(make_table):
+    table = make_table("metadata_types")
+    table.populate_table(pandas.DataFrame({"id": [1, 2]}), bulk="insert")
+    assert table.get_data_type() == {"index": "bigint", "id": "bigint"}
+    table.populate_table(pandas.DataFrame({"id": [1], "name": ["a"]}), if_exists="replace", bulk="insert")
+    assert table.get_data_type() == {"index": "bigint", "id": "bigint", "name": "text"}
+
+
+def keyed_table(make_table, name: str, rows: int):
+    """
+    Table with primary key id, nullable value and rows rows.
+    """
+    table = make_table(name)
+    with table.pooled_cursor() as cursor:
+        cursor.execute(f"CREATE TABLE `{name}` (id BIGINT NOT NULL PRIMARY KEY, value BIGINT)")
+    table.metadata_cache.invalidate()
+    table.populate_table(pandas.DataFrame({"id": range(rows), "value": [None if i % 4 == 0 else i for i in range(rows)]
+                                           }).set_index("id"), bulk="insert")
+    return table
+
+
+def test_iter_pages_walks_primary_key(make_table):
+    table = keyed_table(make_table, "metadata_pages", 25)
+    pages = list(table.iter_pages(page_size=10))
+    assert [len(page) for page, _ in pages] == [10, 10, 5]
+    assert pandas.concat([page for page, _ in pages])["id"].tolist() == list(range(25))
+    resumed = list(table.iter_pages(page_size=10, checkpoint=pages[0][1]))
+    assert resumed[0][0]["id"].iloc[0] == 10
+
+
+def test_parallel_read_partitions_on_primary_key(make_table):
+    table = keyed_table(make_table, "metadata_partitions", 30)
+    result = table.read_table(parallel=3)
+    assert result["id"].tolist() == list(range(30))
+    assert result["id"].dtype == "int64"
+    by_value = table.read_table(parallel=3, partition_column="value")
+    assert sorted(by_value["id"].tolist()) == list(range(30))
+    assert by_value["value"].isna().sum() == 8
+
+
+@pytest.mark.parametrize("format", ["pandas", "arrow"])
+def test_parallel_read_in_process_pool(make_table, format):
+    table = keyed_table(make_table, "metadata_processes", 30)
+    in_processes = table.read_table(parallel=3, parallel_mode="process", format=format)
+    in_threads = table.read_table(parallel=3, format=format)
+    if format == "arrow":
+        in_processes, in_threads = in_processes.to_pandas(), in_threads.to_pandas()
+    pandas.testing.assert_frame_equal(in_processes, in_threads)
+    assert in_processes["id"].tolist() == list(range(30))
+    with pytest.raises(ValueError):
+        table.read_table(parallel=3, parallel_mode="fork")
+
+
+def test_remove_duplicates_skips_columns_with_unique_key(make_table):
+    table = keyed_table(make_table, "metadata_duplicates", 5)
+    with pytest.warns(UserWarning):
+        assert table.remove_duplicates(["id", "value"]) == 0
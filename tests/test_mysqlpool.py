@@ -0,0 +1,48 @@
+# coding=utf-8
+"""
+Tests of MySQLEnginePool, engines are created without connecting to server
+"""
+
+import threading
+import concurrent.futures
+from unittest import mock
+from databaseops.mysql.mysqlpool import MySQLEnginePool
+
+
+def test_engine_is_shared_only_with_same_password():
+    with mock.patch.object(MySQLEnginePool, "_MySQLEnginePool__create_database"):
+        try:
+            first = MySQLEnginePool.get_engine("pool-test", "user", "first", "db")
+            assert MySQLEnginePool.get_engine("pool-test", "user", "first", "db") is first
+            second = MySQLEnginePool.get_engine("pool-test", "user", "second", "db")
+            assert second is not first
+            assert second.url.password == "second"
+        finally:
+            MySQLEnginePool.dispose(host="pool-test")
+    with mock.patch.object(MySQLEnginePool, "_MySQLEnginePool__create_database"):
+        assert MySQLEnginePool.get_engine("pool-test", "user", "first", "db") is not first
+        MySQLEnginePool.dispose(host="pool-test")
+
+
+def test_database_is_created_outside_registry_lock():
+    started, release = threading.Event(), threading.Event()
+    created = []
+
+    def create_database(host, user, password, db_name):
+        created.append(db_name)
+        if db_name == "slow":
+            started.set()
+            assert release.wait(5)
+
+    with mock.patch.object(MySQLEnginePool, "_MySQLEnginePool__create_database", side_effect=create_database):
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                slow = [executor.submit(MySQLEnginePool.get_engine, "pool-test", "user", "", "slow") for _ in range(2)]
+                assert started.wait(5)
+                fast = MySQLEnginePool.get_engine("pool-test", "user", "", "fast")
+                release.set()
+                assert slow[0].result() is slow[1].result() is not fast
+            assert sorted(created) == ["fast", "slow"]
+        finally:
+            release.set()
+            MySQLEnginePool.dispose(host="pool-test")
@@ -0,0 +1,102 @@
+# coding=utf-8
+"""
+Tests of MySQLResultCache, and of result_cache of table objects on stand-in
+"""
+
+import os
+import pandas
+import pytest
+from databaseops import Column, MySQLResultCache
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+def frame(rows: int, value: int = 0) -> pandas.DataFrame:
+    return pandas.DataFrame({"a": [value] * rows}, dtype="int64")
+
+
+def size(rows: int) -> int:
+    return int(frame(rows).memory_usage(index=True, deep=True).sum())
+
+
+def test_least_recently_used_results_are_evicted_by_bytes():
+    cache = MySQLResultCache(max_bytes=2 * size(100) + size(100) // 2, validate=None)
+    for key in ("a", "b"):
+        cache.put(key, (0,), frame(100))
+    assert cache.get("a", (0,)) is not None
+    cache.put("c", (0,), frame(100))
+    assert cache.get("b", (0,)) is None
+    assert cache.get("a", (0,)) is not None and cache.get("c", (0,)) is not None
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"], stats["bytes"]) == (2, 1, 2 * size(100))
+
+
+def test_result_larger_than_max_bytes_is_not_kept():
+    cache = MySQLResultCache(max_bytes=size(10), validate=None)
+    cache.put("big", (0,), frame(1000))
+    assert cache.get("big", (0,)) is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cached_frame_is_copy():
+    cache = MySQLResultCache(validate=None)
+    result = frame(3)
+    cache.put("a", (0,), result)
+    result["a"] = 5
+    given = cache.get("a", (0,))
+    given["a"] = 7
+    assert cache.get("a", (0,))["a"].tolist() == [0, 0, 0]
+
+
+def test_evicted_results_are_spilled_and_read_back(tmp_path):
+    cache = MySQLResultCache(max_bytes=size(100), spill_dir=str(tmp_path), validate=None)
+    cache.put("a", (0,), frame(100, 1))
+    cache.put("b", (0,), pyarrow.table({"a": [2] * 100}))
+    assert cache.stats()["spilled"] == 1 and len(os.listdir(tmp_path)) == 1
+    spilled = cache.get("a", (0,))
+    assert isinstance(spilled, pandas.DataFrame)
+    pandas.testing.assert_frame_equal(spilled, frame(100, 1))
+    cache.put("c", (0,), frame(100))
+    assert cache.get("b", (0,)).column("a").to_pylist() == [2] * 100
+
+
+def test_spilled_files_are_bounded_by_max_spill_bytes(tmp_path):
+    probe = MySQLResultCache(max_bytes=0, spill_dir=str(tmp_path / "probe"), validate=None)
+    probe.put("a", (0,), frame(100))
+    file_size = probe.stats()["spilled_bytes"]
+    cache = MySQLResultCache(max_bytes=0, spill_dir=str(tmp_path / "spill"), validate=None,
+                             max_spill_bytes=2 * file_size)
+    for key in "abc":
+        cache.put(key, (0,), frame(100))
+    stats = cache.stats()
+    assert (stats["spilled"], stats["spilled_bytes"]) == (2, 2 * file_size)
+    assert len(os.listdir(tmp_path / "spill")) == 2
+    assert cache.get("a", (0,)) is None and cache.get("c", (0,)) is not None
+    cache.invalidate()
+    assert os.listdir(tmp_path / "spill") == []
+
+
+def test_result_of_other_version_is_discarded(tmp_path):
+    cache = MySQLResultCache(max_bytes=size(100), spill_dir=str(tmp_path), validate=None)
+    cache.put("a", (0,), frame(100))
+    cache.put("b", (0,), frame(100))
+    assert cache.get("a", (1,)) is None and cache.get("b", (1,)) is None
+    assert os.listdir(tmp_path) == []
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 2)
+
+
+def test_writes_of_table_change_version(make_table):
+    cache = MySQLResultCache(validate="update_time")
+    table = make_table("cached_rows", result_cache=cache)
+    table.populate_table(pandas.DataFrame({"id": [1, 2, 3]}), bulk="insert")
+    first = table.table_filter(where=Column("id") > 1)
+    assert table.table_filter(where=Column("id") > 1)["id"].tolist() == first["id"].tolist() == [2, 3]
+    assert cache.stats()["hits"] == 1
+    table.populate_table(pandas.DataFrame({"id": [4]}), bulk="insert")
+    assert table.table_filter(where=Column("id") > 1)["id"].tolist() == [2, 3, 4]
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+
+
+def test_validate_must_be_known():
+    with pytest.raises(ValueError):
+        MySQLResultCache(validate="mtime")
@@ -0,0 +1,60 @@
+# coding=utf-8
+"""
+Tests of snapshot refresh of MySQLTable on stand-in, with integer watermark column
+"""
+
+import os
+import pandas
+import pytest
+from databaseops import MySQLSnapshotStore
+
+
+@pytest.fixture
+def snapshot_table(make_table, tmp_path):
+    table = make_table("snapshot_rows", snapshot_store=MySQLSnapshotStore(str(tmp_path / "snapshots")))
+    with table.pooled_cursor() as cursor:
+        cursor.execute("CREATE TABLE `snapshot_rows` (id BIGINT NOT NULL PRIMARY KEY, value TEXT, version BIGINT)")
+        cursor.executemany("INSERT INTO `snapshot_rows` VALUES (%s, %s, %s)", [(1, "a", 1), (2, "b", 2), (3, "c", 2)])
+    table.metadata_cache.invalidate()
+    return table
+
+
+def refresh(table) -> dict:
+    return table.refresh_snapshot(strategy="updated_at", watermark="version")
+
+
+def test_refresh_without_changes_does_not_write_snapshot(snapshot_table):
+    assert refresh(snapshot_table)["full"]
+    path = snapshot_table.snapshot_store.path(snapshot_table.host, snapshot_table.db_name, "snapshot_rows")
+    written = os.stat(path)
+    result = refresh(snapshot_table)
+    assert (result["read"], result["full"]) == (0, False)
+    assert (os.stat(path).st_ino, os.stat(path).st_size) == (written.st_ino, written.st_size)
+
+
+def test_refresh_reads_changed_rows_at_same_watermark(snapshot_table):
+    refresh(snapshot_table)
+    with snapshot_table.pooled_cursor() as cursor:
+        cursor.execute("UPDATE `snapshot_rows` SET value = 'd' WHERE id = 3")
+    assert refresh(snapshot_table)["read"] == 1
+    assert snapshot_table.read_table(snapshot=True, max_age=None).sort_values("id")["value"].tolist() == ["a", "b", "d"]
+
+
+def test_snapshot_read_skips_refresh_within_max_age(snapshot_table, monkeypatch):
+    refresh(snapshot_table)
+    refreshes = []
+    monkeypatch.setattr(type(snapshot_table), "refresh_snapshot", lambda self, *args, **kwargs: refreshes.append(1))
+    assert len(snapshot_table.read_table(snapshot=True, max_age=None)) == 3
+    assert len(snapshot_table.read_table(snapshot=True, max_age=3600)) == 3
+    assert not refreshes
+    snapshot_table.read_table(snapshot=True, max_age=0)
+    assert refreshes == [1]
+
+
+def test_snapshot_read_refreshes_missing_snapshot(snapshot_table, monkeypatch):
+    original = type(snapshot_table).refresh_snapshot
+    monkeypatch.setattr(type(snapshot_table), "refresh_snapshot",
+                        lambda self: original(self, strategy="updated_at", watermark="version"))
+    frame = snapshot_table.read_table(snapshot=True, max_age=None)
+    assert frame.sort_values("id")["id"].tolist() == [1, 2, 3]
+    assert isinstance(frame, pandas.DataFrame)